@@ -0,0 +1,73 @@
+import sys
+import os
+import time
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+
+import aiohttp
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '..', 'currency_exchange'))
+
+from api_client import PrivatBankAPIClient
+from fake_privatbank import start_fake_server
+
+
+class SessionPerCallClient(PrivatBankAPIClient):
+    # Стара поведінка: нова ClientSession на кожен виклик get_exchange_rates
+    async def get_exchange_rates(self, days):
+        async with aiohttp.ClientSession() as session:
+            tasks = []
+            for day in range(days):
+                date = (datetime.now() - timedelta(days=day)).strftime('%d.%m.%Y')
+                tasks.append(self._fetch(session, date))
+            return await asyncio.gather(*tasks)
+
+    async def _fetch(self, session, date):
+        async with session.get(f"{self.base_url}{date}") as response:
+            response.raise_for_status()
+            return await response.json()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(client, clients, commands, days):
+    latencies = []
+
+    async def user():
+        for _ in range(commands):
+            start = time.perf_counter()
+            await client.get_exchange_rates(days)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    return len(latencies) * days / elapsed, percentile(latencies, 99)
+
+
+async def main(args):
+    runner, stats, base_url = await start_fake_server(latency=args.latency)
+    try:
+        print(f"{'client':<16}{'req/s':>12}{'p99, ms':>12}")
+        for name, client in (("session-per-call", SessionPerCallClient(base_url=base_url)),
+                             ("pooled", PrivatBankAPIClient(base_url=base_url))):
+            async with client:
+                rps, p99 = await run(client, args.clients, args.commands, args.days)
+            print(f"{name:<16}{rps:>12.0f}{p99 * 1000:>12.1f}")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PrivatBankAPIClient: session-per-call vs pooled")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--commands", type=int, default=20)
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0)
+    asyncio.run(main(parser.parse_args()))
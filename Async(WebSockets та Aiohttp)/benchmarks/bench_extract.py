@@ -0,0 +1,57 @@
+import sys
+import os
+import time
+import argparse
+from datetime import date, timedelta
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '..', 'currency_exchange'))
+
+from utils import extract_currency_data, index_payload
+from fake_privatbank import CURRENCIES, make_payload
+
+
+def extract_linear(data, currencies):
+    # Попередня реалізація: next(...) по всьому exchangeRate для кожної валюти
+    rates = {}
+    for record in data:
+        if not record:
+            continue
+        date = record['date']
+        rates[date] = {}
+        for currency in currencies:
+            currency_data = next((item for item in record['exchangeRate'] if item['currency'] == currency), None)
+            if currency_data:
+                rates[date][currency] = {
+                    'sale': currency_data.get('saleRate', 'N/A'),
+                    'purchase': currency_data.get('purchaseRate', 'N/A')
+                }
+    return rates
+
+
+def timed(func, data, currencies, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(data, currencies)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="extract_currency_data: linear scan vs per-date index")
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    raw = [make_payload((date.today() - timedelta(days=i)).strftime('%d.%m.%Y')) for i in range(args.days)]
+    # Індекс будується один раз, як у RateCache.put
+    indexed = [index_payload(record) for record in raw]
+
+    linear_time, expected = timed(extract_linear, raw, CURRENCIES, args.repeat)
+    indexed_time, result = timed(extract_currency_data, indexed, CURRENCIES, args.repeat)
+    all_time, _ = timed(extract_currency_data, indexed, None, args.repeat)
+    assert result == expected
+
+    print(f"{len(CURRENCIES)} currencies x {args.days} days x {args.repeat} extractions")
+    print(f"{'linear scan':<20}{linear_time * 1000:>10.1f} ms")
+    print(f"{'indexed':<20}{indexed_time * 1000:>10.1f} ms  ({linear_time / indexed_time:.1f}x)")
+    print(f"{'indexed, ALL':<20}{all_time * 1000:>10.1f} ms")
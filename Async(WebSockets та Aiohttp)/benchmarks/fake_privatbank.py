@@ -0,0 +1,66 @@
+import asyncio
+import random
+from aiohttp import web
+
+# Локальна заміна ендпоінта p24api/exchange_rates для бенчмарків
+CURRENCIES = [
+    "AUD", "AZN", "BYN", "CAD", "CHF", "CNY", "CZK", "DKK", "EUR", "GBP", "GEL", "HUF", "ILS",
+    "JPY", "KZT", "MDL", "NOK", "PLN", "SEK", "SGD", "TMT", "TRY", "UAH", "USD", "UZS",
+]
+
+
+def make_payload(date):
+    rates = []
+    for i, currency in enumerate(CURRENCIES):
+        rate = 1.5 + i * 1.25
+        item = {
+            "baseCurrency": "UAH",
+            "currency": currency,
+            "saleRateNB": rate,
+            "purchaseRateNB": rate,
+        }
+        # Як і справжнє API, комерційний курс є не для всіх валют
+        if i % 3 == 0:
+            item["saleRate"] = round(rate * 1.01, 4)
+            item["purchaseRate"] = round(rate * 0.99, 4)
+        rates.append(item)
+    return {
+        "date": date,
+        "bank": "PB",
+        "baseCurrency": 980,
+        "baseCurrencyLit": "UAH",
+        "exchangeRate": rates,
+    }
+
+
+def create_app(latency=0.0, error_rate=0.0, slow_rate=0.0, slow_latency=2.0):
+    # stats - лічильники викликів, які бенчмарки читають після прогону.
+    # slow_rate - частка відповідей, які "зависають" на slow_latency секунд
+    app = web.Application()
+    stats = {"calls": 0, "errors": 0, "slow": 0}
+
+    async def exchange_rates(request):
+        stats["calls"] += 1
+        if slow_rate and random.random() < slow_rate:
+            stats["slow"] += 1
+            await asyncio.sleep(slow_latency)
+        elif latency:
+            await asyncio.sleep(latency)
+        if error_rate and random.random() < error_rate:
+            stats["errors"] += 1
+            raise web.HTTPInternalServerError()
+        return web.json_response(make_payload(request.query.get("date", "")))
+
+    app.router.add_get("/p24api/exchange_rates", exchange_rates)
+    return app, stats
+
+
+async def start_fake_server(host="127.0.0.1", port=0, **kwargs):
+    app, stats = create_app(**kwargs)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = runner.addresses[0][1]
+    base_url = f"http://{host}:{port}/p24api/exchange_rates?json&date="
+    return runner, stats, base_url
@@ -0,0 +1,116 @@
+import sys
+import os
+import json
+import time
+import asyncio
+import argparse
+import resource
+import tempfile
+
+import websockets
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '..'))
+
+import chat_server
+from bench_api_client import percentile
+from fake_privatbank import start_fake_server
+
+
+def rss_mb():
+    # Поточний RSS з /proc (Linux), інакше - піковий з getrusage
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+async def client(uri, command, commands, latencies, errors):
+    async with websockets.connect(uri) as websocket:
+        for _ in range(commands):
+            start = time.perf_counter()
+            await websocket.send(command)
+            response = await websocket.recv()
+            latencies.append(time.perf_counter() - start)
+            if not response.startswith("{"):
+                errors.append(response)
+
+
+async def run(clients=100, commands=10, days=10, currencies=("USD", "EUR"), latency=0.05, error_rate=0.0,
+              slow_rate=0.0):
+    latencies, errors = [], []
+    command = " ".join(["exchange", str(days), *currencies])
+    runner, fake, base_url = await start_fake_server(latency=latency, error_rate=error_rate, slow_rate=slow_rate)
+    # Порожні сховище і журнал: сервер стартує холодним, як після першого запуску
+    with tempfile.TemporaryDirectory() as workdir:
+        store = await chat_server.setup(
+            base_url=base_url,
+            store_path=os.path.join(workdir, "exchange_rates.db"),
+            log_path=os.path.join(workdir, "exchange_log.txt"),
+        )
+        rss_before = rss_mb()
+        try:
+            async with websockets.serve(chat_server.handle_client, "127.0.0.1", 0) as server:
+                port = server.sockets[0].getsockname()[1]
+                uri = f"ws://127.0.0.1:{port}"
+                start = time.perf_counter()
+                await asyncio.gather(*(client(uri, command, commands, latencies, errors) for _ in range(clients)))
+                elapsed = time.perf_counter() - start
+                cache_stats = chat_server.rate_cache.stats()
+                upstream_stats = chat_server.api_client.stats()
+                rss_after = rss_mb()
+        finally:
+            await chat_server.shutdown(store)
+            await runner.cleanup()
+
+    return {
+        "clients": clients,
+        "commands": len(latencies),
+        "errors": len(errors),
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "upstream_calls": fake["calls"],
+        "upstream_errors": fake["errors"],
+        "cache": cache_stats,
+        "upstream": upstream_stats,
+        "rss_mb": rss_after,
+        "rss_growth_mb": rss_after - rss_before,
+    }
+
+
+def print_report(report):
+    print(f"clients:          {report['clients']}")
+    print(f"commands:         {report['commands']} ({report['errors']} errors)")
+    print(f"throughput:       {report['throughput']:.0f} cmd/s")
+    print(f"latency p50/95/99: {report['p50_ms']:.1f} / {report['p95_ms']:.1f} / {report['p99_ms']:.1f} ms")
+    print(f"upstream calls:   {report['upstream_calls']} ({report['upstream_errors']} errors)")
+    print(f"cache:            {report['cache']}")
+    print(f"client:           {report['upstream']}")
+    print(f"server RSS:       {report['rss_mb']:.1f} MB (+{report['rss_growth_mb']:.1f} MB)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Навантажувальний тест chat_server з локальною заміною PrivatBank API")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--commands", type=int, default=10)
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--currencies", nargs="*", default=["USD", "EUR"])
+    parser.add_argument("--latency", type=float, default=0.05, help="затримка відповіді API, с")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="частка відповідей 500 від API")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="частка відповідей API із затримкою 2 с")
+    parser.add_argument("--json", action="store_true", help="вивести звіт у JSON (для CI)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.clients, args.commands, args.days, args.currencies,
+                             args.latency, args.error_rate, args.slow_rate))
+    if args.json:
+        print(json.dumps(report))
+    else:
+        print_report(report)
@@ -3,7 +3,6 @@ import asyncio
 import websockets
 import json
 import os
-from datetime import datetime
 
 # Отримуємо шлях до поточного каталогу
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -12,53 +11,128 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 currency_exchange_dir = os.path.join(current_dir, 'currency_exchange')
 sys.path.append(currency_exchange_dir)
 
-# Імпортуємо клас з модуля api_client
-from currency_exchange.api_client import PrivatBankAPIClient
-from currency_exchange.utils import extract_currency_data
-from currency_exchange.main import main
+# Імпортуємо клас з модуля api_client.
+# Модулі імпортуються так само, як у currency_exchange/main.py, щоб кожен
+# завантажився один раз (інакше utils.DayRates буде двома різними класами)
+from api_client import PrivatBankAPIClient
+from rate_cache import RateCache
+from rate_store import RateStore
+from shared_cache import RemoteRateClient
+from utils import extract_currency_data
+from exchange_log import ExchangeLog
+from subscriptions import Broadcaster
 
 connected_clients = set()
-
-async def log_to_file(message):
-    async with AIOFile("exchange_log.txt", 'a') as afp:
-        writer = Writer(afp)
-        await writer(f"{datetime.now()}: {message}\n")
-
-async def handle_client(websocket, path):
+# Один клієнт з пулом з'єднань і спільний кеш курсів на весь сервер
+api_client = None
+rate_cache = None
+exchange_log = None
+broadcaster = None
+
+MAX_DAYS_MESSAGE = "Ви можете запитати курс валют не більше, ніж за останні 10 днів."
+
+def parse_exchange(message):
+    parts = message.split()
+    days = int(parts[1]) if len(parts) > 1 else 1
+    currencies = parts[2:] if len(parts) > 2 else ["USD", "EUR"]
+    if "ALL" in currencies:
+        currencies = None
+    return days, currencies
+
+async def stream_exchange(websocket, days, currencies):
+    # Кожна дата відправляється окремим компактним кадром, щойно її отримано,
+    # тож перший кадр не чекає на найповільніший день
+    sent = 0
+    for future in asyncio.as_completed([rate_cache.get(day) for day in rate_cache.window(days)]):
+        record = await future
+        for date, rates in extract_currency_data([record], currencies).items():
+            await websocket.send(json.dumps({"date": date, "rates": rates},
+                                            ensure_ascii=False, separators=(",", ":")))
+            sent += 1
+    await websocket.send(json.dumps({"done": True, "days": sent, "missing": days - sent}))
+    return sent
+
+async def handle_client(websocket, path=None):
     connected_clients.add(websocket)
     try:
         async for message in websocket:
             if message.startswith("exchange"):
-                parts = message.split()
-                days = int(parts[1]) if len(parts) > 1 else 1
-                currencies = parts[2:] if len(parts) > 2 else ["USD", "EUR"]
+                days, currencies = parse_exchange(message)
 
                 if days > 10:
-                    response = "Ви можете запитати курс валют не більше, ніж за останні 10 днів."
+                    response = MAX_DAYS_MESSAGE
                 else:
-                    client = PrivatBankAPIClient()
-                    data = await client.get_exchange_rates(days)
+                    data = await rate_cache.get_exchange_rates(days)
                     rates = extract_currency_data(data, currencies)
                     response = json.dumps(rates, ensure_ascii=False, indent=2)
 
                 await websocket.send(response)
-                await log_to_file(f"Command: {message} - Response: {response}")
+                exchange_log.log(f"Command: {message} - Response: {response}")
+            elif message.startswith("stream"):
+                days, currencies = parse_exchange(message)
+                if days > 10:
+                    await websocket.send(MAX_DAYS_MESSAGE)
+                else:
+                    sent = await stream_exchange(websocket, days, currencies)
+                    exchange_log.log(f"Command: {message} - Streamed: {sent} days")
+            elif message.startswith("subscribe"):
+                # Підписка на тему "exchange N валюти": дані приходять при кожному оновленні
+                days, currencies = parse_exchange(message)
+                if days > 10:
+                    await websocket.send(MAX_DAYS_MESSAGE)
+                else:
+                    broadcaster.subscribe(websocket, days, currencies)
+            elif message.startswith("unsubscribe"):
+                if message.strip() == "unsubscribe":
+                    broadcaster.unsubscribe(websocket)
+                else:
+                    broadcaster.unsubscribe(websocket, *parse_exchange(message))
+            elif message == "stats":
+                await websocket.send(json.dumps({
+                    "cache": rate_cache.stats(),
+                    "upstream": api_client.stats(),
+                    "log": exchange_log.stats(),
+                    "broadcast": broadcaster.stats(),
+                }))
             else:
                 await websocket.send("Unknown command")
     except websockets.exceptions.ConnectionClosed:
         pass
     finally:
         connected_clients.remove(websocket)
-
-async def main():
-    async with websockets.serve(handle_client, "localhost", 8765):
-        await asyncio.Future()  # run forever
+        broadcaster.remove(websocket)
+
+async def setup(base_url=None, store_path=None, log_path="exchange_log.txt", cache_socket=None):
+    global api_client, rate_cache, exchange_log, broadcaster
+    if cache_socket:
+        # Воркер cluster.py: курси дає спільний кеш-процес, сховище веде він же
+        api_client = RemoteRateClient(cache_socket)
+        store = None
+    else:
+        api_client = PrivatBankAPIClient(base_url=base_url)
+        store = RateStore(store_path) if store_path else RateStore()
+    rate_cache = RateCache(api_client, store=store)
+    # Прогріваємо кеш з диска, щоб 10-денне вікно не йшло в API після рестарту
+    await rate_cache.warm(10)
+    exchange_log = ExchangeLog(log_path)
+    exchange_log.start()
+    broadcaster = Broadcaster(rate_cache)
+    return store
+
+async def shutdown(store):
+    await broadcaster.close()
+    await exchange_log.close()
+    await api_client.close()
+    if store is not None:
+        store.close()
+
+async def main(host="localhost", port=8765):
+    store = await setup()
+    try:
+        async with websockets.serve(handle_client, host, port):
+            await asyncio.Future()  # run forever
+    finally:
+        await shutdown(store)
 
 if __name__ == "__main__":
     asyncio.run(main())
-
-
-
-
-
-
@@ -0,0 +1,167 @@
+import sys
+import os
+import time
+import socket
+import signal
+import asyncio
+import argparse
+import multiprocessing
+
+import websockets
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, 'currency_exchange'))
+
+import chat_server
+import shared_cache
+
+# Багатопроцесний режим chat_server: N воркерів слухають той самий порт через
+# SO_REUSEPORT (ядро розподіляє з'єднання між ними), курси беруть зі спільного
+# кеш-процесу через Unix-сокет, а супервізор перезапускає процеси, що впали.
+
+RESTART_BACKOFF = 1.0
+MAX_RESTART_BACKOFF = 30.0
+
+
+def reuseport_socket(host, port):
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise RuntimeError("SO_REUSEPORT не підтримується на цій платформі")
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(1024)
+    sock.setblocking(False)
+    return sock
+
+
+def stop_on_sigterm():
+    # Супервізор зупиняє процеси через terminate(), тобто SIGTERM. Без обробника
+    # процес гине одразу, і finally не дописує журнал і не закриває сховище
+    stop = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    return stop
+
+
+async def worker_main(host, port, cache_socket, log_path):
+    stop = stop_on_sigterm()
+    store = await chat_server.setup(cache_socket=cache_socket, log_path=log_path)
+    try:
+        async with websockets.serve(chat_server.handle_client, sock=reuseport_socket(host, port)):
+            await stop.wait()
+    finally:
+        await chat_server.shutdown(store)
+
+
+async def cache_main(cache_socket, base_url, store_path):
+    stop = stop_on_sigterm()
+    server = shared_cache.CacheServer(cache_socket, base_url=base_url, store_path=store_path)
+    await server.start()
+    try:
+        await stop.wait()
+    finally:
+        await server.close()
+
+
+def run_worker(host, port, cache_socket, log_path):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(worker_main(host, port, cache_socket, log_path))
+
+
+def run_cache(cache_socket, base_url, store_path):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(cache_main(cache_socket, base_url, store_path))
+
+
+class Supervisor:
+    def __init__(self, workers, host, port, cache_socket, base_url=None, store_path=None, log_dir="."):
+        self.context = multiprocessing.get_context("spawn")
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.cache_socket = cache_socket
+        self.base_url = base_url
+        self.store_path = store_path
+        self.log_dir = log_dir
+        # ім'я -> [процес, час запуску, поточна затримка перезапуску]
+        self.processes = {}
+        self.restarts = 0
+        self.running = True
+
+    def _spawn(self, name):
+        if name == "cache":
+            target, args = run_cache, (self.cache_socket, self.base_url, self.store_path)
+        else:
+            # У кожного воркера свій журнал, щоб ротації не заважали одна одній
+            log_path = os.path.join(self.log_dir, f"exchange_log.{name}.txt")
+            target, args = run_worker, (self.host, self.port, self.cache_socket, log_path)
+        process = self.context.Process(target=target, args=args, name=name, daemon=True)
+        process.start()
+        backoff = self.processes[name][2] if name in self.processes else RESTART_BACKOFF
+        self.processes[name] = [process, time.monotonic(), backoff]
+        return process
+
+    def _wait_for_cache(self, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while not os.path.exists(self.cache_socket):
+            if time.monotonic() > deadline:
+                raise RuntimeError("кеш-процес не створив сокет")
+            time.sleep(0.05)
+
+    def start(self):
+        if os.path.exists(self.cache_socket):
+            os.remove(self.cache_socket)
+        self._spawn("cache")
+        self._wait_for_cache()
+        for i in range(self.workers):
+            self._spawn(f"worker-{i}")
+
+    def check(self):
+        now = time.monotonic()
+        for name, (process, started_at, backoff) in list(self.processes.items()):
+            if process.is_alive():
+                # Процес протримався довше за backoff - скидаємо затримку
+                if now - started_at > backoff * 2:
+                    self.processes[name][2] = RESTART_BACKOFF
+                continue
+            if now - started_at < backoff:
+                continue
+            print(f"{name} exited with code {process.exitcode}, restarting")
+            self.restarts += 1
+            self.processes[name][2] = min(backoff * 2, MAX_RESTART_BACKOFF)
+            self._spawn(name)
+
+    def stop(self):
+        self.running = False
+        for process, _, _ in self.processes.values():
+            process.terminate()
+        for process, _, _ in self.processes.values():
+            process.join(5)
+        if os.path.exists(self.cache_socket):
+            os.remove(self.cache_socket)
+
+    def run(self, interval=0.5):
+        self.start()
+        signal.signal(signal.SIGTERM, lambda *_: setattr(self, "running", False))
+        try:
+            while self.running:
+                time.sleep(interval)
+                self.check()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="chat_server у кількох процесах на одному порту")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cache-socket", default=os.path.join(current_dir, "rate_cache.sock"))
+    parser.add_argument("--base-url", default=None, help="адреса API (для тестів з локальною заміною)")
+    parser.add_argument("--store", default=None, help="шлях до бази RateStore")
+    args = parser.parse_args()
+
+    Supervisor(args.workers, args.host, args.port, args.cache_socket,
+               base_url=args.base_url, store_path=args.store).run()
@@ -1,30 +1,148 @@
 import aiohttp
 import asyncio
+import time
 from datetime import datetime, timedelta
 
+from resilience import CircuitBreaker, LatencyTracker, backoff_delay
+
 class PrivatBankAPIClient:
     BASE_URL = "https://api.privatbank.ua/p24api/exchange_rates?json&date="
 
-    def __init__(self):
-        pass
+    def __init__(self, base_url=None, limit=100, limit_per_host=10, dns_ttl=300,
+                 keepalive_timeout=30, max_concurrency=10, request_timeout=5.0,
+                 retries=2, hedge_percentile=95, breaker=None):
+        self.base_url = base_url or self.BASE_URL
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        # Обмежуємо кількість одночасних запитів до API на весь клієнт,
+        # а не на один виклик get_exchange_rates
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.timeout = aiohttp.ClientTimeout(total=request_timeout)
+        self.retries = retries
+        # Якщо запит довший за цей перцентиль, паралельно шлемо дублікат
+        self.hedge_percentile = hedge_percentile
+        self.latency = LatencyTracker()
+        self.breaker = breaker or CircuitBreaker()
+        self.counters = {
+            "requests": 0,
+            "failures": 0,
+            "timeouts": 0,
+            "retries": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "short_circuited": 0,
+        }
+        self._session = None
 
-    async def fetch_exchange_rate(self, session, date):
-        url = f"{self.BASE_URL}{date}"
-        try:
-            async with session.get(url) as response:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @property
+    def session(self):
+        # Сесія створюється ліниво, щоб її прив'язало до запущеного циклу подій
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def stats(self):
+        hedge_delay = self._hedge_delay()
+        return {
+            **self.counters,
+            "circuit": self.breaker.stats(),
+            "hedge_after_ms": round(hedge_delay * 1000, 1) if hedge_delay is not None else None,
+        }
+
+    def _hedge_delay(self):
+        if not self.hedge_percentile:
+            return None
+        return self.latency.percentile(self.hedge_percentile)
+
+    async def _request(self, url):
+        async with self.semaphore:
+            start = time.monotonic()
+            self.counters["requests"] += 1
+            async with self.session.get(url) as response:
                 response.raise_for_status()
                 data = await response.json()
+            self.latency.add(time.monotonic() - start)
+            return data
+
+    async def _hedged_request(self, url):
+        tasks = [asyncio.ensure_future(self._request(url))]
+        try:
+            hedge_delay = self._hedge_delay()
+            if hedge_delay is None:
+                return await tasks[0]
+
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done:
+                self.counters["hedges"] += 1
+                tasks.append(asyncio.ensure_future(self._request(url)))
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not tasks[0]:
+                            self.counters["hedge_wins"] += 1
+                        return task.result()
+            # Обидва запити впали - повертаємо помилку основного
+            return tasks[0].result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+
+    async def fetch_exchange_rate(self, date):
+        url = f"{self.base_url}{date}"
+        for attempt in range(self.retries + 1):
+            if not self.breaker.allow():
+                # Поки ланцюг розімкнений, API не чіпаємо: RateCache віддасть застарілі дані
+                self.counters["short_circuited"] += 1
+                return None
+            try:
+                data = await self._hedged_request(url)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.breaker.record_failure()
+                self.counters["failures"] += 1
+                if isinstance(e, asyncio.TimeoutError):
+                    self.counters["timeouts"] += 1
+                if attempt == self.retries:
+                    print(f"HTTP error occurred: {e!r}")
+                    return None
+                self.counters["retries"] += 1
+                await asyncio.sleep(backoff_delay(attempt))
+            except BaseException:
+                # Скасування не є відмовою API, але пробний запит half_open треба звільнити
+                self.breaker.release()
+                raise
+            else:
+                self.breaker.record_success()
                 return data
-        except aiohttp.ClientError as e:
-            print(f"HTTP error occurred: {e}")
-            return None
 
     async def get_exchange_rates(self, days):
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            for day in range(days):
-                date = (datetime.now() - timedelta(days=day)).strftime('%d.%m.%Y')
-                tasks.append(self.fetch_exchange_rate(session, date))
-            exchange_rates = await asyncio.gather(*tasks)
-            return exchange_rates
-
+        tasks = []
+        for day in range(days):
+            date = (datetime.now() - timedelta(days=day)).strftime('%d.%m.%Y')
+            tasks.append(self.fetch_exchange_rate(date))
+        exchange_rates = await asyncio.gather(*tasks)
+        return exchange_rates
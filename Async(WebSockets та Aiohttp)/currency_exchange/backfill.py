@@ -0,0 +1,54 @@
+import sys
+import asyncio
+import argparse
+from datetime import date, datetime, timedelta
+
+from api_client import PrivatBankAPIClient
+from rate_cache import DATE_FORMAT
+from rate_store import RateStore, DEFAULT_PATH
+
+
+def parse_date(value):
+    return datetime.strptime(value, DATE_FORMAT).date()
+
+
+async def backfill(store, start, end, concurrency=10):
+    # Сьогоднішній день не зберігаємо: його курс ще може змінитися
+    end = min(end, date.today() - timedelta(days=1))
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    days = store.missing(days)
+
+    async with PrivatBankAPIClient(max_concurrency=concurrency) as client:
+        async def fetch(day):
+            return day, await client.fetch_exchange_rate(day.strftime(DATE_FORMAT))
+
+        fetched = 0
+        for future in asyncio.as_completed([fetch(day) for day in days]):
+            day, payload = await future
+            if payload is not None:
+                store.put(day, payload)
+                fetched += 1
+    return fetched, len(days)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Завантажити архів курсів PrivatBank у локальне сховище")
+    parser.add_argument("--days", type=int, default=10, help="скільки днів до сьогодні завантажити")
+    parser.add_argument("--start", type=parse_date, help="початкова дата, дд.мм.рррр")
+    parser.add_argument("--end", type=parse_date, help="кінцева дата, дд.мм.рррр")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    args = parser.parse_args()
+
+    end = args.end or date.today() - timedelta(days=1)
+    start = args.start or end - timedelta(days=args.days - 1)
+    if start > end:
+        print("Початкова дата пізніша за кінцеву.")
+        sys.exit(1)
+
+    store = RateStore(args.db)
+    try:
+        fetched, requested = asyncio.run(backfill(store, start, end, args.concurrency))
+    finally:
+        store.close()
+    print(f"Завантажено {fetched} з {requested} відсутніх днів ({start:%d.%m.%Y} - {end:%d.%m.%Y}).")
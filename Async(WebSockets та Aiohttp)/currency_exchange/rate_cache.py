@@ -0,0 +1,124 @@
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from utils import index_payload
+
+DATE_FORMAT = '%d.%m.%Y'
+
+
+class RateCache:
+    # Курси за минулі дати не змінюються, тому зберігаються без терміну дії.
+    # Сьогоднішній курс ще може оновитися, тому живе лише today_ttl секунд.
+    # Якщо передано store (RateStore), минулі дати читаються з диска раніше,
+    # ніж з API, і записуються туди після завантаження.
+    # У пам'яті зберігаються вже проіндексовані DayRates, а не сирий JSON.
+    # Запити до store - синхронний sqlite3, тож вони йдуть в окремий потік
+    # (asyncio.to_thread), як і запис ExchangeLog, щоб не блокувати цикл подій.
+
+    def __init__(self, client, maxsize=512, today_ttl=300, store=None):
+        self.client = client
+        self.store = store
+        self.maxsize = maxsize
+        self.today_ttl = today_ttl
+        self._entries = OrderedDict()  # date -> (payload, expires_at | None)
+        self._inflight = {}  # date -> Task
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.store_hits = 0
+        self.stale_served = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "store_hits": self.store_hits,
+            "stale_served": self.stale_served,
+            "size": len(self._entries),
+            "inflight": len(self._inflight),
+        }
+
+    def put(self, day, payload):
+        payload = index_payload(payload)
+        expires_at = time.monotonic() + self.today_ttl if day >= date.today() else None
+        self._entries[day] = (payload, expires_at)
+        self._entries.move_to_end(day)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return payload
+
+    def peek(self, day):
+        entry = self._entries.get(day)
+        if entry is None:
+            return None
+        payload, expires_at = entry
+        # Прострочений запис лишається в LRU як запасний варіант (див. _load)
+        if expires_at is not None and expires_at <= time.monotonic():
+            return None
+        self._entries.move_to_end(day)
+        return payload
+
+    async def get(self, day):
+        payload = self.peek(day)
+        if payload is not None:
+            self.hits += 1
+            return payload
+
+        task = self._inflight.get(day)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(day))
+            self._inflight[day] = task
+            task.add_done_callback(lambda _: self._inflight.pop(day, None))
+        # shield: якщо один з клієнтів відключиться, запит для інших не скасується
+        return await asyncio.shield(task)
+
+    async def warm(self, days):
+        # Масово піднімає з диска останні days днів, щоб сервер стартував теплим
+        if self.store is None:
+            return 0
+        today = date.today()
+        loaded = 0
+        # load_range - генератор: list() виконує і SELECT, і читання рядків у потоці
+        rows = await asyncio.to_thread(list, self.store.load_range(today - timedelta(days=days - 1), today))
+        for day, payload in rows:
+            if day < today:
+                self.put(day, payload)
+                loaded += 1
+        return loaded
+
+    async def _load(self, day):
+        past = day < date.today()
+        if past and self.store is not None:
+            payload = await asyncio.to_thread(self.store.get, day)
+            if payload is not None:
+                self.store_hits += 1
+                return self.put(day, payload)
+
+        payload = await self.client.fetch_exchange_rate(day.strftime(DATE_FORMAT))
+        # Помилки (None) не кешуємо, щоб наступний запит спробував ще раз.
+        # Якщо API недоступне (або розімкнений запобіжник), віддаємо застарілий запис
+        if payload is None:
+            entry = self._entries.get(day)
+            if entry is None:
+                return None
+            self.stale_served += 1
+            return entry[0]
+        if past and self.store is not None:
+            await asyncio.to_thread(self.store.put, day, payload)
+        return self.put(day, payload)
+
+    def window(self, days):
+        today = date.today()
+        return [today - timedelta(days=day) for day in range(days)]
+
+    async def get_exchange_rates(self, days):
+        return await asyncio.gather(*(self.get(day) for day in self.window(days)))
+
+    async def close(self):
+        await self.client.close()
@@ -0,0 +1,63 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import date
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exchange_rates.db')
+
+
+class RateStore:
+    # Сирі добові відповіді PrivatBank у SQLite. Первинний ключ WITHOUT ROWID
+    # таблиці і є індексом за датою; mmap_size дозволяє читати його сторінки
+    # з відображеної в пам'ять бази без окремих read() на кожен запит.
+    # RateCache викликає методи з потоків asyncio.to_thread, тому з'єднання
+    # не прив'язане до потоку, а звернення до нього йдуть під замком.
+
+    def __init__(self, path=DEFAULT_PATH, mmap_size=64 * 1024 * 1024):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS rates ("
+            " day TEXT PRIMARY KEY,"
+            " payload TEXT NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __contains__(self, day):
+        with self._lock:
+            row = self.conn.execute("SELECT 1 FROM rates WHERE day = ?", (day.isoformat(),)).fetchone()
+        return row is not None
+
+    def get(self, day):
+        with self._lock:
+            row = self.conn.execute("SELECT payload FROM rates WHERE day = ?", (day.isoformat(),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, day, payload):
+        self.put_many([(day, payload)])
+
+    def put_many(self, items):
+        rows = [(day.isoformat(), json.dumps(payload, ensure_ascii=False)) for day, payload in items]
+        with self._lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO rates (day, payload) VALUES (?, ?)", rows)
+
+    def load_range(self, start, end):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT day, payload FROM rates WHERE day BETWEEN ? AND ? ORDER BY day",
+                (start.isoformat(), end.isoformat()),
+            ).fetchall()
+        for day, payload in rows:
+            yield date.fromisoformat(day), json.loads(payload)
+
+    def missing(self, days):
+        return [day for day in days if day not in self]
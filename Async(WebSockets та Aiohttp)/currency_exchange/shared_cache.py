@@ -0,0 +1,155 @@
+import asyncio
+import itertools
+import json
+import os
+from datetime import datetime
+
+from api_client import PrivatBankAPIClient
+from rate_cache import RateCache, DATE_FORMAT
+from rate_store import RateStore
+
+# Кеш-процес для багатопроцесного режиму (див. cluster.py). Воркери ходять
+# до нього через Unix-сокет замість PrivatBank API, тож на всі ядра є один
+# RateCache і одне коалесування запитів.
+#
+# Протокол рядковий, запити мультиплексуються за id:
+#   "<id> <дд.мм.рррр>\n" -> "<id> <JSON у форматі API або null>\n"
+#   "<id> STATS\n"        -> "<id> <JSON зі статистикою кешу і клієнта>\n"
+
+
+class CacheServer:
+    def __init__(self, socket_path, base_url=None, store_path=None):
+        self.socket_path = socket_path
+        self.client = PrivatBankAPIClient(base_url=base_url)
+        self.store = RateStore(store_path) if store_path else RateStore()
+        self.cache = RateCache(self.client, store=self.store)
+        self.server = None
+
+    async def start(self):
+        await self.cache.warm(10)
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        self.server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.client.close()
+        self.store.close()
+
+    async def _handle(self, reader, writer):
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(self._answer(line.decode(), writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _answer(self, line, writer):
+        request_id, _, argument = line.strip().partition(" ")
+        if argument == "STATS":
+            body = {"cache": self.cache.stats(), "upstream": self.client.stats()}
+        else:
+            try:
+                day = datetime.strptime(argument, DATE_FORMAT).date()
+            except ValueError:
+                day = None
+            payload = await self.cache.get(day) if day is not None else None
+            body = payload.as_payload() if payload is not None else None
+        writer.write(f"{request_id} {json.dumps(body, ensure_ascii=False, separators=(',', ':'))}\n".encode())
+
+
+class RemoteRateClient:
+    # Замінює PrivatBankAPIClient у воркері: той самий fetch_exchange_rate,
+    # але відповідь дає кеш-процес. Одне з'єднання на воркер.
+
+    def __init__(self, socket_path, timeout=10.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._ids = itertools.count()
+        self._pending = {}
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+        self._connecting = None
+        self.counters = {"requests": 0, "failures": 0, "reconnects": 0}
+
+    def stats(self):
+        return {**self.counters, "pending": len(self._pending)}
+
+    async def _connection(self):
+        if self._writer is not None and not self._writer.is_closing():
+            return self._writer
+        # Одночасні запити чекають на одне й те саме підключення
+        if self._connecting is None:
+            self._connecting = asyncio.ensure_future(self._connect())
+        try:
+            return await asyncio.shield(self._connecting)
+        finally:
+            self._connecting = None
+
+    async def _connect(self):
+        if self._reader_task is not None:
+            self.counters["reconnects"] += 1
+        self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+        self._reader_task = asyncio.create_task(self._read_responses(self._reader))
+        return self._writer
+
+    async def _read_responses(self, reader):
+        try:
+            while line := await reader.readline():
+                request_id, _, body = line.decode().partition(" ")
+                future = self._pending.pop(int(request_id), None)
+                if future is not None and not future.done():
+                    future.set_result(json.loads(body))
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            # Кеш-процес перезапустився або впав: наступний запит підключиться знову
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("cache process disconnected"))
+            self._pending.clear()
+
+    async def _call(self, argument):
+        self.counters["requests"] += 1
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            writer = await self._connection()
+            writer.write(f"{request_id} {argument}\n".encode())
+            async with asyncio.timeout(self.timeout):
+                return await future
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def fetch_exchange_rate(self, date):
+        try:
+            return await self._call(date)
+        except (OSError, asyncio.TimeoutError) as e:
+            self.counters["failures"] += 1
+            print(f"Cache process error: {e!r}")
+            return None
+
+    async def remote_stats(self):
+        return await self._call("STATS")
+
+    async def close(self):
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
@@ -1,16 +1,57 @@
-def extract_currency_data(data, currencies):
+class RateEntry:
+    __slots__ = ('sale', 'purchase')
+
+    def __init__(self, sale, purchase):
+        self.sale = sale
+        self.purchase = purchase
+
+    def as_dict(self):
+        return {'sale': self.sale, 'purchase': self.purchase}
+
+
+class DayRates:
+    # Відповідь API за один день, проіндексована за кодом валюти
+    __slots__ = ('date', 'rates')
+
+    def __init__(self, date, rates):
+        self.date = date
+        self.rates = rates
+
+    def as_payload(self):
+        # Компактний JSON у форматі API, з якого index_payload відновить DayRates
+        return {
+            'date': self.date,
+            'exchangeRate': [
+                {'currency': currency, 'saleRate': entry.sale, 'purchaseRate': entry.purchase}
+                for currency, entry in self.rates.items()
+            ],
+        }
+
+
+def index_payload(record):
+    # Будується один раз, коли відповідь потрапляє в процес (див. RateCache.put)
+    if not record or isinstance(record, DayRates):
+        return record or None
+    rates = {}
+    for item in record['exchangeRate']:
+        currency = item.get('currency')
+        # Як і раніше з next(...), враховуємо перший запис для валюти
+        if currency and currency not in rates:
+            rates[currency] = RateEntry(item.get('saleRate', 'N/A'), item.get('purchaseRate', 'N/A'))
+    return DayRates(record['date'], rates)
+
+
+def extract_currency_data(data, currencies=None):
+    # currencies=None повертає всі валюти, які є в архіві за день
     rates = {}
     for record in data:
-        if not record:
+        day = index_payload(record)
+        if day is None:
             continue
-        date = record['date']
-        rates[date] = {}
-        for currency in currencies:
-            currency_data = next((item for item in record['exchangeRate'] if item['currency'] == currency), None)
-            if currency_data:
-                rates[date][currency] = {
-                    'sale': currency_data.get('saleRate', 'N/A'),
-                    'purchase': currency_data.get('purchaseRate', 'N/A')
-                }
+        entries = day.rates
+        if currencies is None:
+            rates[day.date] = {currency: entry.as_dict() for currency, entry in entries.items()}
+        else:
+            rates[day.date] = {currency: entries[currency].as_dict()
+                               for currency in currencies if currency in entries}
     return rates
-
@@ -0,0 +1,114 @@
+import asyncio
+import os
+from datetime import datetime
+
+
+class ExchangeLog:
+    # Журнал команд без очікування диска в обробнику: log() лише кладе рядок
+    # у чергу, а фонова задача пише рядки пачками в окремому потоці.
+    # Помилка диска (OSError) втрачає лише свою пачку: задача рахує її в errors
+    # і далі розбирає чергу, інакше черга заповнилась би і close() чекав би вічно.
+
+    def __init__(self, path="exchange_log.txt", max_queue=10000, batch_size=256,
+                 flush_interval=1.0, max_bytes=10 * 1024 * 1024, backup_count=3,
+                 sample_every=10):
+        self.path = path
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        # Коли черга заповнена на 3/4, пишемо лише кожен sample_every-й рядок
+        self.high_water = max_queue * 3 // 4
+        self.sample_every = sample_every
+        self._task = None
+        self._sampled = 0
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def stats(self):
+        return {
+            "queued": self.queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is None:
+            return
+        # None - сигнал завершення; чекаємо місця, щоб не втратити хвіст черги.
+        # Якщо задача вже завершилась, черги ніхто не розбирає - сигнал не потрібен
+        if not self._task.done():
+            await self.queue.put(None)
+        await self._task
+        self._task = None
+
+    def log(self, message):
+        if self.queue.qsize() >= self.high_water:
+            self._sampled += 1
+            if self._sampled % self.sample_every:
+                self.dropped += 1
+                return
+        try:
+            self.queue.put_nowait(f"{datetime.now()}: {message}\n")
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            line = await self.queue.get()
+            if line is None:
+                break
+            batch = [line]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    line = self.queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    # asyncio.timeout, а не wait_for: wait_for у 3.11 може
+                    # проковтнути скасування задачі під час зупинки сервера
+                    try:
+                        async with asyncio.timeout(timeout):
+                            line = await self.queue.get()
+                    except TimeoutError:
+                        break
+                if line is None:
+                    stopping = True
+                    break
+                batch.append(line)
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except OSError as e:
+                self.errors += 1
+                self.dropped += len(batch)
+                print(f"Exchange log write error: {e!r}")
+                continue
+            self.written += len(batch)
+
+    def _write(self, batch):
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write("".join(batch))
+            size = file.tell()
+        if self.max_bytes and size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        if self.backup_count:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
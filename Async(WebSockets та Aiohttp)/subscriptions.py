@@ -0,0 +1,162 @@
+import asyncio
+import json
+
+from websockets.exceptions import ConnectionClosed
+
+from utils import extract_currency_data
+
+
+class Subscriber:
+    # Власна обмежена черга відправки на кожне з'єднання: повільний клієнт
+    # не змушує сервер буферизувати повідомлення без кінця
+    def __init__(self, websocket, max_queue=16):
+        self.websocket = websocket
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.topics = set()
+        self.task = asyncio.create_task(self._run())
+
+    def push(self, payload):
+        try:
+            self.queue.put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def _run(self):
+        try:
+            while True:
+                payload = await self.queue.get()
+                # Готові UTF-8 байти йдуть текстовим кадром без повторного кодування
+                await self.websocket.send(payload, text=True)
+        except ConnectionClosed:
+            # Підписку прибере handle_client, коли з'єднання завершиться
+            pass
+
+    def close(self):
+        self.task.cancel()
+
+
+class Topic:
+    def __init__(self, days, currencies):
+        self.days = days
+        self.currencies = currencies
+        self.subscribers = set()
+        self.payload = None
+        self.task = None
+
+    @property
+    def name(self):
+        return " ".join(["exchange", str(self.days), *(self.currencies or ["ALL"])])
+
+
+def topic_key(days, currencies):
+    return (days, tuple(currencies) if currencies is not None else None)
+
+
+class Broadcaster:
+    # Дані для теми рахуються й серіалізуються один раз на оновлення,
+    # і ті самі байти розсилаються всім підписникам
+    def __init__(self, cache, interval=60, max_queue=16):
+        self.cache = cache
+        self.interval = interval
+        self.max_queue = max_queue
+        self.topics = {}
+        self.subscribers = {}
+        self.dropped = 0
+        self.errors = 0
+        # Задачі закриття відкинутих клієнтів: посилання тримаємо, доки вони не завершаться
+        self._closing = set()
+
+    def stats(self):
+        return {
+            "topics": len(self.topics),
+            "subscribers": len(self.subscribers),
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
+
+    def subscribe(self, websocket, days, currencies):
+        key = topic_key(days, currencies)
+        topic = self.topics.get(key)
+        if topic is None:
+            topic = self.topics[key] = Topic(days, currencies)
+            topic.task = asyncio.create_task(self._refresh(topic))
+
+        subscriber = self.subscribers.get(websocket)
+        if subscriber is None:
+            subscriber = self.subscribers[websocket] = Subscriber(websocket, self.max_queue)
+        if key in subscriber.topics:
+            return
+        subscriber.topics.add(key)
+        topic.subscribers.add(subscriber)
+        if topic.payload is not None and not subscriber.push(topic.payload):
+            self._drop(subscriber)
+
+    def unsubscribe(self, websocket, days=None, currencies=None):
+        subscriber = self.subscribers.get(websocket)
+        if subscriber is None:
+            return
+        keys = list(subscriber.topics) if days is None else [topic_key(days, currencies)]
+        for key in keys:
+            if key in subscriber.topics:
+                subscriber.topics.discard(key)
+                self._leave(key, subscriber)
+        if not subscriber.topics:
+            del self.subscribers[websocket]
+            subscriber.close()
+
+    def remove(self, websocket):
+        self.unsubscribe(websocket)
+
+    def broadcast(self, topic, payload):
+        topic.payload = payload
+        for subscriber in list(topic.subscribers):
+            if not subscriber.push(payload):
+                self._drop(subscriber)
+
+    async def close(self):
+        for websocket in list(self.subscribers):
+            self.remove(websocket)
+        await asyncio.gather(*self._closing, return_exceptions=True)
+
+    def _leave(self, key, subscriber):
+        topic = self.topics.get(key)
+        if topic is None:
+            return
+        topic.subscribers.discard(subscriber)
+        if not topic.subscribers:
+            del self.topics[key]
+            topic.task.cancel()
+
+    def _drop(self, subscriber):
+        self.dropped += 1
+        websocket = subscriber.websocket
+        self.remove(websocket)
+        # 1013 "Try Again Later": клієнт не встигає читати повідомлення
+        task = asyncio.create_task(websocket.close(1013, "slow consumer"))
+        self._closing.add(task)
+        task.add_done_callback(self._closed)
+
+    def _closed(self, task):
+        self._closing.discard(task)
+        # Помилка закриття вже відкинутого з'єднання нічого не змінює, але її
+        # треба забрати, інакше asyncio скаржиться на незабраний виняток
+        if not task.cancelled():
+            task.exception()
+
+    async def _refresh(self, topic):
+        while True:
+            # Збій одного оновлення (напр. обрив сокета RemoteRateClient) не зупиняє
+            # тему: підписники отримають дані на наступній ітерації
+            try:
+                data = await self.cache.get_exchange_rates(topic.days)
+                rates = extract_currency_data(data, topic.currencies)
+                payload = json.dumps({"topic": topic.name, "rates": rates},
+                                     ensure_ascii=False, separators=(",", ":")).encode()
+                # Минулі дні не змінюються, тож розсилаємо лише оновлені дані
+                if payload != topic.payload:
+                    self.broadcast(topic, payload)
+            except Exception as e:
+                self.errors += 1
+                print(f"Topic {topic.name} refresh error: {e!r}")
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,6 @@
+import sys
+import os
+
+# Модулі currency_exchange імпортують один одного напряму, як у main.py
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '..', 'currency_exchange'))
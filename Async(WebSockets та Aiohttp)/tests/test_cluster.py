@@ -0,0 +1,46 @@
+import time
+import socket
+import asyncio
+import multiprocessing
+
+import websockets
+
+from cluster import run_worker
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def test_terminated_worker_flushes_exchange_log(tmp_path):
+    port = free_port()
+    log_path = tmp_path / "exchange_log.txt"
+    context = multiprocessing.get_context("spawn")
+    # Кеш-процес не потрібен: відповідь на "exchange 11" не читає курсів
+    process = context.Process(target=run_worker, args=("localhost", port, str(tmp_path / "cache.sock"), str(log_path)))
+    process.start()
+
+    async def command():
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                async with websockets.connect(f"ws://localhost:{port}") as websocket:
+                    await websocket.send("exchange 11")
+                    return await websocket.recv()
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.1)
+
+    try:
+        response = asyncio.run(command())
+    finally:
+        # Як Supervisor.stop(): SIGTERM, поки рядок ще в черзі журналу
+        process.terminate()
+        process.join(10)
+
+    assert "10 днів" in response
+    assert process.exitcode == 0
+    assert "Command: exchange 11" in log_path.read_text(encoding="utf-8")
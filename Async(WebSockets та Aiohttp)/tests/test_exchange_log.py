@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+import chat_server
+from exchange_log import ExchangeLog
+from rate_cache import RateCache
+from subscriptions import Broadcaster
+from tests.test_rate_cache import FakeClient
+
+
+class FakeWebSocket:
+    def __init__(self, messages):
+        self.messages = messages
+        self.sent = []
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for message in self.messages:
+            yield message
+
+    async def send(self, message):
+        self.sent.append(message)
+
+
+class SlowDiskLog(ExchangeLog):
+    def _write(self, batch):
+        time.sleep(0.5)
+        super()._write(batch)
+
+
+def test_responses_do_not_wait_for_disk(tmp_path, monkeypatch):
+    async def scenario():
+        log = SlowDiskLog(str(tmp_path / "exchange_log.txt"), flush_interval=0.01)
+        monkeypatch.setattr(chat_server, "exchange_log", log)
+        cache = RateCache(FakeClient(latency=0))
+        monkeypatch.setattr(chat_server, "rate_cache", cache)
+        monkeypatch.setattr(chat_server, "broadcaster", Broadcaster(cache))
+        log.start()
+
+        websocket = FakeWebSocket(["exchange 2"] * 20)
+        start = time.perf_counter()
+        await chat_server.handle_client(websocket)
+        elapsed = time.perf_counter() - start
+
+        await log.close()
+        return websocket, log, elapsed
+
+    websocket, log, elapsed = asyncio.run(scenario())
+
+    assert len(websocket.sent) == 20
+    assert elapsed < 0.25
+    assert log.written == 20
+    assert (tmp_path / "exchange_log.txt").read_text(encoding="utf-8").count("Command: exchange 2") == 20
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    async def scenario():
+        log = ExchangeLog(str(tmp_path / "exchange_log.txt"), max_queue=8, sample_every=2)
+        for i in range(100):
+            log.log(f"line {i}")
+        return log
+
+    log = asyncio.run(scenario())
+
+    assert log.queue.qsize() == 8
+    assert log.dropped == 92
+
+
+def test_rotation_by_size(tmp_path):
+    path = tmp_path / "exchange_log.txt"
+
+    async def scenario():
+        log = ExchangeLog(str(path), batch_size=10, flush_interval=0.01, max_bytes=500, backup_count=2)
+        log.start()
+        for i in range(100):
+            log.log(f"line {i}")
+            await asyncio.sleep(0)
+        await log.close()
+
+    asyncio.run(scenario())
+
+    assert (tmp_path / "exchange_log.txt.1").exists()
+    assert (tmp_path / "exchange_log.txt.2").exists()
+    assert not (tmp_path / "exchange_log.txt.3").exists()
+
+
+class FailingDiskLog(ExchangeLog):
+    def __init__(self, *args, failures=1, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failures = failures
+
+    def _write(self, batch):
+        if self.failures:
+            self.failures -= 1
+            raise OSError(28, "No space left on device")
+        super()._write(batch)
+
+
+def test_write_error_does_not_stop_the_writer(tmp_path):
+    path = tmp_path / "exchange_log.txt"
+
+    async def scenario():
+        log = FailingDiskLog(str(path), max_queue=4, batch_size=1, flush_interval=0.01, sample_every=1)
+        log.start()
+        log.log("lost")
+        await asyncio.sleep(0.05)
+        for i in range(10):
+            log.log(f"line {i}")
+            await asyncio.sleep(0.01)
+        async with asyncio.timeout(1):
+            await log.close()
+        return log
+
+    log = asyncio.run(scenario())
+
+    assert log.errors == 1
+    assert log.written == 10
+    assert "lost" not in path.read_text(encoding="utf-8")
@@ -0,0 +1,18 @@
+import sys
+import os
+import asyncio
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '..', 'benchmarks'))
+
+import load_test
+
+
+def test_load_smoke():
+    # Короткий прогін load_test для CI: регресії кешу видно за кількістю запитів до API
+    report = asyncio.run(load_test.run(clients=50, commands=3, days=10, latency=0.01))
+
+    assert report["commands"] == 150
+    assert report["errors"] == 0
+    assert report["upstream_calls"] == 10
+    assert report["p99_ms"] < 2000
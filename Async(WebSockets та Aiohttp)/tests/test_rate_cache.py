@@ -0,0 +1,100 @@
+import asyncio
+import threading
+from datetime import date, timedelta
+
+from rate_cache import RateCache
+from rate_store import RateStore
+
+
+class FakeClient:
+    def __init__(self, latency=0.01):
+        self.latency = latency
+        self.calls = []
+
+    async def fetch_exchange_rate(self, date_str):
+        self.calls.append(date_str)
+        await asyncio.sleep(self.latency)
+        return {"date": date_str, "exchangeRate": []}
+
+    async def close(self):
+        pass
+
+
+def test_concurrent_clients_are_coalesced():
+    client = FakeClient()
+    cache = RateCache(client)
+
+    async def burst():
+        return await asyncio.gather(*(cache.get_exchange_rates(10) for _ in range(200)))
+
+    results = asyncio.run(burst())
+
+    assert len(client.calls) == 10
+    assert all(len(result) == 10 for result in results)
+    assert cache.stats()["misses"] == 10
+    assert cache.stats()["coalesced"] == 200 * 10 - 10
+
+
+def test_past_dates_are_kept_and_today_expires():
+    client = FakeClient(latency=0)
+    cache = RateCache(client, today_ttl=0)
+    yesterday = date.today() - timedelta(days=1)
+
+    async def scenario():
+        await cache.get(yesterday)
+        await cache.get(yesterday)
+        await cache.get(date.today())
+        await cache.get(date.today())
+
+    asyncio.run(scenario())
+
+    assert cache.hits == 1
+    assert len(client.calls) == 3
+
+
+def test_lru_is_bounded():
+    client = FakeClient(latency=0)
+    cache = RateCache(client, maxsize=3)
+
+    asyncio.run(cache.get_exchange_rates(10))
+
+    assert cache.stats()["size"] == 3
+
+
+def test_store_serves_past_dates_after_restart(tmp_path):
+    store = RateStore(str(tmp_path / "rates.db"))
+    client = FakeClient(latency=0)
+    asyncio.run(RateCache(client, store=store).get_exchange_rates(10))
+    assert len(client.calls) == 10
+
+    # "Рестарт": новий кеш і клієнт, та сама база
+    client = FakeClient(latency=0)
+    cache = RateCache(client, store=store)
+    assert asyncio.run(cache.warm(10)) == 9
+    asyncio.run(cache.get_exchange_rates(10))
+    store.close()
+
+    assert client.calls == [date.today().strftime('%d.%m.%Y')]
+
+
+def test_store_is_read_and_written_off_the_event_loop(tmp_path):
+    loop_thread = threading.get_ident()
+    threads = []
+
+    class WatchedStore(RateStore):
+        def get(self, day):
+            threads.append(threading.get_ident())
+            return super().get(day)
+
+        def put_many(self, items):
+            threads.append(threading.get_ident())
+            super().put_many(items)
+
+    store = WatchedStore(str(tmp_path / "rates.db"))
+    cache = RateCache(FakeClient(latency=0), store=store)
+    asyncio.run(cache.get_exchange_rates(3))
+    store.close()
+
+    # 2 минулі дні: по одному get і put на кожен
+    assert len(threads) == 4
+    assert loop_thread not in threads
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from datetime import date
+
+from aiohttp import web
+
+from api_client import PrivatBankAPIClient
+from rate_cache import RateCache
+from resilience import CircuitBreaker
+from tests.test_rate_cache import FakeClient
+
+
+async def start_scripted_server(handler):
+    app = web.Application()
+    app.router.add_get("/p24api/exchange_rates", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}/p24api/exchange_rates?json&date="
+
+
+def test_breaker_opens_half_opens_and_closes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_retry_recovers_from_transient_errors():
+    calls = []
+
+    async def handler(request):
+        calls.append(request.query["date"])
+        if len(calls) < 3:
+            raise web.HTTPServiceUnavailable()
+        return web.json_response({"date": request.query["date"], "exchangeRate": []})
+
+    async def scenario():
+        runner, base_url = await start_scripted_server(handler)
+        try:
+            async with PrivatBankAPIClient(base_url=base_url, retries=2) as client:
+                return await client.fetch_exchange_rate("01.12.2014"), client.stats()
+        finally:
+            await runner.cleanup()
+
+    data, stats = asyncio.run(scenario())
+
+    assert data["date"] == "01.12.2014"
+    assert stats["retries"] == 2
+    assert stats["circuit"]["state"] == "closed"
+
+
+def test_hedged_request_bounds_slow_upstream():
+    calls = []
+
+    async def handler(request):
+        calls.append(request.query["date"])
+        # Кожен другий запит "зависає"
+        await asyncio.sleep(1 if len(calls) % 2 else 0.01)
+        return web.json_response({"date": request.query["date"], "exchangeRate": []})
+
+    async def scenario():
+        runner, base_url = await start_scripted_server(handler)
+        try:
+            async with PrivatBankAPIClient(base_url=base_url) as client:
+                for _ in range(20):
+                    client.latency.add(0.02)
+                start = time.perf_counter()
+                await client.fetch_exchange_rate("01.12.2014")
+                return time.perf_counter() - start, client.stats()
+        finally:
+            await runner.cleanup()
+
+    elapsed, stats = asyncio.run(scenario())
+
+    assert elapsed < 0.5
+    assert stats["hedges"] == 1
+    assert stats["hedge_wins"] == 1
+
+
+def test_open_circuit_serves_stale_today():
+    class DownClient(FakeClient):
+        async def fetch_exchange_rate(self, date_str):
+            self.calls.append(date_str)
+            return None
+
+    async def scenario():
+        cache = RateCache(FakeClient(latency=0), today_ttl=0)
+        await cache.get(date.today())
+        cache.client = DownClient()
+        return await cache.get(date.today()), cache.stats()
+
+    payload, stats = asyncio.run(scenario())
+
+    assert payload is not None
+    assert stats["stale_served"] == 1
@@ -0,0 +1,39 @@
+import sys
+import os
+import asyncio
+
+from rate_cache import RateCache
+from shared_cache import CacheServer, RemoteRateClient
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '..', 'benchmarks'))
+
+from fake_privatbank import start_fake_server
+
+
+def test_workers_share_one_upstream_fetch_per_date(tmp_path):
+    socket_path = str(tmp_path / "cache.sock")
+
+    async def scenario():
+        runner, fake, base_url = await start_fake_server(latency=0.02)
+        server = CacheServer(socket_path, base_url=base_url, store_path=str(tmp_path / "rates.db"))
+        await server.start()
+        # Два "воркери" зі своїми локальними кешами поверх одного кеш-процесу
+        workers = [RateCache(RemoteRateClient(socket_path)) for _ in range(2)]
+        try:
+            results = await asyncio.gather(*(
+                worker.get_exchange_rates(10) for worker in workers for _ in range(50)
+            ))
+            remote = await workers[0].client.remote_stats()
+        finally:
+            for worker in workers:
+                await worker.close()
+            await server.close()
+            await runner.cleanup()
+        return results, fake, remote
+
+    results, fake, remote = asyncio.run(scenario())
+
+    assert fake["calls"] == 10
+    assert remote["cache"]["misses"] == 10
+    assert all(day is not None and "USD" in day.rates for result in results for day in result)
@@ -0,0 +1,55 @@
+import asyncio
+import json
+import time
+from datetime import date, timedelta
+
+import chat_server
+from exchange_log import ExchangeLog
+from rate_cache import RateCache
+from subscriptions import Broadcaster
+from tests.test_exchange_log import FakeWebSocket
+from tests.test_rate_cache import FakeClient
+
+
+class SlowDayClient(FakeClient):
+    # Відповідь за найстаршу з трьох дат приходить через 0.5 с, решта - одразу
+    async def fetch_exchange_rate(self, date_str):
+        self.calls.append(date_str)
+        slow = (date.today() - timedelta(days=2)).strftime('%d.%m.%Y')
+        await asyncio.sleep(0.5 if date_str == slow else 0.01)
+        return {"date": date_str, "exchangeRate": [{"currency": "USD", "saleRate": 40, "purchaseRate": 39}]}
+
+
+class TimedWebSocket(FakeWebSocket):
+    def __init__(self, messages):
+        super().__init__(messages)
+        self.sent_at = []
+
+    async def send(self, message):
+        self.sent_at.append(time.perf_counter())
+        await super().send(message)
+
+
+def test_first_frame_does_not_wait_for_slowest_day(tmp_path, monkeypatch):
+    async def scenario():
+        cache = RateCache(SlowDayClient())
+        log = ExchangeLog(str(tmp_path / "exchange_log.txt"))
+        monkeypatch.setattr(chat_server, "rate_cache", cache)
+        monkeypatch.setattr(chat_server, "exchange_log", log)
+        monkeypatch.setattr(chat_server, "broadcaster", Broadcaster(cache))
+        log.start()
+
+        websocket = TimedWebSocket(["stream 3 USD"])
+        start = time.perf_counter()
+        await chat_server.handle_client(websocket)
+        await log.close()
+        return websocket, start
+
+    websocket, start = asyncio.run(scenario())
+
+    frames = [json.loads(message) for message in websocket.sent]
+    assert len(frames) == 4
+    assert frames[-1] == {"done": True, "days": 3, "missing": 0}
+    assert frames[0]["rates"] == {"USD": {"sale": 40, "purchase": 39}}
+    assert websocket.sent_at[0] - start < 0.2
+    assert websocket.sent_at[-1] - start >= 0.5
@@ -0,0 +1,114 @@
+import asyncio
+
+from rate_cache import RateCache
+from subscriptions import Broadcaster
+from tests.test_rate_cache import FakeClient
+
+
+class FakeWebSocket:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.sent = []
+        self.close_code = None
+
+    async def send(self, message, text=None):
+        await asyncio.sleep(self.delay)
+        self.sent.append(message)
+
+    async def close(self, code=1000, reason=""):
+        self.close_code = code
+
+
+def test_topic_payload_is_shared_by_all_subscribers():
+    async def scenario():
+        client = FakeClient(latency=0)
+        broadcaster = Broadcaster(RateCache(client))
+        sockets = [FakeWebSocket() for _ in range(50)]
+        for websocket in sockets:
+            broadcaster.subscribe(websocket, 3, ["USD", "EUR"])
+        await asyncio.sleep(0.05)
+        await broadcaster.close()
+        return client, sockets
+
+    client, sockets = asyncio.run(scenario())
+
+    assert len(client.calls) == 3
+    payloads = [websocket.sent[0] for websocket in sockets]
+    assert isinstance(payloads[0], bytes)
+    assert all(payload is payloads[0] for payload in payloads)
+
+
+def test_slow_consumer_is_dropped():
+    async def scenario():
+        broadcaster = Broadcaster(RateCache(FakeClient(latency=0)), max_queue=2)
+        fast, slow = FakeWebSocket(), FakeWebSocket(delay=10)
+        broadcaster.subscribe(fast, 1, None)
+        broadcaster.subscribe(slow, 1, None)
+        await asyncio.sleep(0.01)
+        topic = next(iter(broadcaster.topics.values()))
+        for i in range(5):
+            broadcaster.broadcast(topic, f"update {i}".encode())
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        stats = broadcaster.stats()
+        await broadcaster.close()
+        return fast, slow, stats
+
+    fast, slow, stats = asyncio.run(scenario())
+
+    assert slow.close_code == 1013
+    assert stats["dropped"] == 1
+    assert stats["subscribers"] == 1
+    assert fast.sent[-1] == b"update 4"
+
+
+def test_close_waits_for_dropped_clients():
+    class SlowClose(FakeWebSocket):
+        async def close(self, code=1000, reason=""):
+            await asyncio.sleep(0.05)
+            await super().close(code, reason)
+
+    async def scenario():
+        broadcaster = Broadcaster(RateCache(FakeClient(latency=0)), max_queue=1)
+        slow = SlowClose(delay=10)
+        broadcaster.subscribe(slow, 1, None)
+        await asyncio.sleep(0.01)
+        topic = next(iter(broadcaster.topics.values()))
+        for i in range(3):
+            broadcaster.broadcast(topic, f"update {i}".encode())
+        # Закриття ще триває, але close() його дочекається
+        assert slow.close_code is None
+        await broadcaster.close()
+        return broadcaster, slow
+
+    broadcaster, slow = asyncio.run(scenario())
+    assert slow.close_code == 1013
+    assert not broadcaster._closing
+
+
+class FlakyCache(RateCache):
+    def __init__(self, client, failures=1):
+        super().__init__(client)
+        self.failures = failures
+
+    async def get_exchange_rates(self, days):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionResetError("cache process went away")
+        return await super().get_exchange_rates(days)
+
+
+def test_refresh_error_does_not_stop_the_topic():
+    async def scenario():
+        broadcaster = Broadcaster(FlakyCache(FakeClient(latency=0)), interval=0.01)
+        websocket = FakeWebSocket()
+        broadcaster.subscribe(websocket, 1, None)
+        await asyncio.sleep(0.05)
+        stats = broadcaster.stats()
+        await broadcaster.close()
+        return websocket, stats
+
+    websocket, stats = asyncio.run(scenario())
+
+    assert stats["errors"] == 1
+    assert len(websocket.sent) == 1
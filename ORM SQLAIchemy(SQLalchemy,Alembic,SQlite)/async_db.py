@@ -0,0 +1,188 @@
+import time
+import asyncio
+import argparse
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+import my_select
+from models import Student, Subject, Group, Teacher
+from create_db import DB_PATH
+
+# Асинхронний шар над тією ж базою: рушій на aiosqlite, фабрика AsyncSession
+# і async-версії select_N, зібрані з тих самих select()-виразів, що й my_select.
+# AsyncSession не можна ділити між конкурентними задачами, тож кожен звіт
+# у run_batch отримує власну сесію, а кількість одночасних звітів за
+# замовчуванням дорівнює розміру пулу з'єднань.
+
+DB_URL = f'sqlite+aiosqlite:///{DB_PATH}'
+
+
+class StatementTimer:
+    # Час кожного SQL-запиту рушія, виміряний між before/after_cursor_execute
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_statement = None
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_start'].pop()
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.slowest:
+            self.slowest = elapsed
+            self.slowest_statement = statement
+
+    def attach(self, engine):
+        # Події курсора є лише у синхронного рушія, який загортає AsyncEngine
+        event.listen(engine.sync_engine, 'before_cursor_execute', self._before)
+        event.listen(engine.sync_engine, 'after_cursor_execute', self._after)
+        return self
+
+    def stats(self):
+        return {
+            "statements": self.count,
+            "total_ms": self.total * 1000,
+            "avg_ms": self.total * 1000 / self.count if self.count else 0.0,
+            "slowest_ms": self.slowest * 1000,
+            "slowest_statement": self.slowest_statement,
+        }
+
+
+def make_async_engine(url=DB_URL, pool_size=5, max_overflow=5, pool_timeout=30, timer=None):
+    engine = create_async_engine(url, pool_size=pool_size, max_overflow=max_overflow, pool_timeout=pool_timeout)
+    if timer is not None:
+        timer.attach(engine)
+    return engine
+
+
+def make_session_factory(engine):
+    # expire_on_commit=False: об'єкти залишаються читабельними після закриття сесії
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def pool_status(engine):
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
+# Ті самі select()-вирази, що й у my_select; відрізняється лише виконання
+async def select_1(session):
+    return (await session.scalars(my_select.select_1_statement())).all()
+
+async def select_2(session, subject_name):
+    return (await session.scalars(my_select.select_2_statement(subject_name))).first()
+
+async def select_3(session, subject_name):
+    return await session.scalar(my_select.select_3_statement(subject_name))
+
+async def select_4(session):
+    return await session.scalar(my_select.select_4_statement())
+
+async def select_5(session, teacher_name):
+    return (await session.scalars(my_select.select_5_statement(teacher_name))).all()
+
+async def select_6(session, group_name):
+    return (await session.scalars(my_select.select_6_statement(group_name))).all()
+
+async def select_7(session, group_name, subject_name):
+    return (await session.scalars(my_select.select_7_statement(group_name, subject_name))).all()
+
+async def select_8(session, teacher_name):
+    return await session.scalar(my_select.select_8_statement(teacher_name))
+
+async def select_9(session, student_name):
+    return (await session.scalars(my_select.select_9_statement(student_name))).unique().all()
+
+async def select_10(session, student_name, teacher_name):
+    return (await session.scalars(my_select.select_10_statement(student_name, teacher_name))).unique().all()
+
+
+REPORTS = {
+    'select_1': select_1,
+    'select_2': select_2,
+    'select_3': select_3,
+    'select_4': select_4,
+    'select_5': select_5,
+    'select_6': select_6,
+    'select_7': select_7,
+    'select_8': select_8,
+    'select_9': select_9,
+    'select_10': select_10,
+}
+
+
+async def run_report(session_factory, name, *args):
+    async with session_factory() as session:
+        return await REPORTS[name](session, *args)
+
+
+async def run_batch(session_factory, calls, limit=None):
+    # calls: [(назва звіту, аргументи), ...]; результати в тому ж порядку.
+    # limit за замовчуванням - розмір пулу, щоб звіти не чекали на з'єднання
+    if limit is None:
+        limit = pool_status(session_factory.kw['bind'])['size']
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run_one(name, args):
+        async with semaphore:
+            return await run_report(session_factory, name, *args)
+
+    return await asyncio.gather(*(run_one(name, args) for name, args in calls))
+
+
+async def default_calls(session_factory):
+    async with session_factory() as session:
+        student = await session.scalar(select(Student.name).order_by(Student.id).limit(1))
+        group = await session.scalar(select(Group.name).order_by(Group.id).limit(1))
+        subject, teacher = (await session.execute(
+            select(Subject.name, Teacher.name).join(Teacher).order_by(Subject.id).limit(1))).one()
+    return [
+        ('select_1', ()),
+        ('select_2', (subject,)),
+        ('select_3', (subject,)),
+        ('select_4', ()),
+        ('select_5', (teacher,)),
+        ('select_6', (group,)),
+        ('select_7', (group, subject)),
+        ('select_8', (teacher,)),
+        ('select_9', (student,)),
+        ('select_10', (student, teacher)),
+    ]
+
+
+async def main(url, pool_size, max_overflow, repeat):
+    timer = StatementTimer()
+    engine = make_async_engine(url, pool_size=pool_size, max_overflow=max_overflow, timer=timer)
+    session_factory = make_session_factory(engine)
+    try:
+        calls = await default_calls(session_factory) * repeat
+        start = time.perf_counter()
+        results = await run_batch(session_factory, calls)
+        elapsed = time.perf_counter() - start
+        print(f"{len(results)} reports in {elapsed * 1000:.1f} ms")
+        print("pool:", pool_status(engine))
+        print("statements:", timer.stats())
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Конкурентний запуск звітів select_N через AsyncSession")
+    parser.add_argument('--url', default=DB_URL)
+    parser.add_argument('--pool-size', type=int, default=5)
+    parser.add_argument('--max-overflow', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=1, help='скільки разів повторити набір звітів')
+    args = parser.parse_args()
+
+    asyncio.run(main(args.url, args.pool_size, args.max_overflow, args.repeat))
@@ -0,0 +1,74 @@
+import sys
+import os
+import time
+import random
+import argparse
+import tempfile
+from datetime import date
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '..'))
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+import my_select
+from models import Student, Subject, Teacher, Group, Grade
+from query_cache import QueryCache
+from seed_bulk import make_engine, seed_bulk
+
+# Звіти з Row-результатами, які може кешувати QueryCache
+REPORTS = ('select_2_rows', 'select_3_rows', 'select_5_rows', 'select_6_rows',
+           'select_7_rows', 'select_8_rows', 'select_9_rows', 'select_10_rows')
+
+
+def call_args(session):
+    student = session.scalar(select(Student.name).order_by(Student.id))
+    group = session.scalar(select(Group.name).order_by(Group.id))
+    subject, teacher = session.execute(select(Subject.name, Teacher.name).join(Teacher).order_by(Subject.id)).first()
+    return {'select_2_rows': (subject,), 'select_3_rows': (subject,), 'select_5_rows': (teacher,),
+            'select_6_rows': (group,), 'select_7_rows': (group, subject), 'select_8_rows': (teacher,),
+            'select_9_rows': (student,), 'select_10_rows': (student, teacher)}
+
+
+def workload(Session, params, calls, write_every, rng):
+    # Випадкові звіти; кожен write_every-й виклик додає оцінку через ORM (інвалідація grades)
+    student_ids = list(range(1, 101))
+    start = time.perf_counter()
+    for i in range(calls):
+        with Session() as session:
+            if write_every and i % write_every == 0:
+                session.add(Grade(student_id=rng.choice(student_ids), subject_id=1,
+                                  score=rng.randint(1, 100), date=date.today()))
+                session.commit()
+            my_select.session = session
+            name = rng.choice(REPORTS)
+            getattr(my_select, name)(*params[name])
+    return (time.perf_counter() - start) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="select_N_rows з кешем результатів і без нього")
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--write-every", type=int, default=50, help='0 - без записів')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'university.db')}")
+        seed_bulk(engine, groups_count=30, teachers_count=30, subjects_count=8,
+                  students_count=args.students, grades_per_subject=3, seed=1)
+        Session = sessionmaker(bind=engine)
+        with Session() as session:
+            params = call_args(session)
+
+        plain_ms = workload(Session, params, args.calls, args.write_every, random.Random(1))
+        cache = QueryCache().install(Session)
+        cached_ms = workload(Session, params, args.calls, args.write_every, random.Random(1))
+        cache.remove()
+
+        print(f"{args.calls} calls, one ORM write every {args.write_every or '-'} calls")
+        print(f"{'no cache':<10}{plain_ms:>10.1f} ms")
+        print(f"{'cache':<10}{cached_ms:>10.1f} ms  ({plain_ms / cached_ms:.1f}x)")
+        print("stats:", cache.stats())
+        engine.dispose()
@@ -0,0 +1,54 @@
+import sys
+import os
+import time
+import resource
+import argparse
+import tempfile
+import subprocess
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '..'))
+
+
+def run(mode, url, scale, grades_per_subject):
+    # Кожен режим запускається в окремому процесі, щоб пікова RSS не змішувалась
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from models import Base
+
+    start = time.perf_counter()
+    if mode == 'orm':
+        from seeds import seed
+        engine = create_engine(url)
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        rows = seed(session, 3 * scale, 3 * scale, 5, 30 * scale, grades_per_subject)
+        session.close()
+    else:
+        from seed_bulk import make_engine, seed_bulk
+        engine = make_engine(url)
+        rows = seed_bulk(engine, 3 * scale, 3 * scale, 5, 30 * scale, grades_per_subject, seed=1)
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:<6}{rows:>10}{elapsed:>10.1f}{rows / elapsed:>14,.0f}{peak:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="seeds.py (ORM) vs seed_bulk.py (Core): rows/sec і пікова RSS")
+    parser.add_argument("--scale", type=int, default=200)
+    parser.add_argument("--grades-per-subject", type=int, default=4)
+    parser.add_argument("--mode", choices=['orm', 'core'])
+    parser.add_argument("--url")
+    args = parser.parse_args()
+
+    if args.mode:
+        run(args.mode, args.url, args.scale, args.grades_per_subject)
+    else:
+        print(f"{'mode':<6}{'rows':>10}{'sec':>10}{'rows/sec':>14}{'RSS, MB':>12}", flush=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            for mode in ('orm', 'core'):
+                url = f"sqlite:///{os.path.join(tmp, mode + '.db')}"
+                subprocess.run([sys.executable, __file__, '--mode', mode, '--url', url,
+                                '--scale', str(args.scale),
+                                '--grades-per-subject', str(args.grades_per_subject)], check=True)
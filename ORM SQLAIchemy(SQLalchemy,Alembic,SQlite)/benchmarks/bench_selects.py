@@ -0,0 +1,57 @@
+import sys
+import os
+import time
+import argparse
+import tempfile
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '..'))
+
+from sqlalchemy.orm import Session
+
+import my_select
+from models import Student, Subject, Grade, Group, Teacher
+from n_plus_one import WALKS, call_args, statements_per_call
+from seed_bulk import make_engine, seed_bulk
+
+# Попередні версії запитів без стратегій завантаження (ліниві зв'язки)
+LAZY = {
+    'select_1': lambda s: s.query(Student).order_by(Student.id).all(),
+    'select_2': lambda s, subject: s.query(Student).join(Grade).join(Subject).filter(Subject.name == subject).order_by(Grade.score.desc()).first(),
+    'select_5': lambda s, teacher: s.query(Subject).join(Teacher).filter(Teacher.name == teacher).all(),
+    'select_6': lambda s, group: s.query(Student).join(Group).filter(Group.name == group).all(),
+    'select_7': lambda s, group, subject: s.query(Grade).join(Student).join(Group).join(Subject).filter(Group.name == group, Subject.name == subject).all(),
+    'select_9': lambda s, student: s.query(Subject).join(Grade).join(Student).filter(Student.name == student).all(),
+    'select_10': lambda s, student, teacher: s.query(Subject).join(Grade).join(Student).join(Teacher).filter(Student.name == student, Teacher.name == teacher).all(),
+}
+
+
+def measure(engine, call, args, walk):
+    session = Session(bind=engine)
+    my_select.session = session
+    start = time.perf_counter()
+    count, _ = statements_per_call(engine, call, *args, walk=walk)
+    elapsed = time.perf_counter() - start
+    session.close()
+    return count, elapsed * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="select_N: запити на виклик і час зі стратегіями завантаження та без")
+    parser.add_argument("--students", type=int, default=3000)
+    parser.add_argument("--groups", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'university.db')}")
+        seed_bulk(engine, groups_count=args.groups, teachers_count=args.groups, subjects_count=5,
+                  students_count=args.students, grades_per_subject=2, seed=1)
+        with Session(bind=engine) as session:
+            params = call_args(session)
+
+        print(f"{'select':<10}{'lazy stmts':>12}{'lazy ms':>10}{'eager stmts':>13}{'eager ms':>10}")
+        for name in WALKS:
+            lazy = measure(engine, lambda *a: LAZY[name](my_select.session, *a), params[name], WALKS[name])
+            eager = measure(engine, getattr(my_select, name), params[name], WALKS[name])
+            print(f"{name:<10}{lazy[0]:>12}{lazy[1]:>10.1f}{eager[0]:>13}{eager[1]:>10.1f}")
+        engine.dispose()
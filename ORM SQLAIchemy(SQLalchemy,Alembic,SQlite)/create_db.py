@@ -1,8 +1,12 @@
+import os
+
 from sqlalchemy import create_engine
 from sqlalchemy.exc import OperationalError
 from models import Base
 
-engine = create_engine('sqlite:///database.db')
+# Шлях відносно файлу, щоб імпорт з іншого каталогу (тести) не створював нову базу
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database.db')
+engine = create_engine(f'sqlite:///{DB_PATH}')
 
 
 Base.metadata.create_all(engine)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -6,6 +6,10 @@ Base = declarative_base()
 
 class Student(Base):
     __tablename__ = 'students'
+    __table_args__ = (
+        Index('ix_students_group_id_name', 'group_id', 'name'),
+        Index('ix_students_name', 'name'),
+    )
     
     id = Column(Integer, primary_key=True)
     name = Column(String)
@@ -16,6 +20,7 @@ class Student(Base):
 
 class Group(Base):
     __tablename__ = 'groups'
+    __table_args__ = (Index('ix_groups_name', 'name'),)
     
     id = Column(Integer, primary_key=True)
     name = Column(String)
@@ -24,6 +29,7 @@ class Group(Base):
 
 class Teacher(Base):
     __tablename__ = 'teachers'
+    __table_args__ = (Index('ix_teachers_name', 'name'),)
     
     id = Column(Integer, primary_key=True)
     name = Column(String)
@@ -32,6 +38,10 @@ class Teacher(Base):
 
 class Subject(Base):
     __tablename__ = 'subjects'
+    __table_args__ = (
+        Index('ix_subjects_name_teacher_id', 'name', 'teacher_id'),
+        Index('ix_subjects_teacher_id', 'teacher_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     name = Column(String)
@@ -42,6 +52,13 @@ class Subject(Base):
 
 class Grade(Base):
     __tablename__ = 'grades'
+    # Покривні індекси для агрегатів з my_select: оцінки предмета по студентах
+    # і предмети студента
+    __table_args__ = (
+        Index('ix_grades_subject_id_student_id_score', 'subject_id', 'student_id', 'score'),
+        Index('ix_grades_subject_id_score', 'subject_id', 'score'),
+        Index('ix_grades_student_id_subject_id', 'student_id', 'subject_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     student_id = Column(Integer, ForeignKey('students.id'))
@@ -1,40 +1,180 @@
-from sqlalchemy import func
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker, joinedload, selectinload, contains_eager, raiseload
 from models import Student, Subject, Grade, Group, Teacher
 from create_db import engine
+from query_cache import freeze_entities
 
 
 Session = sessionmaker(bind=engine)
 session = Session()
 
+# Стратегії завантаження: зв'язки, які читають виклики (student.group,
+# subject.teacher, grade.student.group, grade.subject.teacher), приходять
+# тим самим запитом або одним додатковим SELECT ... IN, а решта -
+# raiseload, щоб випадковий лінивий запит на кожен рядок падав, а не
+# тихо перетворювався на N+1.
+STUDENT_LOADING = (joinedload(Student.group), raiseload('*'))
+SUBJECT_LOADING = (joinedload(Subject.teacher), raiseload('*'))
+
+# Запити select_N як select()-вирази: ними ж користуються async-версії в async_db
+def select_1_statement():
+    return select(Student).options(*STUDENT_LOADING).order_by(Student.id)
+
+def select_2_statement(subject_name):
+    return select(Student).join(Grade).join(Subject).options(*STUDENT_LOADING).where(Subject.name == subject_name).order_by(Grade.score.desc()).limit(1)
+
+def select_3_statement(subject_name):
+    return select(func.avg(Grade.score)).join(Subject).where(Subject.name == subject_name)
+
+def select_4_statement():
+    return select(func.avg(Grade.score))
+
+def select_5_statement(teacher_name):
+    # Teacher уже в JOIN, тож subject.teacher заповнюється з нього
+    return select(Subject).join(Teacher).options(contains_eager(Subject.teacher), raiseload('*')).where(Teacher.name == teacher_name)
+
+def select_6_statement(group_name):
+    return select(Student).join(Group).options(contains_eager(Student.group), raiseload('*')).where(Group.name == group_name)
+
+def select_7_statement(group_name, subject_name):
+    return select(Grade).join(Student).join(Group).join(Subject).options(
+        contains_eager(Grade.student).contains_eager(Student.group),
+        contains_eager(Grade.subject).selectinload(Subject.teacher),
+        raiseload('*'),
+    ).where(Group.name == group_name, Subject.name == subject_name)
+
+def select_8_statement(teacher_name):
+    return select(func.avg(Grade.score)).join(Subject).join(Teacher).where(Teacher.name == teacher_name)
+
+def select_9_statement(student_name):
+    return select(Subject).join(Grade).join(Student).options(*SUBJECT_LOADING).where(Student.name == student_name)
+
+def select_10_statement(student_name, teacher_name):
+    return select(Subject).join(Grade).join(Student).join(Teacher).options(contains_eager(Subject.teacher), raiseload('*')).where(Student.name == student_name, Teacher.name == teacher_name)
+
+
+# select_N повертають незмінні Row замість сутностей: колонки і зв'язки зі
+# стратегій завантаження доступні як атрибути (grade.student.group.name),
+# а результат не прив'язаний до сесії, тож його кешує query_cache.QueryCache.
+# Сутності з тими самими стратегіями - через select_N_statement (див. async_db)
+def _frozen(statement):
+    return freeze_entities(session.execute(statement.execution_options(frozen_rows=True)))
+
 def select_1():
-    return session.query(Student).order_by(Student.id).all()
+    return _frozen(select_1_statement()).scalars().all()
 
 def select_2(subject_name):
-    return session.query(Student).join(Grade).join(Subject).filter(Subject.name == subject_name).order_by(Grade.score.desc()).first()
+    return _frozen(select_2_statement(subject_name)).scalars().first()
 
 def select_3(subject_name):
-    return session.query(func.avg(Grade.score)).join(Subject).filter(Subject.name == subject_name).scalar()
+    return session.scalar(select_3_statement(subject_name))
 
 def select_4():
-    return session.query(func.avg(Grade.score)).scalar()
+    return session.scalar(select_4_statement())
 
 def select_5(teacher_name):
-    return session.query(Subject).join(Teacher).filter(Teacher.name == teacher_name).all()
+    return _frozen(select_5_statement(teacher_name)).scalars().all()
 
 def select_6(group_name):
-    return session.query(Student).join(Group).filter(Group.name == group_name).all()
+    return _frozen(select_6_statement(group_name)).scalars().all()
 
 def select_7(group_name, subject_name):
-    return session.query(Grade).join(Student).join(Group).join(Subject).filter(Group.name == group_name, Subject.name == subject_name).all()
+    return _frozen(select_7_statement(group_name, subject_name)).scalars().all()
 
 def select_8(teacher_name):
-    return session.query(func.avg(Grade.score)).join(Subject).join(Teacher).filter(Teacher.name == teacher_name).scalar()
+    return session.scalar(select_8_statement(teacher_name))
 
+# Кожен предмет один раз, хоч JOIN з grades повторює його на кожну оцінку
 def select_9(student_name):
-    return session.query(Subject).join(Grade).join(Student).filter(Student.name == student_name).all()
+    return _frozen(select_9_statement(student_name)).scalars().unique().all()
 
 def select_10(student_name, teacher_name):
-    return session.query(Subject).join(Grade).join(Student).join(Teacher).filter(Student.name == student_name, Teacher.name == teacher_name).all()
+    return _frozen(select_10_statement(student_name, teacher_name)).scalars().unique().all()
+
+
+# Варіанти з агрегацією в SQL: повертають легкі Row-кортежі замість сутностей,
+# а фільтри за назвою перетворюються на id через підзапит, тож з grades
+# читаються лише покривні індекси (див. __table_args__ у models.py)
+
+def _subject_ids(subject_name):
+    return select(Subject.id).where(Subject.name == subject_name)
+
+def _teacher_subject_ids(teacher_name):
+    return select(Subject.id).join(Teacher).where(Teacher.name == teacher_name)
+
+def _student_ids(student_name):
+    return select(Student.id).where(Student.name == student_name)
+
+def select_1_rows():
+    return session.execute(select(Student.id, Student.name, Student.group_id).order_by(Student.id)).all()
+
+def select_2_rows(subject_name):
+    # Для кожного предмета з такою назвою найкраща оцінка - перший запис індексу
+    # (subject_id, score) у зворотному порядку, без сортування оцінок предмета;
+    # ORDER BY зовнішнього запиту сортує лише ці кілька рядків (по одному на предмет)
+    top_grade = (select(Grade.id)
+                 .where(Grade.subject_id == Subject.id)
+                 .order_by(Grade.score.desc())
+                 .limit(1)
+                 .correlate(Subject)
+                 .scalar_subquery())
+    return session.execute(
+        select(Student.id, Student.name, Grade.score)
+        .select_from(Subject)
+        .join(Grade, Grade.id == top_grade)
+        .join(Student, Student.id == Grade.student_id)
+        .where(Subject.name == subject_name)
+        .order_by(Grade.score.desc())
+        .limit(1)
+    ).first()
+
+def select_2_ranked_rows(subject_name, limit=5):
+    # Рейтинг студентів за середнім балом з предмета: RANK() поверх агрегатів,
+    # однакові бали - одне місце. GROUP BY збігається з порядком індексу
+    # (subject_id, student_id, score), тож групування йде без тимчасового B-дерева
+    average = func.avg(Grade.score)
+    ranked = (select(Grade.student_id, average.label('avg_score'),
+                     func.rank().over(order_by=average.desc()).label('place'))
+              .where(Grade.subject_id.in_(_subject_ids(subject_name)))
+              .group_by(Grade.subject_id, Grade.student_id)
+              .subquery())
+    return session.execute(
+        select(ranked.c.place, Student.id, Student.name, ranked.c.avg_score)
+        .join(ranked, Student.id == ranked.c.student_id)
+        .where(ranked.c.place <= limit)
+        .order_by(ranked.c.place, Student.id)
+    ).all()
+
+def select_3_rows(subject_name):
+    return session.scalar(select(func.avg(Grade.score)).where(Grade.subject_id.in_(_subject_ids(subject_name))))
+
+def select_5_rows(teacher_name):
+    return session.execute(select(Subject.id, Subject.name).join(Teacher).where(Teacher.name == teacher_name)).all()
+
+def select_6_rows(group_name):
+    return session.execute(select(Student.id, Student.name).join(Group).where(Group.name == group_name)).all()
+
+def select_7_rows(group_name, subject_name):
+    return session.execute(
+        select(Student.name, Grade.score, Grade.date)
+        .join(Student, Student.id == Grade.student_id)
+        .join(Group, Group.id == Student.group_id)
+        .where(Group.name == group_name, Grade.subject_id.in_(_subject_ids(subject_name)))
+    ).all()
+
+def select_8_rows(teacher_name):
+    return session.scalar(select(func.avg(Grade.score)).where(Grade.subject_id.in_(_teacher_subject_ids(teacher_name))))
+
+def select_9_rows(student_name):
+    attended = select(Grade.subject_id).where(Grade.student_id.in_(_student_ids(student_name)))
+    return session.execute(select(Subject.id, Subject.name).where(Subject.id.in_(attended))).all()
+
+def select_10_rows(student_name, teacher_name):
+    attended = select(Grade.subject_id).where(Grade.student_id.in_(_student_ids(student_name)))
+    return session.execute(
+        select(Subject.id, Subject.name)
+        .join(Teacher)
+        .where(Teacher.name == teacher_name, Subject.id.in_(attended))
+    ).all()
 
 session.close()
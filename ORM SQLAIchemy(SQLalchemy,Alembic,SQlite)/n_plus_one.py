@@ -0,0 +1,95 @@
+from sqlalchemy import event, select
+
+from models import Student, Group, Teacher, Subject
+
+# Детектор N+1 для тестів і бенчмарків: рахує SQL-запити, які рушій
+# відправляє під час виклику select_N разом з обходом зв'язків результату.
+# Якщо кількість запитів росте разом з розміром даних - це N+1.
+
+
+class NPlusOneError(AssertionError):
+    pass
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+        self.parameters = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+        self.parameters.append(parameters)
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+
+def _as_list(result):
+    if result is None:
+        return []
+    return result if isinstance(result, list) else [result]
+
+
+# Зв'язки, які читають виклики кожного select_N
+def walk_students(result):
+    return [student.group.name if student.group else None for student in _as_list(result)]
+
+
+def walk_subjects(result):
+    return [subject.teacher.name if subject.teacher else None for subject in _as_list(result)]
+
+
+def walk_grades(result):
+    return [(grade.student.group.name, grade.subject.teacher.name if grade.subject.teacher else None)
+            for grade in _as_list(result)]
+
+
+WALKS = {
+    'select_1': walk_students,
+    'select_2': walk_students,
+    'select_5': walk_subjects,
+    'select_6': walk_students,
+    'select_7': walk_grades,
+    'select_9': walk_subjects,
+    'select_10': walk_subjects,
+}
+
+
+def call_args(session):
+    # Аргументи для select_N з WALKS: перші за id студент, викладач, група, предмет
+    student = session.scalars(select(Student).order_by(Student.id)).first()
+    teacher = session.scalars(select(Teacher).order_by(Teacher.id)).first()
+    group = session.scalars(select(Group).order_by(Group.id)).first()
+    subject = session.scalars(select(Subject).order_by(Subject.id)).first()
+    return {
+        'select_1': (),
+        'select_2': (subject.name,),
+        'select_5': (teacher.name,),
+        'select_6': (group.name,),
+        'select_7': (group.name, subject.name),
+        'select_9': (student.name,),
+        'select_10': (student.name, teacher.name),
+    }
+
+
+def statements_per_call(engine, func, *args, walk=None):
+    with StatementCounter(engine) as counter:
+        result = func(*args)
+        if walk is not None:
+            walk(result)
+    return counter.count, result
+
+
+def check_constant(name, counts):
+    # counts: {розмір даних: кількість запитів}; кількість не має залежати від розміру
+    if len(set(counts.values())) > 1:
+        raise NPlusOneError(f"{name}: statements per call grow with data size: {counts}")
@@ -0,0 +1,201 @@
+import time
+import threading
+from collections import OrderedDict, defaultdict
+
+from sqlalchemy import Select, Table, event, inspect
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData, result_tuple
+from sqlalchemy.orm import InstanceState, Session, object_session
+from sqlalchemy.sql import visitors
+
+from models import Student, Group, Teacher, Subject, Grade
+
+# Кеш результатів SELECT для сесій SQLAlchemy: ключ - скомпільований SQL
+# разом з параметрами і базою, витіснення за розміром (LRU) і за часом (ttl).
+# Кешуються Row-кортежі: Row не прив'язаний до сесії, тож один результат
+# безпечно віддавати будь-якій. Запити колонок (my_select.select_N_rows)
+# і так повертають Row. Запити сутностей кешуються лише з опцією
+# frozen_rows=True (так їх виконують my_select.select_N): сутності
+# перетворюються на Row через freeze_entities. Решта запитів сутностей
+# (session.get, завантаження зв'язків) виконуються як завжди.
+#
+# Інвалідація: події маперів after_insert/update/delete збільшують покоління
+# таблиці; запис кешу валідний, поки не змінилося покоління жодної з таблиць,
+# які читає запит. Після коміту чи відкату сесії, що писала, покоління
+# збільшуються ще раз - інакше інша сесія встигла б закешувати дані до коміту.
+# ORM-запити session.execute(update(...)/delete(...)) подій маперів не
+# викликають - їх ловить той самий do_orm_execute. Запис через Core напряму
+# (connection.execute, seed_bulk) кеш не бачить - після нього треба викликати invalidate().
+
+MODELS = (Student, Group, Teacher, Subject, Grade)
+MAPPER_EVENTS = ('after_insert', 'after_update', 'after_delete')
+SESSION_EVENTS = ('after_commit', 'after_rollback')
+
+
+def _frozen_params(params):
+    # Параметри IN (...) приходять списками - для ключа потрібні кортежі
+    return tuple(sorted((name, tuple(value) if isinstance(value, list) else value)
+                        for name, value in params.items()))
+
+
+def statement_tables(statement):
+    return tuple(sorted({element.name for element in visitors.iterate(statement) if isinstance(element, Table)}))
+
+
+def selects_entities(statement):
+    # У column_descriptions для сутності type - сам клас моделі
+    return any(isinstance(column['type'], type) for column in statement.column_descriptions)
+
+
+def cacheable(statement, frozen_rows=False):
+    # Лише звичайний Select: union_all(...) і text(...).columns(...) не мають column_descriptions
+    if not isinstance(statement, Select):
+        return False
+    return frozen_rows or not selects_entities(statement)
+
+
+def entity_row(obj, _seen=()):
+    # Сутність як незмінний Row: колонки і вже завантажені зв'язки (вкладені Row,
+    # для колекцій - кортежі Row). Незавантажені зв'язки пропускаються, тож
+    # жодного запиту до бази; зворотні посилання на вже відкриті об'єкти теж
+    state = inspect(obj)
+    seen = _seen + (obj,)
+    fields = [attr.key for attr in state.mapper.column_attrs]
+    values = [state.dict.get(key) for key in fields]
+    for relationship in state.mapper.relationships:
+        if relationship.key not in state.dict:
+            continue
+        value = state.dict[relationship.key]
+        if relationship.uselist:
+            value = tuple(entity_row(item, seen) for item in value if item not in seen)
+        elif value is not None:
+            if value in seen:
+                continue
+            value = entity_row(value, seen)
+        fields.append(relationship.key)
+        values.append(value)
+    return result_tuple(fields)(values)
+
+
+def freeze_entities(result):
+    # Результат, у рядках якого сутності замінені на entity_row; рядки без сутностей не змінюються
+    rows = [tuple(entity_row(value) if isinstance(inspect(value, raiseerr=False), InstanceState) else value
+                  for value in row)
+            for row in result]
+    return IteratorResult(SimpleResultMetaData(list(result.keys())), iter(rows))
+
+
+class QueryCache:
+    def __init__(self, maxsize=256, ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (frozen result, tables, generations, expires_at)
+        self._generations = defaultdict(int)
+        self._lock = threading.Lock()
+        self._listeners = []
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidated": self.invalidated,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "size": len(self._entries),
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate(self, *tables):
+        # Без аргументів - усі таблиці моделей
+        with self._lock:
+            for table in tables or [model.__tablename__ for model in MODELS]:
+                self._generations[table] += 1
+
+    def install(self, target=Session):
+        # target - Session, sessionmaker або клас сесії, для яких працює кеш
+        self._listen(target, 'do_orm_execute', self._on_execute)
+        for model in MODELS:
+            for name in MAPPER_EVENTS:
+                self._listen(model, name, self._on_write)
+        for name in SESSION_EVENTS:
+            self._listen(Session, name, self._on_session_end)
+        return self
+
+    def remove(self):
+        for target, name, listener in self._listeners:
+            event.remove(target, name, listener)
+        self._listeners = []
+
+    def _listen(self, target, name, listener):
+        event.listen(target, name, listener)
+        self._listeners.append((target, name, listener))
+
+    def _on_write(self, mapper, connection, target):
+        self._written(object_session(target), mapper.local_table.name)
+
+    def _written(self, session, table):
+        self.invalidate(table)
+        if session is not None:
+            session.info.setdefault('query_cache_tables', set()).add(table)
+
+    def _on_session_end(self, session):
+        tables = session.info.pop('query_cache_tables', None)
+        if tables:
+            self.invalidate(*tables)
+
+    def _on_execute(self, state):
+        session = state.session
+        if state.is_insert or state.is_update or state.is_delete:
+            # session.execute(update(...)/delete(...)/insert(...)) проходить повз
+            # unit of work і не викликає подій маперів
+            self._written(session, state.statement.table.name)
+            return None
+        frozen_rows = state.execution_options.get('frozen_rows', False)
+        if (not state.is_select or state.is_column_load or state.is_relationship_load
+                or not state.execution_options.get('query_cache', True)
+                or not cacheable(state.statement, frozen_rows)):
+            return None
+        # Незбережені або незакомічені власні зміни сесії: кеш не читаємо і не поповнюємо
+        if session.new or session.dirty or session.deleted or session.info.get('query_cache_tables'):
+            return None
+
+        bind = session.get_bind(mapper=state.bind_mapper)
+        compiled = state.statement.compile(dialect=bind.dialect)
+        params = dict(compiled.params, **(state.parameters or {}))
+        key = (str(bind.url), str(compiled), _frozen_params(params))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                frozen, tables, tag, expires_at = entry
+                if tag != tuple(self._generations[table] for table in tables):
+                    self.invalidated += 1
+                elif expires_at <= time.monotonic():
+                    self.expired += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return frozen()
+            self.misses += 1
+            tables = statement_tables(state.statement)
+            # Покоління читаються до запиту, тож результат не старіший за свою мітку
+            tag = tuple(self._generations[table] for table in tables)
+
+        result = state.invoke_statement()
+        frozen = (freeze_entities(result) if frozen_rows else result).freeze()
+        with self._lock:
+            self._entries[key] = (frozen, tables, tag, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+        return frozen()
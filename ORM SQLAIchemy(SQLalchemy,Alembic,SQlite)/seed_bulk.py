@@ -0,0 +1,129 @@
+import time
+import random
+import argparse
+import itertools
+from datetime import date, timedelta
+
+from faker import Faker
+from sqlalchemy import create_engine, event, func, insert, select
+
+from models import Base, Student, Group, Teacher, Subject, Grade
+
+# Масове заповнення через SQLAlchemy Core: рядки - це словники з генераторів,
+# id призначаються заздалегідь (від поточного MAX(id)), тож не потрібні ні
+# flush, ні RETURNING, ні identity map. Кожна пачка - один executemany.
+# Без RETURNING SQLAlchemy передає пачку прямо в cursor.executemany; для
+# діалектів, де потрібні згенеровані ключі, той самий код піде через
+# insertmanyvalues з розміром сторінки insertmanyvalues_page_size.
+
+
+def batched(rows, size):
+    iterator = iter(rows)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def next_id(conn, model):
+    return conn.execute(select(func.coalesce(func.max(model.id), 0))).scalar() + 1
+
+
+def make_engine(url, batch_size=10_000):
+    engine = create_engine(url, insertmanyvalues_page_size=batch_size)
+
+    if engine.dialect.name == 'sqlite':
+        @event.listens_for(engine, 'connect')
+        def sqlite_pragmas(dbapi_connection, connection_record):
+            # Лише на час заповнення: без fsync на кожну сторінку
+            cursor = dbapi_connection.cursor()
+            cursor.execute('PRAGMA journal_mode = WAL')
+            cursor.execute('PRAGMA synchronous = OFF')
+            cursor.execute('PRAGMA temp_store = MEMORY')
+            cursor.close()
+
+    return engine
+
+
+def seed_bulk(engine, groups_count=3, teachers_count=3, subjects_count=5, students_count=30,
+              grades_per_subject=1, batch_size=10_000, seed=None):
+    fake = Faker()
+    if seed is not None:
+        Faker.seed(seed)
+    rng = random.Random(seed)
+
+    # Faker повільний, тож імена студентів збираються з невеликих наборів
+    first_names = [fake.first_name() for _ in range(500)]
+    last_names = [fake.last_name() for _ in range(500)]
+    today = date.today()
+    year_start = date(today.year, 1, 1)
+    days = (today - year_start).days + 1
+
+    Base.metadata.create_all(engine)
+    rows = 0
+    with engine.begin() as conn:
+        first_group = next_id(conn, Group)
+        first_teacher = next_id(conn, Teacher)
+        first_subject = next_id(conn, Subject)
+        first_student = next_id(conn, Student)
+        first_grade = next_id(conn, Grade)
+
+        group_ids = range(first_group, first_group + groups_count)
+        teacher_ids = range(first_teacher, first_teacher + teachers_count)
+        subject_ids = range(first_subject, first_subject + subjects_count)
+        student_ids = range(first_student, first_student + students_count)
+
+        def groups():
+            for group_id in group_ids:
+                yield {'id': group_id, 'name': fake.word()}
+
+        def teachers():
+            for teacher_id in teacher_ids:
+                yield {'id': teacher_id, 'name': fake.name()}
+
+        def subjects():
+            for subject_id in subject_ids:
+                yield {'id': subject_id, 'name': fake.catch_phrase(), 'teacher_id': rng.choice(teacher_ids)}
+
+        def students():
+            for student_id in student_ids:
+                yield {'id': student_id, 'name': f'{rng.choice(first_names)} {rng.choice(last_names)}',
+                       'group_id': rng.choice(group_ids)}
+
+        def grades():
+            grade_id = first_grade
+            for student_id in student_ids:
+                for subject_id in subject_ids:
+                    for _ in range(grades_per_subject):
+                        yield {'id': grade_id, 'student_id': student_id, 'subject_id': subject_id,
+                               'score': rng.randint(1, 100),
+                               'date': (year_start + timedelta(days=rng.randrange(days))).isoformat()}
+                        grade_id += 1
+
+        for model, generator in ((Group, groups), (Teacher, teachers), (Subject, subjects),
+                                 (Student, students), (Grade, grades)):
+            statement = insert(model)
+            for batch in batched(generator(), batch_size):
+                conn.execute(statement, batch)
+                rows += len(batch)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Масове заповнення бази через SQLAlchemy Core")
+    parser.add_argument('--url', default='sqlite:///database.db')
+    parser.add_argument('--scale', type=int, default=1, help='множник для кількості груп, викладачів, студентів')
+    parser.add_argument('--groups', type=int, default=3)
+    parser.add_argument('--teachers', type=int, default=3)
+    parser.add_argument('--subjects', type=int, default=5)
+    parser.add_argument('--students', type=int, default=30)
+    parser.add_argument('--grades-per-subject', type=int, default=1)
+    parser.add_argument('--batch-size', type=int, default=10_000)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    engine = make_engine(args.url, args.batch_size)
+    start = time.perf_counter()
+    rows = seed_bulk(engine, args.groups * args.scale, args.teachers * args.scale, args.subjects,
+                     args.students * args.scale, args.grades_per_subject, args.batch_size, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"Inserted {rows} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/sec)")
+    engine.dispose()
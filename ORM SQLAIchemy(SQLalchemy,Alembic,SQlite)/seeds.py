@@ -2,52 +2,62 @@ from faker import Faker
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from models import Student, Group, Teacher, Subject, Grade
+from create_db import DB_PATH
 
 fake = Faker()
 
-engine = create_engine('sqlite:///database.db')
-Session = sessionmaker(bind=engine)
-session = Session()
 
-groups = []
-for _ in range(3):
-    group = Group(name=fake.word())
-    groups.append(group)
+def seed(session, groups_count=3, teachers_count=3, subjects_count=5, students_count=30, grades_per_subject=1):
+    groups = []
+    for _ in range(groups_count):
+        group = Group(name=fake.word())
+        groups.append(group)
 
-session.add_all(groups)
-session.commit()
+    session.add_all(groups)
+    session.commit()
 
-teachers = []
-for _ in range(3):
-    teacher = Teacher(name=fake.name())
-    teachers.append(teacher)
+    teachers = []
+    for _ in range(teachers_count):
+        teacher = Teacher(name=fake.name())
+        teachers.append(teacher)
 
-session.add_all(teachers)
-session.commit()
+    session.add_all(teachers)
+    session.commit()
 
-subjects = []
-for _ in range(5):
-    subject = Subject(name=fake.catch_phrase(), teacher_id=fake.random_element(teachers).id)
-    subjects.append(subject)
+    subjects = []
+    for _ in range(subjects_count):
+        subject = Subject(name=fake.catch_phrase(), teacher_id=fake.random_element(teachers).id)
+        subjects.append(subject)
 
-session.add_all(subjects)
-session.commit()
+    session.add_all(subjects)
+    session.commit()
 
-students = []
-for _ in range(30):
-    student = Student(name=fake.name(), group_id=fake.random_element(groups).id)
-    students.append(student)
+    students = []
+    for _ in range(students_count):
+        student = Student(name=fake.name(), group_id=fake.random_element(groups).id)
+        students.append(student)
 
-session.add_all(students)
-session.commit()
+    session.add_all(students)
+    session.commit()
 
-grades = []
-for student in students:
-    for subject in subjects:
-        grade = Grade(student_id=student.id, subject_id=subject.id, score=fake.random_int(min=1, max=100), date=fake.date_this_year())
-        grades.append(grade)
+    grades = []
+    for student in students:
+        for subject in subjects:
+            for _ in range(grades_per_subject):
+                grade = Grade(student_id=student.id, subject_id=subject.id, score=fake.random_int(min=1, max=100), date=fake.date_this_year())
+                grades.append(grade)
 
-session.add_all(grades)
-session.commit()
+    session.add_all(grades)
+    session.commit()
 
-session.close()
+    return len(groups) + len(teachers) + len(subjects) + len(students) + len(grades)
+
+
+if __name__ == "__main__":
+    engine = create_engine(f'sqlite:///{DB_PATH}')
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    seed(session)
+
+    session.close()
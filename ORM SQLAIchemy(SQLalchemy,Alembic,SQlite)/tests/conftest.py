@@ -0,0 +1,6 @@
+import sys
+import os
+
+# Модулі проєкту (models, seeds, my_select) імпортуються напряму
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '..'))
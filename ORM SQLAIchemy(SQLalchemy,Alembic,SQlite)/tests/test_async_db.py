@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from sqlalchemy.orm import Session
+
+import my_select
+from async_db import (REPORTS, StatementTimer, default_calls, make_async_engine, make_session_factory,
+                      pool_status, run_batch)
+from seed_bulk import make_engine, seed_bulk
+
+
+@pytest.fixture(scope='module')
+def db_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp('async') / 'university.db'
+    engine = make_engine(f"sqlite:///{path}")
+    seed_bulk(engine, students_count=60, grades_per_subject=2, seed=24)
+    engine.dispose()
+    return path
+
+
+def plain(result):
+    # Сутності порівнюються за id, агрегати - як є
+    if isinstance(result, list):
+        return [item.id for item in result]
+    return getattr(result, 'id', result)
+
+
+def test_async_reports_match_sync(db_path, monkeypatch):
+    sync_engine = make_engine(f"sqlite:///{db_path}")
+    session = Session(bind=sync_engine)
+    monkeypatch.setattr(my_select, 'session', session)
+
+    async def scenario():
+        engine = make_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        session_factory = make_session_factory(engine)
+        try:
+            calls = await default_calls(session_factory)
+            return calls, await run_batch(session_factory, calls)
+        finally:
+            await engine.dispose()
+
+    calls, results = asyncio.run(scenario())
+    assert {name for name, _ in calls} == set(REPORTS)
+    for (name, args), result in zip(calls, results):
+        assert plain(result) == plain(getattr(my_select, name)(*args)), name
+        # Зв'язки, які читають виклики, завантажені до закриття сесії
+        if name == 'select_7':
+            assert all(grade.student.group and grade.subject.teacher for grade in result)
+
+    session.close()
+    sync_engine.dispose()
+
+
+def test_batch_is_limited_by_pool(db_path, monkeypatch):
+    timer = StatementTimer()
+    checked_out = []
+    original = REPORTS['select_4']
+
+    async def watched(session):
+        result = await original(session)
+        checked_out.append(pool_status(session.bind)['checked_out'])
+        await asyncio.sleep(0.01)
+        return result
+
+    monkeypatch.setitem(REPORTS, 'select_4', watched)
+
+    async def scenario():
+        engine = make_async_engine(f"sqlite+aiosqlite:///{db_path}", pool_size=2, max_overflow=1, timer=timer)
+        try:
+            results = await run_batch(make_session_factory(engine), [('select_4', ())] * 12)
+            return results, pool_status(engine)
+        finally:
+            await engine.dispose()
+
+    results, status = asyncio.run(scenario())
+    assert len(set(results)) == 1 and len(results) == 12
+    # За замовчуванням одночасно працює не більше звітів, ніж з'єднань у пулі
+    assert max(checked_out) <= 2
+    assert status['size'] == 2 and status['checked_out'] == 0 and status['overflow'] <= 0
+
+    stats = timer.stats()
+    assert stats['statements'] == 12
+    assert stats['slowest_ms'] >= stats['avg_ms'] > 0
@@ -0,0 +1,129 @@
+import os
+import time
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+import my_select
+from models import Student, Group, Subject, Grade
+from n_plus_one import StatementCounter
+from seed_bulk import make_engine, seed_bulk
+
+# Розмір згенерованої бази; більше значення дає планувальнику реальніші статистики
+EXPLAIN_TEST_STUDENTS = int(os.environ.get('EXPLAIN_TEST_STUDENTS', 5000))
+
+# Великі таблиці, які не можна читати повним скануванням
+LARGE_TABLES = ('grades', 'students')
+# select_1_rows за визначенням читає всіх студентів
+ALLOWED_SCANS = {'select_1_rows': {'students'}}
+
+
+@pytest.fixture(scope='module')
+def session(tmp_path_factory):
+    path = tmp_path_factory.mktemp('explain') / 'university.db'
+    engine = make_engine(f"sqlite:///{path}")
+    # create_all створює і індекси з __table_args__ моделей
+    seed_bulk(engine, groups_count=20, teachers_count=10, subjects_count=8,
+              students_count=EXPLAIN_TEST_STUDENTS, grades_per_subject=3, seed=23)
+    with engine.begin() as conn:
+        conn.exec_driver_sql('ANALYZE')
+    session = Session(bind=engine)
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def call_args(session, monkeypatch):
+    monkeypatch.setattr(my_select, 'session', session)
+    student = session.scalars(select(Student).order_by(Student.id)).first()
+    group = session.scalars(select(Group).order_by(Group.id)).first()
+    subject = session.scalars(select(Subject).order_by(Subject.id)).first()
+    teacher = subject.teacher
+    return {
+        'select_1': (),
+        'select_2': (subject.name,),
+        'select_3': (subject.name,),
+        'select_5': (teacher.name,),
+        'select_6': (group.name,),
+        'select_7': (group.name, subject.name),
+        'select_8': (teacher.name,),
+        'select_9': (student.name,),
+        'select_10': (student.name, teacher.name),
+    }
+
+
+def explain(session, func, *args):
+    with StatementCounter(session.get_bind()) as counter:
+        func(*args)
+    assert counter.count == 1
+    rows = session.connection().exec_driver_sql('EXPLAIN QUERY PLAN ' + counter.statements[0],
+                                                counter.parameters[0])
+    return [row[3] for row in rows]
+
+
+def full_scans(plan):
+    # Повне читання таблиці або неповного індексу: "SCAN grades", "SCAN grades USING INDEX ...".
+    # Допускаються лише SEARCH і SCAN ... USING COVERING INDEX (читає сам індекс)
+    return {detail.split()[1] for detail in plan
+            if detail.startswith('SCAN ') and 'USING COVERING INDEX' not in detail}
+
+
+@pytest.mark.parametrize('name', ['select_1', 'select_2', 'select_3', 'select_5', 'select_6',
+                                  'select_7', 'select_8', 'select_9', 'select_10'])
+def test_rows_variant_uses_indexes(name, session, call_args, record_property):
+    variant = f'{name}_rows'
+    started = time.perf_counter()
+    plan = explain(session, getattr(my_select, variant), *call_args[name])
+    record_property('elapsed', time.perf_counter() - started)
+    record_property('plan', plan)
+
+    scanned = full_scans(plan) & set(LARGE_TABLES)
+    assert scanned <= ALLOWED_SCANS.get(variant, set()), plan
+
+
+def test_select_2_takes_top_grade_from_index(session, call_args):
+    plan = explain(session, my_select.select_2_rows, *call_args['select_2'])
+    # Найкраща оцінка предмета - перший запис індексу (subject_id, score), без сортування оцінок
+    assert 'SEARCH grades USING COVERING INDEX ix_grades_subject_id_score (subject_id=?)' in plan, plan
+
+
+def test_ranked_variant_uses_indexes(session, call_args):
+    plan = explain(session, my_select.select_2_ranked_rows, *call_args['select_2'])
+    assert not full_scans(plan) & set(LARGE_TABLES), plan
+    assert any('ix_grades_subject_id_student_id_score' in detail for detail in plan), plan
+
+
+def test_rows_variants_match_entity_queries(session, call_args):
+    args = call_args
+
+    assert my_select.select_1_rows() == [(s.id, s.name, s.group_id) for s in my_select.select_1()]
+
+    # При однакових найвищих балах обидва варіанти можуть обрати різних студентів
+    best = my_select.select_2_rows(*args['select_2'])
+    top_score = session.scalar(select(func.max(Grade.score)).join(Subject).where(Subject.name == args['select_2'][0]))
+    assert best.score == top_score
+    assert my_select.select_2(*args['select_2']) is not None
+
+    assert my_select.select_3_rows(*args['select_3']) == pytest.approx(my_select.select_3(*args['select_3']))
+    assert my_select.select_8_rows(*args['select_8']) == pytest.approx(my_select.select_8(*args['select_8']))
+
+    assert my_select.select_5_rows(*args['select_5']) == [(s.id, s.name) for s in my_select.select_5(*args['select_5'])]
+    assert my_select.select_6_rows(*args['select_6']) == [(s.id, s.name) for s in my_select.select_6(*args['select_6'])]
+    assert sorted(my_select.select_7_rows(*args['select_7'])) == sorted(
+        (g.student.name, g.score, g.date) for g in my_select.select_7(*args['select_7']))
+
+    # Row-варіанти 9 і 10 повертають кожен предмет один раз
+    assert sorted(my_select.select_9_rows(*args['select_9'])) == sorted(
+        {(s.id, s.name) for s in my_select.select_9(*args['select_9'])})
+    assert sorted(my_select.select_10_rows(*args['select_10'])) == sorted(
+        {(s.id, s.name) for s in my_select.select_10(*args['select_10'])})
+
+
+def test_ranked_variant_orders_by_average(session, call_args):
+    ranked = my_select.select_2_ranked_rows(*call_args['select_2'], limit=3)
+    places = [row.place for row in ranked]
+    averages = [row.avg_score for row in ranked]
+    assert places == sorted(places) and max(places) <= 3
+    assert averages == sorted(averages, reverse=True)
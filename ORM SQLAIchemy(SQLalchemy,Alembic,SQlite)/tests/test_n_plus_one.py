@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy.orm import Session
+
+import my_select
+from models import Grade
+from n_plus_one import WALKS, NPlusOneError, call_args, check_constant, statements_per_call, walk_grades
+from seed_bulk import make_engine, seed_bulk
+
+SIZES = (10, 100)
+
+
+@pytest.fixture(scope='module')
+def engines(tmp_path_factory):
+    # Дві бази з однаковою структурою, але різною кількістю студентів
+    engines = {}
+    for size in SIZES:
+        path = tmp_path_factory.mktemp(f'students_{size}') / 'university.db'
+        engines[size] = make_engine(f"sqlite:///{path}")
+        seed_bulk(engines[size], students_count=size, grades_per_subject=2, seed=22)
+    yield engines
+    for engine in engines.values():
+        engine.dispose()
+
+
+def count_by_size(engines, monkeypatch, call, args_for, walk):
+    counts = {}
+    for size, engine in engines.items():
+        session = Session(bind=engine)
+        monkeypatch.setattr(my_select, 'session', session)
+        args = args_for(session)
+        session.expunge_all()
+        counts[size], result = statements_per_call(engine, call, *args, walk=walk)
+        assert result
+        session.close()
+    return counts
+
+
+@pytest.mark.parametrize('name', sorted(WALKS))
+def test_statements_per_call_do_not_grow(name, engines, monkeypatch):
+    counts = count_by_size(engines, monkeypatch, lambda *args: getattr(my_select, name)(*args),
+                           lambda session: call_args(session)[name], WALKS[name])
+    check_constant(name, counts)
+
+
+def test_detector_flags_lazy_loading(engines, monkeypatch):
+    # Без стратегій завантаження grade.student підтягується окремим запитом на кожного студента
+    counts = count_by_size(engines, monkeypatch, lambda: my_select.session.query(Grade).all(),
+                           lambda session: (), walk_grades)
+    with pytest.raises(NPlusOneError):
+        check_constant('lazy', counts)
@@ -0,0 +1,168 @@
+import time
+from datetime import date
+
+import pytest
+from sqlalchemy import delete, func, select, text, union_all, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import sessionmaker
+
+import my_select
+from models import Student, Subject, Teacher, Grade
+from query_cache import QueryCache
+from seed_bulk import make_engine, seed_bulk
+
+
+@pytest.fixture(scope='module')
+def engine(tmp_path_factory):
+    path = tmp_path_factory.mktemp('query_cache') / 'university.db'
+    engine = make_engine(f"sqlite:///{path}")
+    seed_bulk(engine, students_count=40, grades_per_subject=2, seed=25)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def cache():
+    cache = QueryCache(maxsize=16, ttl=60.0)
+    yield cache
+    cache.remove()
+
+
+@pytest.fixture
+def Session(engine, cache):
+    Session = sessionmaker(bind=engine)
+    cache.install(Session)
+    return Session
+
+
+@pytest.fixture
+def names(Session):
+    with Session() as session:
+        subject = session.scalars(select(Subject).order_by(Subject.id)).first()
+        return {'subject': subject.name, 'subject_id': subject.id, 'teacher': subject.teacher.name,
+                'student_id': session.scalar(select(Student.id).order_by(Student.id))}
+
+
+def run(Session, monkeypatch, func, *args):
+    with Session() as session:
+        monkeypatch.setattr(my_select, 'session', session)
+        return func(*args)
+
+
+def test_repeated_report_is_served_from_cache(Session, cache, names, monkeypatch):
+    before = cache.stats()
+    first = run(Session, monkeypatch, my_select.select_6_rows, 'unknown group')
+    rows = run(Session, monkeypatch, my_select.select_5_rows, names['teacher'])
+    again = run(Session, monkeypatch, my_select.select_5_rows, names['teacher'])
+
+    assert first == []
+    assert rows == again and rows
+    assert all(isinstance(row, Row) for row in again)
+    stats = cache.stats()
+    assert stats['hits'] - before['hits'] == 1
+    assert stats['misses'] - before['misses'] == 2
+
+
+def test_orm_write_invalidates_only_affected_tables(Session, cache, names, monkeypatch):
+    average = run(Session, monkeypatch, my_select.select_3_rows, names['subject'])
+    run(Session, monkeypatch, my_select.select_5_rows, names['teacher'])
+
+    with Session() as session:
+        session.add(Grade(student_id=names['student_id'], subject_id=names['subject_id'],
+                          score=1, date=date.today()))
+        session.commit()
+
+    hits = cache.hits
+    changed = run(Session, monkeypatch, my_select.select_3_rows, names['subject'])
+    run(Session, monkeypatch, my_select.select_5_rows, names['teacher'])
+    assert changed < average
+    # Середній бал перераховано, а предмети викладача (без grades) - з кешу
+    assert cache.hits == hits + 1
+    assert cache.stats()['invalidated'] >= 1
+
+
+def test_uncommitted_writes_are_not_cached(Session, cache, names, monkeypatch):
+    average = run(Session, monkeypatch, my_select.select_3_rows, names['subject'])
+
+    with Session() as session:
+        monkeypatch.setattr(my_select, 'session', session)
+        session.add(Grade(student_id=names['student_id'], subject_id=names['subject_id'],
+                          score=100, date=date.today()))
+        session.flush()
+        inside = my_select.select_3_rows(names['subject'])
+        session.rollback()
+
+    assert inside > average
+    assert run(Session, monkeypatch, my_select.select_3_rows, names['subject']) == pytest.approx(average)
+
+
+def test_entity_reports_are_cached_as_rows(Session, cache, names, monkeypatch):
+    cache.clear()
+    first = run(Session, monkeypatch, my_select.select_7, 'unknown group', names['subject'])
+    students = run(Session, monkeypatch, my_select.select_1)
+    hits = cache.hits
+    again = run(Session, monkeypatch, my_select.select_1)
+
+    assert first == []
+    assert students == again and students
+    assert cache.hits == hits + 1
+    assert all(isinstance(student, Row) for student in again)
+    # Зв'язки зі стратегій завантаження доступні і після закриття сесії
+    assert all(student.group.name for student in again)
+
+
+def test_plain_entity_queries_bypass_cache(Session, cache, names):
+    cache.clear()
+    with Session() as session:
+        student = session.get(Student, names['student_id'])
+        students = session.scalars(select(Student).order_by(Student.id)).all()
+    assert isinstance(student, Student) and isinstance(students[0], Student)
+    assert cache.stats()['size'] == 0
+
+
+def test_ttl_and_lru_eviction(engine, monkeypatch):
+    cache = QueryCache(maxsize=2, ttl=0.05)
+    Session = sessionmaker(bind=engine)
+    cache.install(Session)
+    try:
+        with Session() as session:
+            for teacher_id in (1, 2, 3):
+                session.execute(select(Teacher.name).where(Teacher.id == teacher_id)).all()
+            assert cache.stats()['evicted'] == 1 and cache.stats()['size'] == 2
+
+            session.execute(select(Teacher.name).where(Teacher.id == 3)).all()
+            assert cache.hits == 1
+            time.sleep(0.06)
+            session.execute(select(Teacher.name).where(Teacher.id == 3)).all()
+            assert cache.stats()['expired'] == 1
+            assert cache.stats()['hit_ratio'] == pytest.approx(1 / 5)
+    finally:
+        cache.remove()
+
+
+def test_union_and_textual_selects_run_uncached(Session, cache):
+    with Session() as session:
+        union = union_all(select(Teacher.name).where(Teacher.id == 1), select(Teacher.name).where(Teacher.id == 2))
+        textual = text('SELECT name FROM teachers WHERE id = :id').columns(Teacher.name)
+        assert len(session.execute(union).all()) == 2
+        assert len(session.execute(textual, {'id': 1}).all()) == 1
+    assert cache.stats()['size'] == 0
+
+
+@pytest.mark.parametrize('statement', [
+    lambda teacher_id: update(Teacher).where(Teacher.id == teacher_id).values(name='Renamed Teacher'),
+    lambda teacher_id: delete(Teacher).where(Teacher.id == teacher_id),
+])
+def test_orm_bulk_statements_invalidate(Session, cache, statement):
+    with Session() as session:
+        teacher_id = session.scalar(select(func.max(Teacher.id)))
+    query = select(Teacher.name).where(Teacher.id == teacher_id)
+
+    with Session() as session:
+        before = session.execute(query).all()
+        assert session.execute(query).all() == before
+    with Session() as session:
+        session.execute(statement(teacher_id))
+        session.commit()
+    with Session() as session:
+        assert session.execute(query).all() == session.execute(query, execution_options={'query_cache': False}).all() != before
@@ -0,0 +1,31 @@
+from sqlalchemy import func, select
+
+from models import Student, Group, Teacher, Subject, Grade
+from seed_bulk import make_engine, seed_bulk
+
+
+def test_bulk_seed_assigns_ids_and_appends(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'university.db'}", batch_size=50)
+
+    first = seed_bulk(engine, students_count=40, grades_per_subject=2, batch_size=50, seed=21)
+    second = seed_bulk(engine, students_count=10, grades_per_subject=1, batch_size=50, seed=22)
+
+    with engine.connect() as conn:
+        def count(model):
+            return conn.execute(select(func.count(), func.max(model.id)).select_from(model)).one()
+
+        assert count(Group) == (6, 6)
+        assert count(Teacher) == (6, 6)
+        assert count(Subject) == (10, 10)
+        assert count(Student) == (50, 50)
+        assert count(Grade) == (40 * 5 * 2 + 10 * 5, 40 * 5 * 2 + 10 * 5)
+        assert first + second == 6 + 6 + 10 + 50 + 450
+
+        # Зовнішні ключі вказують на рядки, вставлені в тому ж запуску
+        orphans = conn.execute(
+            select(func.count()).select_from(Grade)
+            .outerjoin(Student, Grade.student_id == Student.id)
+            .where(Student.id.is_(None))
+        ).scalar()
+        assert orphans == 0
+    engine.dispose()
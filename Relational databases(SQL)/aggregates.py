@@ -0,0 +1,246 @@
+import argparse
+
+import partitions
+from query_engine import DB_PATH, TEMPLATES, get_connection, iter_query
+
+# Матеріалізовані суми і кількості оцінок для звітів з AVG(grade).
+# Таблиці оновлюються тригерами на grades, students і subjects, тому звіти
+# читають готові агрегати замість повного проходу по grades.
+# У базі, розбитій partitions.partition(), тригери grades стоять на розділах.
+# Ключ - (ім'я колонки, вираз через рядок grades {row} для тригерів).
+SUMMARIES = {
+    'agg_total': [('id', '1')],
+    'agg_student': [('student_id', '{row}.student_id')],
+    'agg_subject': [('subject_id', '{row}.subject_id')],
+    'agg_student_subject': [('subject_id', '{row}.subject_id'), ('student_id', '{row}.student_id')],
+    'agg_group_subject': [('subject_id', '{row}.subject_id'),
+                          ('group_id', '(SELECT group_id FROM students WHERE id = {row}.student_id)')],
+    'agg_teacher': [('teacher_id', '(SELECT teacher_id FROM subjects WHERE id = {row}.subject_id)')],
+}
+
+# Повний перерахунок кожної таблиці - для rebuild() і перевірки узгодженості
+RECOMPUTE = {
+    'agg_total': '''
+        SELECT 1, SUM(grade), COUNT(grade) FROM grades
+        WHERE grade IS NOT NULL HAVING COUNT(grade) > 0''',
+    'agg_student': '''
+        SELECT student_id, SUM(grade), COUNT(grade) FROM grades
+        WHERE student_id IS NOT NULL AND grade IS NOT NULL
+        GROUP BY student_id''',
+    'agg_subject': '''
+        SELECT subject_id, SUM(grade), COUNT(grade) FROM grades
+        WHERE subject_id IS NOT NULL AND grade IS NOT NULL
+        GROUP BY subject_id''',
+    'agg_student_subject': '''
+        SELECT subject_id, student_id, SUM(grade), COUNT(grade) FROM grades
+        WHERE subject_id IS NOT NULL AND student_id IS NOT NULL AND grade IS NOT NULL
+        GROUP BY subject_id, student_id''',
+    'agg_group_subject': '''
+        SELECT g.subject_id, s.group_id, SUM(g.grade), COUNT(g.grade)
+        FROM grades g
+        JOIN students s ON s.id = g.student_id
+        WHERE g.subject_id IS NOT NULL AND s.group_id IS NOT NULL AND g.grade IS NOT NULL
+        GROUP BY g.subject_id, s.group_id''',
+    'agg_teacher': '''
+        SELECT sb.teacher_id, SUM(g.grade), COUNT(g.grade)
+        FROM grades g
+        JOIN subjects sb ON sb.id = g.subject_id
+        WHERE sb.teacher_id IS NOT NULL AND g.grade IS NOT NULL
+        GROUP BY sb.teacher_id''',
+}
+
+# Варіанти звітів поверх агрегатів; результати збігаються з query_*.sql
+AGGREGATE_SQL = {
+    'query_1': '''
+        SELECT s.name, CAST(a.grade_sum AS REAL) / a.grade_count AS avg_grade
+        FROM agg_student a
+        JOIN students s ON s.id = a.student_id
+        ORDER BY avg_grade DESC
+        LIMIT 5''',
+    'query_2': '''
+        SELECT s.name, CAST(a.grade_sum AS REAL) / a.grade_count AS avg_grade
+        FROM agg_student_subject a
+        JOIN students s ON s.id = a.student_id
+        WHERE a.subject_id = :subject_id
+        ORDER BY avg_grade DESC
+        LIMIT 1''',
+    'query_3': '''
+        SELECT gr.name AS group_name, CAST(a.grade_sum AS REAL) / a.grade_count AS avg_grade
+        FROM agg_group_subject a
+        JOIN groups gr ON gr.id = a.group_id
+        WHERE a.subject_id = :subject_id
+        ORDER BY gr.id''',
+    'query_4': '''
+        SELECT CAST(SUM(grade_sum) AS REAL) / SUM(grade_count) AS avg_grade
+        FROM agg_total''',
+    'query_8': '''
+        SELECT CAST(SUM(a.grade_sum) AS REAL) / SUM(a.grade_count) AS avg_grade
+        FROM agg_teacher a
+        JOIN teachers t ON t.id = a.teacher_id
+        WHERE t.name = :teacher_name''',
+}
+
+
+def _keys(table):
+    return [column for column, _ in SUMMARIES[table]]
+
+
+def _add(table, row):
+    # Додати оцінку рядка {row} до агрегату (NULL-ключі не враховуються, як у JOIN)
+    keys = _keys(table)
+    exprs = [expr.format(row=row) for _, expr in SUMMARIES[table]]
+    conditions = ' AND '.join([f'{expr} IS NOT NULL' for expr in exprs] + [f'{row}.grade IS NOT NULL'])
+    return f'''
+        INSERT INTO {table} ({', '.join(keys)}, grade_sum, grade_count)
+        SELECT {', '.join(exprs)}, {row}.grade, 1 WHERE {conditions}
+        ON CONFLICT ({', '.join(keys)}) DO UPDATE SET
+            grade_sum = grade_sum + excluded.grade_sum,
+            grade_count = grade_count + excluded.grade_count;'''
+
+
+def _subtract(table, row):
+    match = ' AND '.join(f'{column} = {expr.format(row=row)}' for column, expr in SUMMARIES[table])
+    return f'''
+        UPDATE {table} SET grade_sum = grade_sum - {row}.grade, grade_count = grade_count - 1
+        WHERE {match} AND {row}.grade IS NOT NULL;
+        DELETE FROM {table} WHERE {match} AND grade_count = 0;'''
+
+
+def _move(table, column, old, new, source, source_match, other_keys=()):
+    # Перенести суми з source з ключа old на ключ new: студент змінив групу
+    # або предмет - викладача (old/new = NULL для вставки і видалення)
+    correlate = ''.join(f' AND src.{key} = {table}.{key}' for key in other_keys)
+    select = ', '.join(other_keys)
+    return f'''
+        UPDATE {table} SET
+            grade_sum = grade_sum - (SELECT SUM(src.grade_sum) FROM {source} src WHERE {source_match}{correlate}),
+            grade_count = grade_count - (SELECT SUM(src.grade_count) FROM {source} src WHERE {source_match}{correlate})
+        WHERE {column} = {old}
+          AND EXISTS (SELECT 1 FROM {source} src WHERE {source_match}{correlate});
+        DELETE FROM {table} WHERE {column} = {old} AND grade_count = 0;
+        INSERT INTO {table} ({column}, {select + ', ' if select else ''}grade_sum, grade_count)
+        SELECT {new}, {select + ', ' if select else ''}SUM(src.grade_sum), SUM(src.grade_count)
+        FROM {source} src WHERE {source_match} AND {new} IS NOT NULL
+        GROUP BY {select or 'NULL'} HAVING COUNT(*) > 0
+        ON CONFLICT ({', '.join(_keys(table))}) DO UPDATE SET
+            grade_sum = grade_sum + excluded.grade_sum,
+            grade_count = grade_count + excluded.grade_count;'''
+
+
+def _trigger(name, event, body, when=None):
+    when = f' WHEN {when}' if when else ''
+    return f'CREATE TRIGGER IF NOT EXISTS {name} AFTER {event}{when}\nBEGIN{body}\nEND;'
+
+
+def grades_triggers():
+    add = ''.join(_add(table, 'NEW') for table in SUMMARIES)
+    subtract = ''.join(_subtract(table, 'OLD') for table in SUMMARIES)
+    return [
+        _trigger('agg_grades_insert', 'INSERT ON grades', add),
+        _trigger('agg_grades_delete', 'DELETE ON grades', subtract),
+        _trigger('agg_grades_update', 'UPDATE OF student_id, subject_id, grade ON grades', subtract + add),
+    ]
+
+
+def schema():
+    # Таблиці агрегатів і тригери students/subjects; тригери grades - grades_triggers()
+    statements = []
+    for table, keys in SUMMARIES.items():
+        columns = ', '.join(f'{column} INTEGER NOT NULL' for column, _ in keys)
+        primary = ', '.join(column for column, _ in keys)
+        statements.append(f'CREATE TABLE IF NOT EXISTS {table} ({columns}, grade_sum INTEGER NOT NULL, '
+                          f'grade_count INTEGER NOT NULL, PRIMARY KEY ({primary})) WITHOUT ROWID;')
+    # Перенесення студента між групами шукає його рядки за student_id
+    statements.append('CREATE INDEX IF NOT EXISTS idx_agg_student_subject_student '
+                      'ON agg_student_subject (student_id)')
+
+
+    def move_group(old, new, student):
+        return _move('agg_group_subject', 'group_id', old, new, 'agg_student_subject',
+                     f'src.student_id = {student}', ('subject_id',))
+
+    def move_teacher(old, new, subject):
+        return _move('agg_teacher', 'teacher_id', old, new, 'agg_subject', f'src.subject_id = {subject}')
+
+    statements.append(_trigger('agg_students_insert', 'INSERT ON students', move_group('NULL', 'NEW.group_id', 'NEW.id')))
+    statements.append(_trigger('agg_students_update', 'UPDATE OF group_id ON students',
+                               move_group('OLD.group_id', 'NEW.group_id', 'NEW.id'),
+                               when='OLD.group_id IS NOT NEW.group_id'))
+    statements.append(_trigger('agg_students_delete', 'DELETE ON students', move_group('OLD.group_id', 'NULL', 'OLD.id')))
+    statements.append(_trigger('agg_subjects_insert', 'INSERT ON subjects', move_teacher('NULL', 'NEW.teacher_id', 'NEW.id')))
+    statements.append(_trigger('agg_subjects_update', 'UPDATE OF teacher_id ON subjects',
+                               move_teacher('OLD.teacher_id', 'NEW.teacher_id', 'NEW.id'),
+                               when='OLD.teacher_id IS NOT NEW.teacher_id'))
+    statements.append(_trigger('agg_subjects_delete', 'DELETE ON subjects', move_teacher('OLD.teacher_id', 'NULL', 'OLD.id')))
+    return statements
+
+
+GRADES_TRIGGERS = ('agg_grades_insert', 'agg_grades_delete', 'agg_grades_update')
+TRIGGERS = (*GRADES_TRIGGERS,
+            'agg_students_insert', 'agg_students_update', 'agg_students_delete',
+            'agg_subjects_insert', 'agg_subjects_update', 'agg_subjects_delete')
+
+
+def install(conn):
+    with conn:
+        for statement in schema():
+            conn.execute(statement)
+        for statement in grades_triggers():
+            partitions.create_grades_trigger(conn, statement)
+    rebuild(conn)
+
+
+def drop_triggers(conn):
+    # Для масового завантаження: тригери вимикаються, а після - rebuild()
+    with conn:
+        for name in GRADES_TRIGGERS:
+            partitions.drop_grades_trigger(conn, name)
+        for name in TRIGGERS[len(GRADES_TRIGGERS):]:
+            conn.execute(f'DROP TRIGGER IF EXISTS {name}')
+
+
+def rebuild(conn):
+    with conn:
+        for table, query in RECOMPUTE.items():
+            conn.execute(f'DELETE FROM {table}')
+            conn.execute(f'INSERT INTO {table} {query}')
+
+
+def check(conn):
+    # Порівняння агрегатів з повним перерахунком; повертає розбіжні рядки по таблицях
+    mismatches = {}
+    for table, query in RECOMPUTE.items():
+        stored = set(conn.execute(f'SELECT {", ".join(_keys(table))}, grade_sum, grade_count FROM {table}'))
+        expected = set(conn.execute(query))
+        if stored != expected:
+            mismatches[table] = {'missing': sorted(expected - stored), 'unexpected': sorted(stored - expected)}
+    return mismatches
+
+
+def run_aggregate_report(name, db_path=DB_PATH, **params):
+    if name not in AGGREGATE_SQL:
+        raise KeyError(f"No aggregate variant for report: {name}")
+    TEMPLATES[name].check(params)
+    return iter_query(AGGREGATE_SQL[name], params, db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Агреговані таблиці оцінок для звітів з AVG(grade)")
+    parser.add_argument('command', choices=['install', 'rebuild', 'check', 'drop-triggers'])
+    parser.add_argument('--db', default=DB_PATH)
+    args = parser.parse_args()
+
+    conn = get_connection(args.db)
+    if args.command == 'install':
+        install(conn)
+    elif args.command == 'rebuild':
+        rebuild(conn)
+    elif args.command == 'drop-triggers':
+        drop_triggers(conn)
+    else:
+        mismatches = check(conn)
+        for table, diff in mismatches.items():
+            print(f"{table}: {len(diff['missing'])} missing, {len(diff['unexpected'])} unexpected rows")
+        if mismatches:
+            raise SystemExit(1)
+        print("Aggregates are consistent")
@@ -0,0 +1,44 @@
+import sys
+import os
+import time
+import resource
+import argparse
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '..'))
+
+import query_engine
+from query_engine import REGISTRY, default_params, run_report
+from columnar import export, compute_reports
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="query_1..query_10: SQLite vs Arrow IPC + NumPy")
+    parser.add_argument("--db", default=query_engine.DB_PATH)
+    parser.add_argument("--out", default="columnar")
+    parser.add_argument("--skip-export", action="store_true")
+    args = parser.parse_args()
+
+    if not args.skip_export:
+        start = time.perf_counter()
+        rows = export(args.db, args.out)
+        print(f"export: {rows} grades in {time.perf_counter() - start:.1f}s, peak RSS {peak_rss_mb():.0f} MB")
+
+    params = default_params(args.db)
+    names = [f"query_{i}" for i in range(1, 11)]
+
+    start = time.perf_counter()
+    for name in names:
+        list(run_report(name, db_path=args.db, **{param: params[param] for param in REGISTRY[name]}))
+    sql = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compute_reports(args.out, params)
+    columnar = time.perf_counter() - start
+
+    print(f"sqlite:   {sql * 1000:10.1f} ms")
+    print(f"columnar: {columnar * 1000:10.1f} ms ({sql / columnar:.1f}x), peak RSS {peak_rss_mb():.0f} MB")
@@ -0,0 +1,61 @@
+import sys
+import os
+import time
+import sqlite3
+import argparse
+import tempfile
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '..'))
+
+from create_db import create_database, populate_database_bulk
+from query_engine import run_report, close_connections
+import partitions
+
+
+def build(db_path, students, years):
+    # Рік оцінок від populate_database_bulk і його копії, зсунуті на 1..years-1 років назад
+    create_database(db_path)
+    populate_database_bulk(db_path, students=students, seed=19)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        base = conn.execute('SELECT MAX(id) FROM grades').fetchone()[0]
+        for shift in range(1, years):
+            conn.execute("INSERT INTO grades (student_id, subject_id, grade, date) "
+                         f"SELECT student_id, subject_id, grade, date(date, '-{shift} years') "
+                         "FROM grades WHERE id <= ?", (base,))
+    conn.execute('ANALYZE')
+    conn.close()
+
+
+def timed(func, repeat):
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="query_11 (останнє заняття): одна таблиця vs розділи по роках")
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--years", type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'years':>6}{'grades':>12}{'flat, ms':>12}{'partitioned, ms':>18}")
+    for years in args.years:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'university.db')
+            build(db_path, args.students, years)
+            flat = timed(lambda: list(run_report('query_11', db_path=db_path, group_id=1, subject_id=1)), args.repeat)
+            close_connections()
+
+            conn = sqlite3.connect(db_path)
+            grades = conn.execute('SELECT COUNT(*) FROM grades').fetchone()[0]
+            partitions.partition(conn)
+            conn.close()
+            conn = partitions.connect(db_path)
+            parted = timed(lambda: partitions.last_lesson(conn, 1, 1), args.repeat)
+            conn.close()
+        print(f"{years:>6}{grades:>12}{flat:>12.2f}{parted:>18.2f}")
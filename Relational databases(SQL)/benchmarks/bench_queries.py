@@ -0,0 +1,53 @@
+import sys
+import os
+import time
+import sqlite3
+import argparse
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '..'))
+
+import query_engine
+from query_engine import BASE_DIR, REGISTRY, execute_query, run_report
+
+
+def old_execute(name, params, db_path):
+    # Попередній шлях queries.py: читання .sql і нове з'єднання на кожен виклик
+    with open(os.path.join(BASE_DIR, f'{name}.sql'), 'r') as file:
+        query = file.read()
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    results = cursor.fetchall()
+    conn.close()
+    return results
+
+
+def sample_params(db_path):
+    teacher = execute_query("SELECT name FROM teachers ORDER BY id LIMIT 1", db_path=db_path)[0][0]
+    student = execute_query("SELECT name FROM students ORDER BY id LIMIT 1", db_path=db_path)[0][0]
+    group = execute_query("SELECT name FROM groups ORDER BY id LIMIT 1", db_path=db_path)[0][0]
+    values = {'subject_id': 1, 'group_id': 1, 'group_name': group,
+              'teacher_name': teacher, 'student_name': student}
+    return {name: {param: values[param] for param in signature} for name, signature in REGISTRY.items()}
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="queries.py: нове з'єднання на запит vs query_engine")
+    parser.add_argument("--db", default=query_engine.DB_PATH)
+    parser.add_argument("--repeat", type=int, default=10_000)
+    args = parser.parse_args()
+
+    params = sample_params(args.db)
+    print(f"{'report':<10}{'old, us':>12}{'engine, us':>14}{'speedup':>10}")
+    for name in REGISTRY:
+        old = timed(lambda: old_execute(name, params[name], args.db), args.repeat)
+        new = timed(lambda: sum(1 for _ in run_report(name, db_path=args.db, **params[name])), args.repeat)
+        print(f"{name:<10}{old:>12.1f}{new:>14.1f}{old / new:>9.1f}x")
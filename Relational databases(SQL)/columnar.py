@@ -0,0 +1,262 @@
+import os
+import time
+import argparse
+
+import numpy as np
+import pyarrow as pa
+
+import partitions
+from query_engine import DB_PATH, REGISTRY, default_params, run_report
+
+# Колонковий шлях аналітики: grades разом з group_id і teacher_id
+# вивантажується пачками у файл Arrow IPC, а статистики query_1..query_10
+# рахуються векторизовано (np.bincount) за один прохід по пачках файлу,
+# відкритого через memory map. Пам'ять обмежена розміром пачки і довідників.
+
+GRADES_SQL = '''
+    SELECT g.student_id, g.subject_id, g.grade, g.date, s.group_id, sb.teacher_id
+    FROM grades g
+    LEFT JOIN students s ON s.id = g.student_id
+    LEFT JOIN subjects sb ON sb.id = g.subject_id
+'''
+
+GRADES_SCHEMA = pa.schema([
+    ('student_id', pa.int64()),
+    ('subject_id', pa.int64()),
+    ('grade', pa.int64()),
+    ('date', pa.date32()),
+    ('group_id', pa.int64()),
+    ('teacher_id', pa.int64()),
+])
+
+# Довідники невеликі й пишуться цілком
+DIMENSIONS = {
+    'students': ('SELECT id, name, group_id FROM students',
+                 pa.schema([('id', pa.int64()), ('name', pa.string()), ('group_id', pa.int64())])),
+    'subjects': ('SELECT id, name, teacher_id FROM subjects',
+                 pa.schema([('id', pa.int64()), ('name', pa.string()), ('teacher_id', pa.int64())])),
+    'groups': ('SELECT id, name FROM groups', pa.schema([('id', pa.int64()), ('name', pa.string())])),
+    'teachers': ('SELECT id, name FROM teachers', pa.schema([('id', pa.int64()), ('name', pa.string())])),
+}
+
+# Звіти з ORDER BY ... LIMIT: порядок студентів з рівним середнім у SQLite не визначений
+RANKED = ('query_1', 'query_2')
+
+
+def to_batch(rows, schema):
+    columns = list(zip(*rows))
+    arrays = []
+    for field, values in zip(schema, columns):
+        if pa.types.is_date32(field.type):
+            arrays.append(pa.array(values, pa.string()).cast(field.type))
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def write_table(cursor, path, schema, chunk_size):
+    rows_written = 0
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+        while rows := cursor.fetchmany(chunk_size):
+            writer.write_batch(to_batch(rows, schema))
+            rows_written += len(rows)
+    return rows_written
+
+
+def export(db_path=DB_PATH, out_dir='columnar', chunk_size=500_000):
+    os.makedirs(out_dir, exist_ok=True)
+    # Через partitions.connect: у розбитій базі grades включає і архівні роки
+    conn = partitions.connect(db_path)
+    try:
+        for name, (query, schema) in DIMENSIONS.items():
+            write_table(conn.execute(query), os.path.join(out_dir, f'{name}.arrow'), schema, chunk_size)
+        return write_table(conn.execute(GRADES_SQL), os.path.join(out_dir, 'grades.arrow'),
+                           GRADES_SCHEMA, chunk_size)
+    finally:
+        conn.close()
+
+
+def read_table(out_dir, name):
+    with pa.memory_map(os.path.join(out_dir, f'{name}.arrow')) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def iter_batches(out_dir, name='grades'):
+    # Пачки читаються з memory map без копіювання, по одній
+    with pa.memory_map(os.path.join(out_dir, f'{name}.arrow')) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i)
+
+
+def ints(column):
+    # NULL -> -1, щоб ключі можна було маскувати як у JOIN
+    return column.fill_null(-1).to_numpy()
+
+
+class Dimension:
+    def __init__(self, table, parent=None):
+        ids = ints(table['id'])
+        self.size = int(ids.max()) + 1 if len(ids) else 0
+        self.exists = np.zeros(self.size, dtype=bool)
+        self.exists[ids] = True
+        self.names = np.empty(self.size, dtype=object)
+        self.names[ids] = table['name'].to_pylist()
+        self.parent = None
+        if parent:
+            self.parent = np.full(self.size, -1, dtype=np.int64)
+            self.parent[ids] = ints(table[parent])
+
+    def ids_named(self, name):
+        return np.flatnonzero(self.names == name)
+
+    def valid(self, keys):
+        # Ключ існує в довіднику (аналог INNER JOIN)
+        inside = (keys >= 0) & (keys < self.size)
+        result = np.zeros(len(keys), dtype=bool)
+        result[inside] = self.exists[keys[inside]]
+        return result
+
+
+def grouped(keys, grades, size):
+    return (np.bincount(keys, weights=grades, minlength=size),
+            np.bincount(keys, minlength=size))
+
+
+def compute_reports(out_dir, params):
+    students = Dimension(read_table(out_dir, 'students'), 'group_id')
+    subjects = Dimension(read_table(out_dir, 'subjects'), 'teacher_id')
+    groups = Dimension(read_table(out_dir, 'groups'))
+    teachers = Dimension(read_table(out_dir, 'teachers'))
+
+    n_students, n_subjects = max(students.size, 1), max(subjects.size, 1)
+    subject_id = params['subject_id']
+    teacher_ids = teachers.ids_named(params['teacher_name'])
+    student_ids = students.ids_named(params['student_name'])
+    group_ids = groups.ids_named(params['group_name'])
+
+    student_sum = np.zeros(n_students)
+    student_cnt = np.zeros(n_students, dtype=np.int64)
+    subject_sum = np.zeros(n_students)
+    subject_cnt = np.zeros(n_students, dtype=np.int64)
+    group_sum = np.zeros(max(groups.size, 1))
+    group_cnt = np.zeros(max(groups.size, 1), dtype=np.int64)
+    total_sum, total_cnt, teacher_sum, teacher_cnt = 0, 0, 0, 0
+    query_7, query_9, query_10 = [], set(), []
+
+    for batch in iter_batches(out_dir):
+        student = ints(batch['student_id'])
+        subject = ints(batch['subject_id'])
+        grade = ints(batch['grade'])
+        group = ints(batch['group_id'])
+        teacher = ints(batch['teacher_id'])
+
+        graded = grade >= 0
+        known_student = students.valid(student)
+        known_subject = subjects.valid(subject)
+        in_subject = subject == subject_id
+
+        # query_4: середня по всіх оцінках
+        total_sum += int(grade[graded].sum())
+        total_cnt += int(graded.sum())
+
+        # query_1 / query_2: середні студентів (усі предмети і заданий предмет)
+        mask = graded & known_student
+        sums, counts = grouped(student[mask], grade[mask], n_students)
+        student_sum += sums
+        student_cnt += counts
+        mask &= in_subject
+        sums, counts = grouped(student[mask], grade[mask], n_students)
+        subject_sum += sums
+        subject_cnt += counts
+
+        # query_3: середні груп з предмета (студент і група мають існувати)
+        mask = graded & known_student & in_subject & groups.valid(group)
+        sums, counts = grouped(group[mask], grade[mask], len(group_sum))
+        group_sum += sums
+        group_cnt += counts
+
+        # query_8: середня оцінка викладача
+        mask = graded & known_subject & np.isin(teacher, teacher_ids)
+        teacher_sum += int(grade[mask].sum())
+        teacher_cnt += int(mask.sum())
+
+        # query_7: оцінки студентів групи з предмета
+        mask = known_student & in_subject & np.isin(group, group_ids)
+        for s, g in zip(student[mask].tolist(), grade[mask].tolist()):
+            query_7.append((students.names[s], g if g >= 0 else None))
+
+        # query_9 / query_10: предмети студента (і заданого викладача)
+        mask = known_subject & np.isin(student, student_ids)
+        query_9.update(subject[mask].tolist())
+        mask &= np.isin(teacher, teacher_ids)
+        query_10.extend(subjects.names[subject[mask]].tolist())
+
+    def averages(sums, counts):
+        ids = np.flatnonzero(counts)
+        return ids, sums[ids] / counts[ids]
+
+    def top(sums, counts, limit):
+        ids, avg = averages(sums, counts)
+        order = np.argsort(-avg, kind='stable')[:limit]
+        return [(students.names[i], float(a)) for i, a in zip(ids[order], avg[order])]
+
+    group_ids_all, group_avg = averages(group_sum, group_cnt)
+    return {
+        'query_1': top(student_sum, student_cnt, 5),
+        'query_2': top(subject_sum, subject_cnt, 1),
+        'query_3': [(groups.names[i], float(a)) for i, a in zip(group_ids_all, group_avg)],
+        'query_4': [(total_sum / total_cnt if total_cnt else None,)],
+        'query_5': [(name,) for name in subjects.names[
+            np.isin(subjects.parent, teacher_ids) & subjects.exists]],
+        'query_6': [(name,) for name in students.names[
+            np.isin(students.parent, group_ids) & students.exists]],
+        'query_7': query_7,
+        'query_8': [(teacher_sum / teacher_cnt if teacher_cnt else None,)],
+        # SELECT DISTINCT s.name: предмети з однаковою назвою - один рядок
+        'query_9': [(name,) for name in sorted({subjects.names[i] for i in query_9})],
+        'query_10': [(name,) for name in query_10],
+    }
+
+
+def normalize(name, rows):
+    if name in RANKED:
+        return [row[1] for row in rows]
+    return sorted(rows, key=repr)
+
+
+def verify(db_path, out_dir, params=None):
+    # Порівняння з query_N.sql; повертає назви звітів, що не збіглися
+    params = params or default_params(db_path)
+    columnar = compute_reports(out_dir, params)
+    mismatched = []
+    for name, rows in columnar.items():
+        expected = list(run_report(name, db_path=db_path, **{param: params[param] for param in REGISTRY[name]}))
+        if normalize(name, rows) != normalize(name, expected):
+            mismatched.append(name)
+    return mismatched
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Експорт grades в Arrow IPC і звіти query_1..query_10 по ньому")
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--out', default='columnar')
+    parser.add_argument('--chunk-size', type=int, default=500_000)
+    parser.add_argument('--skip-export', action='store_true')
+    parser.add_argument('--verify', action='store_true', help='порівняти з результатами SQL')
+    args = parser.parse_args()
+
+    if not args.skip_export:
+        start = time.perf_counter()
+        rows = export(args.db, args.out, args.chunk_size)
+        print(f"Exported {rows} grades in {time.perf_counter() - start:.1f}s")
+
+    params = default_params(args.db)
+    start = time.perf_counter()
+    reports = compute_reports(args.out, params)
+    print(f"query_1..query_10 computed in {(time.perf_counter() - start) * 1000:.1f} ms")
+    if args.verify:
+        mismatched = verify(args.db, args.out, params)
+        print("Columnar and SQL results match" if not mismatched else f"Mismatched: {mismatched}")
+        if mismatched:
+            raise SystemExit(1)
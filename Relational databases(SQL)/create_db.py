@@ -1,10 +1,31 @@
 import sqlite3
+import argparse
+import itertools
+import time
 from faker import Faker
 import random
-from datetime import datetime, timedelta
-
-def create_database():
-    conn = sqlite3.connect('university.db')
+from datetime import date, datetime, timedelta
+
+# Індекси під звіти query_*.sql. Складені індекси покривають запити повністю:
+# оцінка, дата і ключі читаються з індексу без звернення до рядків grades.
+# Створюються після масового завантаження (див. populate_database_bulk):
+# вставка в таблицю без індексів і одна побудова в кінці набагато швидші
+INDEXES = {
+    # query_2, query_3, query_7, query_8, query_11: оцінки з предмета
+    'idx_grades_subject_student':
+        'CREATE INDEX IF NOT EXISTS idx_grades_subject_student ON grades (subject_id, student_id, grade, date)',
+    # query_1, query_4, query_9, query_10: оцінки студента
+    'idx_grades_student_subject':
+        'CREATE INDEX IF NOT EXISTS idx_grades_student_subject ON grades (student_id, subject_id, grade)',
+    # query_3, query_6, query_7, query_11: студенти групи
+    'idx_students_group': 'CREATE INDEX IF NOT EXISTS idx_students_group ON students (group_id, name)',
+    # query_9, query_10: пошук студента за іменем
+    'idx_students_name': 'CREATE INDEX IF NOT EXISTS idx_students_name ON students (name)',
+    'idx_subjects_teacher': 'CREATE INDEX IF NOT EXISTS idx_subjects_teacher ON subjects (teacher_id)',
+}
+
+def create_database(db_path='university.db'):
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
     create_tables_script = '''
@@ -44,11 +65,22 @@ def create_database():
     '''
 
     cursor.executescript(create_tables_script)
+    create_indexes(conn)
     conn.close()
 
-def populate_database():
+def create_indexes(conn):
+    for statement in INDEXES.values():
+        conn.execute(statement)
+    conn.commit()
+
+def drop_indexes(conn):
+    for name in INDEXES:
+        conn.execute(f'DROP INDEX IF EXISTS {name}')
+    conn.commit()
+
+def populate_database(db_path='university.db'):
     fake = Faker()
-    conn = sqlite3.connect('university.db')
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
     groups = [('Group 1',), ('Group 2',), ('Group 3',)]
@@ -76,11 +108,111 @@ def populate_database():
     conn.commit()
     conn.close()
 
-if __name__ == "__main__":
-    create_database()
-    populate_database()
-
-
+def batched(rows, size):
+    iterator = iter(rows)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
 
+def populate_database_bulk(db_path='university.db', students=100_000, grades_per_subject=20,
+                           groups=3, teachers=5, subjects=8, batch_size=50_000, seed=None):
+    # Масштабований режим: executemany пачками з генераторів, одна транзакція,
+    # PRAGMA на час завантаження і векторизовані (NumPy) оцінки та дати
+    import numpy as np
 
+    fake = Faker()
+    if seed is not None:
+        Faker.seed(seed)
+    rng = np.random.default_rng(seed)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    conn.execute('PRAGMA cache_size = -262144')
+    drop_indexes(conn)
+
+    start = time.perf_counter()
+    rows = 0
+    with conn:
+        first_group = conn.execute('SELECT COALESCE(MAX(id), 0) FROM groups').fetchone()[0] + 1
+        conn.executemany('INSERT INTO groups (id, name) VALUES (?, ?)',
+                         ((first_group + i, f'Group {first_group + i}') for i in range(groups)))
+
+        first_teacher = conn.execute('SELECT COALESCE(MAX(id), 0) FROM teachers').fetchone()[0] + 1
+        conn.executemany('INSERT INTO teachers (id, name) VALUES (?, ?)',
+                         ((first_teacher + i, fake.name()) for i in range(teachers)))
+
+        first_subject = conn.execute('SELECT COALESCE(MAX(id), 0) FROM subjects').fetchone()[0] + 1
+        conn.executemany('INSERT INTO subjects (id, name, teacher_id) VALUES (?, ?, ?)',
+                         ((first_subject + i, fake.word(), first_teacher + int(rng.integers(teachers)))
+                          for i in range(subjects)))
+        rows += groups + teachers + subjects
+
+        # Faker повільний, тож імена збираються з невеликих наборів імен і прізвищ
+        first_names = np.array([fake.first_name() for _ in range(500)])
+        last_names = np.array([fake.last_name() for _ in range(500)])
+        first_student = conn.execute('SELECT COALESCE(MAX(id), 0) FROM students').fetchone()[0] + 1
+        next_grade = conn.execute('SELECT COALESCE(MAX(id), 0) FROM grades').fetchone()[0] + 1
+        today = np.datetime64(date.today())
+        per_student = subjects * grades_per_subject
+
+        # Студенти і їхні оцінки пишуться шматками, щоб пам'ять не росла з розміром набору
+        chunk = max(1, batch_size // per_student)
+        for offset in range(0, students, chunk):
+            count = min(chunk, students - offset)
+            student_ids = np.arange(first_student + offset, first_student + offset + count)
+            names = np.char.add(np.char.add(rng.choice(first_names, count), ' '), rng.choice(last_names, count))
+            group_ids = rng.integers(first_group, first_group + groups, count)
+            conn.executemany('INSERT INTO students (id, name, group_id) VALUES (?, ?, ?)',
+                             zip(student_ids.tolist(), names.tolist(), group_ids.tolist()))
+
+            n = count * per_student
+            grade_ids = np.arange(next_grade, next_grade + n)
+            grade_students = np.repeat(student_ids, per_student)
+            grade_subjects = np.tile(np.repeat(np.arange(first_subject, first_subject + subjects),
+                                               grades_per_subject), count)
+            grades = rng.integers(1, 6, n)
+            dates = np.datetime_as_string(today - rng.integers(0, 365, n).astype('timedelta64[D]'))
+            conn.executemany(
+                'INSERT INTO grades (id, student_id, subject_id, grade, date) VALUES (?, ?, ?, ?, ?)',
+                zip(grade_ids.tolist(), grade_students.tolist(), grade_subjects.tolist(),
+                    grades.tolist(), dates.tolist()),
+            )
+            next_grade += n
+            rows += count + n
+
+    load_time = time.perf_counter() - start
+    create_indexes(conn)
+    conn.execute('ANALYZE')
+    conn.close()
+    total_time = time.perf_counter() - start
+    print(f"Inserted {rows} rows in {load_time:.1f}s ({rows / load_time:,.0f} rows/sec), "
+          f"indexes + ANALYZE {total_time - load_time:.1f}s")
+    return rows
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Створення і заповнення бази university.db")
+    parser.add_argument('--db', default='university.db')
+    parser.add_argument('--students', type=int, help='кількість студентів (масштабований режим)')
+    parser.add_argument('--grades-per-subject', type=int, default=20)
+    parser.add_argument('--groups', type=int, default=3)
+    parser.add_argument('--teachers', type=int, default=5)
+    parser.add_argument('--subjects', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=50_000)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--indexes-only', action='store_true',
+                        help='лише оновити індекси та статистику існуючої бази')
+    args = parser.parse_args()
+
+    if args.indexes_only:
+        conn = sqlite3.connect(args.db)
+        create_indexes(conn)
+        conn.execute('ANALYZE')
+        conn.close()
+        raise SystemExit
+    create_database(args.db)
+    if args.students is None:
+        populate_database(args.db)
+    else:
+        populate_database_bulk(args.db, args.students, args.grades_per_subject, args.groups,
+                               args.teachers, args.subjects, args.batch_size, args.seed)
@@ -0,0 +1,116 @@
+import re
+import json
+import base64
+import argparse
+from collections import namedtuple
+
+from query_engine import DB_PATH, REGISTRY, TEMPLATES, default_params, get_connection
+from sql_loader import LITERALS
+
+# Посторінкове читання звітів з великим результатом через keyset (seek)
+# пагінацію: кожна сторінка починається одразу після ключа останнього рядка
+# попередньої, тому її вартість не залежить від номера сторінки, а пам'ять -
+# від розміру таблиці.
+#
+# Посторінковий варіант будується з того самого шаблону query_N.sql
+# (sql_loader): ключові колонки додаються в кінець SELECT, а сам звіт
+# загортається в підзапит з умовою на ключ, ORDER BY і LIMIT. SQLite
+# розгортає такий підзапит, тож умова на ключ іде в індекс. Ключі
+# відрізаються від рядків перед поверненням.
+PAGE_KEYS = {
+    'query_6': ('s.id',),
+    'query_7': ('s.id', 'g.id'),
+    'query_10': ('g.id',),
+    'query_11': ('s.id', 'g.id'),
+}
+
+# Перший FROM поза літералами і коментарями закінчує список колонок SELECT
+FIRST_FROM = re.compile(r'\bFROM\b', re.IGNORECASE)
+
+
+def paged_sql(template, keys):
+    sql = template.sql.strip().rstrip(';')
+    masked = LITERALS.sub(lambda match: ' ' * len(match.group()), sql)
+    position = FIRST_FROM.search(masked).start()
+    key_columns = ', '.join(f'{key} AS page_key_{i}' for i, key in enumerate(keys))
+    names = [f'page_key_{i}' for i in range(len(keys))]
+    after = [f':after_{i}' for i in range(len(keys))]
+    return (f"SELECT * FROM (\n{sql[:position].rstrip()}, {key_columns}\n{sql[position:]}\n)\n"
+            f"WHERE ({', '.join(names)}) > ({', '.join(after)})\n"
+            f"ORDER BY {', '.join(names)}\n"
+            f"LIMIT :page_size")
+
+
+# Звіт, чий .sql файл не пройшов перевірку sql_loader, не має і посторінкового варіанту
+PAGED_SQL = {name: (keys, paged_sql(TEMPLATES[name], keys)) for name, keys in PAGE_KEYS.items() if name in TEMPLATES}
+
+Page = namedtuple('Page', ['rows', 'cursor'])
+
+
+def encode_cursor(name, after):
+    data = json.dumps({'report': name, 'after': list(after)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(name, token):
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token.encode()))
+        report, after = data['report'], data['after']
+        # Ключі - список цілих id (bool теж int, тож тип перевіряється точно)
+        if not isinstance(after, list) or not all(type(value) is int for value in after):
+            raise ValueError
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor token")
+    if report != name or len(after) != len(PAGED_SQL[name][0]):
+        raise ValueError(f"Cursor token does not belong to {name}")
+    return after
+
+
+def fetch_page(name, page_size=1000, cursor=None, db_path=DB_PATH, **params):
+    if name not in PAGED_SQL:
+        raise KeyError(f"No paged variant for report: {name}")
+    if not isinstance(page_size, int) or page_size < 1:
+        raise ValueError(f"page_size must be a positive integer, got {page_size!r}")
+    TEMPLATES[name].check(params)
+    keys, query = PAGED_SQL[name]
+
+    # Ключі - цілі id, тож початкове значення -1 менше за будь-який з них
+    after = decode_cursor(name, cursor) if cursor else [-1] * len(keys)
+    bound = {**params, 'page_size': page_size, **{f'after_{i}': value for i, value in enumerate(after)}}
+    rows = get_connection(db_path).execute(query, bound).fetchall()
+
+    # Неповна сторінка - остання, курсора на наступну немає
+    next_cursor = encode_cursor(name, rows[-1][-len(keys):]) if len(rows) == page_size else None
+    return Page([row[:-len(keys)] for row in rows], next_cursor)
+
+
+def iter_pages(name, page_size=1000, cursor=None, db_path=DB_PATH, **params):
+    while True:
+        page = fetch_page(name, page_size, cursor, db_path, **params)
+        if page.rows:
+            yield page
+        if page.cursor is None:
+            return
+        cursor = page.cursor
+
+
+def iter_rows(name, page_size=1000, cursor=None, db_path=DB_PATH, **params):
+    # У пам'яті одночасно лише одна сторінка
+    for page in iter_pages(name, page_size, cursor, db_path, **params):
+        yield from page.rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Посторінковий вивід звіту")
+    parser.add_argument('report', choices=sorted(PAGED_SQL))
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--cursor', help='токен, виведений попередньою сторінкою')
+    args = parser.parse_args()
+
+    defaults = default_params(args.db)
+    params = {param: defaults[param] for param in REGISTRY[args.report]}
+    page = fetch_page(args.report, args.page_size, args.cursor, args.db, **params)
+    for row in page.rows:
+        print(row)
+    print(f"next cursor: {page.cursor}" if page.cursor else "last page")
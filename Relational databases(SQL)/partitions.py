@@ -0,0 +1,337 @@
+import os
+import re
+import sqlite3
+import argparse
+
+from query_engine import DB_PATH, readonly_uri
+
+# Необов'язкове розбиття grades на таблиці по роках (grades_2024, ...).
+# Після partition() grades стає UNION ALL представленням над розділами,
+# тож query_*.sql працюють без змін, а INSERT/UPDATE/DELETE grades
+# потрапляють у розділ свого року через INSTEAD OF тригери. Запити з датою (last_lesson,
+# grades_between) відкидають зайві розділи ще в Python і читають лише
+# потрібні. Старі розділи archive() переносить в окремі файли, які
+# attach_archives() підключає лише для читання - її викликає і
+# query_engine.get_connection, тож звіти бачать архівні роки.
+#
+# AFTER тригери таблиці grades (агрегати aggregates.py, покоління
+# result_cache.py) partition() зберігає в grade_triggers і створює на
+# кожному розділі; add_partition() додає їх новим розділам.
+
+COLUMNS = 'id, student_id, subject_id, grade, date'
+
+LAST_LESSON_SQL = '''
+    SELECT s.name AS student_name, g.grade, g.date
+    FROM {table} g
+    JOIN students s ON g.student_id = s.id
+    WHERE s.group_id = :group_id AND g.subject_id = :subject_id
+      AND g.date = (
+        SELECT MAX(g2.date)
+        FROM {table} g2
+        JOIN students s2 ON g2.student_id = s2.id
+        WHERE s2.group_id = :group_id AND g2.subject_id = :subject_id
+      )
+'''
+
+
+# AFTER тригери grades, які кожен розділ має отримати
+GRADE_TRIGGERS_TABLE = 'CREATE TABLE IF NOT EXISTS grade_triggers (name TEXT PRIMARY KEY, sql TEXT NOT NULL)'
+
+# Заголовок тригера до назви таблиці: ім'я і подія ("... AFTER UPDATE OF grade ON ")
+TRIGGER_HEADER = re.compile(r'CREATE\s+TRIGGER\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)(.*?\bON\s+)grades\b',
+                            re.IGNORECASE | re.DOTALL)
+
+
+def year_range(year):
+    return f'{year:04d}-01-01', f'{year + 1:04d}-01-01'
+
+
+def create_partition(conn, year, schema='main'):
+    start, end = year_range(year)
+    table = f'grades_{year}'
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {schema}.{table} (
+            id INTEGER PRIMARY KEY,
+            student_id INTEGER,
+            subject_id INTEGER,
+            grade INTEGER,
+            date DATE,
+            CHECK (date >= '{start}' AND date < '{end}')
+        )''')
+    # Ті самі покривні індекси, що й у create_db.INDEXES для grades
+    conn.execute(f'CREATE INDEX IF NOT EXISTS {schema}.idx_{table}_subject_student '
+                 f'ON {table} (subject_id, student_id, grade, date)')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS {schema}.idx_{table}_student_subject '
+                 f'ON {table} (student_id, subject_id, grade)')
+    return table
+
+
+def is_partitioned(conn):
+    row = conn.execute("SELECT type FROM main.sqlite_master WHERE name = 'grades'").fetchone()
+    return row is not None and row[0] == 'view'
+
+
+def partition_trigger(sql, year):
+    # Той самий тригер на розділі: ім'я з роком і ON grades_<рік>, тіло без змін
+    return TRIGGER_HEADER.sub(lambda match: f'CREATE TRIGGER IF NOT EXISTS {match.group(1)}_{year}'
+                                            f'{match.group(2)}grades_{year}', sql, count=1)
+
+
+def copy_grades_triggers(conn, year):
+    conn.execute(GRADE_TRIGGERS_TABLE)
+    for (sql,) in conn.execute('SELECT sql FROM grade_triggers').fetchall():
+        conn.execute(partition_trigger(sql, year))
+
+
+def create_grades_trigger(conn, sql):
+    # AFTER тригер, написаний для таблиці grades. У розбитій базі grades -
+    # представлення, тож тригер створюється на кожному робочому розділі
+    if not is_partitioned(conn):
+        conn.execute(sql)
+        return
+    name = TRIGGER_HEADER.search(sql).group(1)
+    conn.execute(GRADE_TRIGGERS_TABLE)
+    conn.execute('INSERT OR REPLACE INTO grade_triggers (name, sql) VALUES (?, ?)', (name, sql))
+    for year, _ in partition_years(conn, archived=False):
+        conn.execute(partition_trigger(sql, year))
+
+
+def drop_grades_trigger(conn, name):
+    conn.execute(f'DROP TRIGGER IF EXISTS main.{name}')
+    if is_partitioned(conn):
+        conn.execute(GRADE_TRIGGERS_TABLE)
+        conn.execute('DELETE FROM grade_triggers WHERE name = ?', (name,))
+        for year, _ in partition_years(conn):
+            conn.execute(f'DROP TRIGGER IF EXISTS main.{name}_{year}')
+
+
+def partition_years(conn, archived=None):
+    query = 'SELECT year, archive FROM grade_partitions'
+    if archived is not None:
+        query += ' WHERE archive IS NOT NULL' if archived else ' WHERE archive IS NULL'
+    return conn.execute(query + ' ORDER BY year').fetchall()
+
+
+def write_triggers(schema, years, archived=(), archived_max_id=0):
+    # INSTEAD OF тригери, які роблять представлення grades записуваним:
+    # INSERT іде в розділ року NEW.date, DELETE - з розділу, де лежить рядок,
+    # UPDATE - це DELETE старого рядка і INSERT нового (рядок може змінити рік).
+    # Архівні розділи лише для читання - зміна їхніх рядків відхиляється.
+    # schema - схема представлення grades; імена розділів у тригерах не можна
+    # кваліфікувати, але й TEMP тригер знаходить grades_<рік> у main
+    known = ', '.join(str(year) for year in years) or 'NULL'
+    frozen = ', '.join(str(year) for year in archived) or 'NULL'
+    if years:
+        # id нового рядка - наступний після найбільшого в розділах (MAX(id) по rowid - O(1)),
+        # але не менший за id в архівах, інакше id повторився б у TEMP представленні
+        next_id = (f'(SELECT MAX(COALESCE(MAX(m), 0), {archived_max_id}) + 1 FROM ('
+                   + ' UNION ALL '.join(f'SELECT MAX(id) AS m FROM grades_{year}' for year in years) + '))')
+    else:
+        next_id = 'NULL'
+
+    def check(row):
+        return f'''
+                SELECT RAISE(ABORT, 'archived partitions are read-only')
+                WHERE CAST(substr({row}.date, 1, 4) AS INTEGER) IN ({frozen});'''
+
+    check_new = f'''
+                SELECT RAISE(ABORT, 'no writable partition for this date')
+                WHERE NEW.date IS NULL OR CAST(substr(NEW.date, 1, 4) AS INTEGER) NOT IN ({known});'''
+
+    def insert(new_id):
+        return ''.join(f'''
+                INSERT INTO grades_{year} ({COLUMNS})
+                SELECT {new_id}, NEW.student_id, NEW.subject_id, NEW.grade, NEW.date
+                WHERE NEW.date >= '{year_range(year)[0]}' AND NEW.date < '{year_range(year)[1]}';''' for year in years)
+
+    delete = ''.join(f'''
+                DELETE FROM grades_{year} WHERE id = OLD.id;''' for year in years)
+
+    return [
+        f'''
+            CREATE TRIGGER {schema}.grades_route_insert INSTEAD OF INSERT ON grades
+            BEGIN{check_new}{insert(f'COALESCE(NEW.id, {next_id})')}
+            END''',
+        f'''
+            CREATE TRIGGER {schema}.grades_route_delete INSTEAD OF DELETE ON grades
+            BEGIN{check('OLD')}{delete}
+            END''',
+        f'''
+            CREATE TRIGGER {schema}.grades_route_update INSTEAD OF UPDATE ON grades
+            BEGIN{check('OLD')}{check('NEW')}{check_new}{delete}{insert(f'COALESCE(NEW.id, OLD.id)')}
+            END''',
+    ]
+
+
+def rebuild_view(conn):
+    years = [year for year, _ in partition_years(conn, archived=False)]
+    if years:
+        body = '\nUNION ALL\n'.join(f'SELECT {COLUMNS} FROM grades_{year}' for year in years)
+    else:
+        body = 'SELECT NULL AS id, NULL AS student_id, NULL AS subject_id, NULL AS grade, NULL AS date WHERE 0'
+
+    archived_max_id = conn.execute('SELECT COALESCE(MAX(max_id), 0) FROM grade_partitions').fetchone()[0]
+
+    with conn:
+        conn.execute('DROP VIEW IF EXISTS main.grades')
+        conn.execute(f'CREATE VIEW main.grades AS\n{body}')
+        for sql in write_triggers('main', years, archived_max_id=archived_max_id):
+            conn.execute(sql)
+
+
+def partition(conn):
+    if is_partitioned(conn):
+        raise ValueError("grades is already partitioned")
+    if conn.execute('SELECT 1 FROM grades WHERE date IS NULL LIMIT 1').fetchone():
+        raise ValueError("grades with NULL date cannot be assigned to a partition")
+
+    years = [row[0] for row in conn.execute(
+        'SELECT DISTINCT CAST(substr(date, 1, 4) AS INTEGER) FROM grades ORDER BY 1')]
+    # DROP TABLE grades видаляє і його тригери - вони переносяться на розділи
+    triggers = conn.execute("SELECT name, sql FROM main.sqlite_master "
+                            "WHERE type = 'trigger' AND tbl_name = 'grades'").fetchall()
+    with conn:
+        conn.execute('CREATE TABLE IF NOT EXISTS grade_partitions '
+                     '(year INTEGER PRIMARY KEY, archive TEXT, max_id INTEGER)')
+        conn.execute(GRADE_TRIGGERS_TABLE)
+        conn.executemany('INSERT OR REPLACE INTO grade_triggers (name, sql) VALUES (?, ?)', triggers)
+        for year in years:
+            start, end = year_range(year)
+            table = create_partition(conn, year)
+            conn.execute(f'INSERT INTO {table} ({COLUMNS}) SELECT {COLUMNS} FROM grades '
+                         'WHERE date >= ? AND date < ?', (start, end))
+            conn.execute('INSERT INTO grade_partitions (year) VALUES (?)', (year,))
+        conn.execute('DROP TABLE grades')
+        # Тригери створюються після копіювання: рядки вже враховані в агрегатах
+        for year in years:
+            copy_grades_triggers(conn, year)
+    rebuild_view(conn)
+    conn.execute('ANALYZE')
+    return years
+
+
+def add_partition(conn, year):
+    with conn:
+        create_partition(conn, year)
+        conn.execute('INSERT OR IGNORE INTO grade_partitions (year) VALUES (?)', (year,))
+        copy_grades_triggers(conn, year)
+    rebuild_view(conn)
+
+
+def archive(db_path, before_year, archive_dir):
+    # Розділи старші за before_year переносяться в окремі файли лише для читання
+    conn = sqlite3.connect(db_path)
+    db_dir = os.path.dirname(os.path.abspath(db_path))
+    os.makedirs(archive_dir, exist_ok=True)
+    archived = []
+    try:
+        for year, _ in partition_years(conn, archived=False):
+            if year >= before_year:
+                continue
+            path = os.path.abspath(os.path.join(archive_dir, f'grades_{year}.db'))
+            if os.path.exists(path):
+                raise FileExistsError(path)
+            conn.execute('ATTACH DATABASE ? AS archive', (path,))
+            try:
+                with conn:
+                    table = create_partition(conn, year, schema='archive')
+                    conn.execute(f'INSERT INTO archive.{table} SELECT {COLUMNS} FROM main.{table}')
+            finally:
+                conn.execute('DETACH DATABASE archive')
+            with conn:
+                max_id = conn.execute(f'SELECT MAX(id) FROM main.grades_{year}').fetchone()[0]
+                conn.execute(f'DROP TABLE main.grades_{year}')
+                conn.execute('UPDATE grade_partitions SET archive = ?, max_id = ? WHERE year = ?',
+                             (os.path.relpath(path, db_dir), max_id, year))
+            os.chmod(path, 0o444)
+            archived.append(year)
+        rebuild_view(conn)
+    finally:
+        conn.close()
+    return archived
+
+
+def connect(db_path=DB_PATH):
+    # З'єднання, у якому grades (TEMP представлення) бачить і архівні розділи
+    conn = sqlite3.connect(db_path, uri=True)
+    attach_archives(conn, db_path)
+    return conn
+
+
+def attach_archives(conn, db_path):
+    # З'єднання має бути відкрите з uri=True: архіви підключаються як file:...?mode=ro.
+    # Архіви читаються при підключенні - після archive() з'єднання треба відкрити знову
+    if not is_partitioned(conn):
+        return
+    db_dir = os.path.dirname(os.path.abspath(db_path))
+    archives = partition_years(conn, archived=True)
+    for year, path in archives:
+        conn.execute(f'ATTACH DATABASE ? AS archive_{year}', (readonly_uri(os.path.join(db_dir, path)),))
+    if archives:
+        body = '\nUNION ALL\n'.join(f'SELECT {COLUMNS} FROM {table}' for _, table in partition_tables(conn))
+        conn.execute(f'CREATE TEMP VIEW grades AS\n{body}')
+        # TEMP представлення затуляє main.grades, тож і запис іде через власні тригери
+        writable = [year for year, _ in partition_years(conn, archived=False)]
+        archived_max_id = conn.execute('SELECT COALESCE(MAX(max_id), 0) FROM grade_partitions').fetchone()[0]
+        for sql in write_triggers('temp', writable, [year for year, _ in archives], archived_max_id):
+            conn.execute(sql)
+
+
+def partition_tables(conn, start=None, end=None):
+    # Відсікання розділів: лише роки, що перетинаються з [start, end)
+    tables = []
+    for year, path in partition_years(conn):
+        year_start, year_end = year_range(year)
+        if (start and year_end <= start) or (end and year_start >= end):
+            continue
+        tables.append((year, f'archive_{year}.grades_{year}' if path else f'main.grades_{year}'))
+    return tables
+
+
+def grades_between(conn, start=None, end=None):
+    selects = [f'SELECT {COLUMNS} FROM {table} WHERE date >= :start AND date < :end'
+               for _, table in partition_tables(conn, start, end)]
+    if not selects:
+        return iter(())
+    params = {'start': start or '0000-01-01', 'end': end or '9999-12-31'}
+    return conn.execute('\nUNION ALL\n'.join(selects), params)
+
+
+def last_lesson(conn, group_id, subject_id):
+    # query_11 по розділах від найновішого: перший розділ з оцінками групи
+    # з предмета містить і останнє заняття, старші розділи не читаються
+    params = {'group_id': group_id, 'subject_id': subject_id}
+    for _, table in reversed(partition_tables(conn)):
+        rows = conn.execute(LAST_LESSON_SQL.format(table=table), params).fetchall()
+        if rows:
+            return rows
+    return []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Розділи grades по роках")
+    parser.add_argument('command', choices=['partition', 'archive', 'list', 'last-lesson'])
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--before', type=int, help='archive: переносити роки, старші за цей')
+    parser.add_argument('--dir', default='archive', help='archive: каталог для файлів розділів')
+    parser.add_argument('--group-id', type=int, default=1)
+    parser.add_argument('--subject-id', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.command == 'partition':
+        conn = sqlite3.connect(args.db)
+        print(f"Partitions: {partition(conn)}")
+        conn.close()
+    elif args.command == 'archive':
+        if args.before is None:
+            parser.error('archive requires --before')
+        print(f"Archived: {archive(args.db, args.before, args.dir)}")
+    else:
+        conn = connect(args.db)
+        if args.command == 'list':
+            for year, table in partition_tables(conn):
+                print(year, table)
+        else:
+            for row in last_lesson(conn, args.group_id, args.subject_id):
+                print(row)
+        conn.close()
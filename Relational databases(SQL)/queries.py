@@ -1,86 +1,80 @@
-import sqlite3
-
-def execute_query(query, params=None):
-    conn = sqlite3.connect('university.db')
-    cursor = conn.cursor()
-    if params:
-        cursor.execute(query, params)
-    else:
-        cursor.execute(query)
-    results = cursor.fetchall()
-    conn.close()
-    return results
+from query_engine import execute_query, run_report
 
-def query_1():
-    with open('query_1.sql', 'r') as file:
-        query = file.read()
-
-    results = execute_query(query)
-    for row in results:
+def print_report(name, **params):
+    for row in run_report(name, **params):
         print(row)
 
-def query_2(subject_id):
-    with open('query_2.sql', 'r') as file:
-        query = file.read()
+def query_1():
+    print_report('query_1')
 
-    results = execute_query(query, (subject_id,))
-    for row in results:
-        print(row)
+def query_2(subject_id):
+    print_report('query_2', subject_id=subject_id)
 
 def query_3(subject_id):
-    with open('query_3.sql', 'r') as file:
-        query = file.read()
-
-    results = execute_query(query, (subject_id,))
-    for row in results:
-        print(row)
+    print_report('query_3', subject_id=subject_id)
 
 def query_4():
-    with open('query_4.sql', 'r') as file:
-        query = file.read()
+    print_report('query_4')
 
-    results = execute_query(query)
-    for row in results:
-        print(row)
+def query_5(teacher_name):
+    print_report('query_5', teacher_name=teacher_name)
 
-def query_10(teacher_id, student_id):
-    with open('query_10.sql', 'r') as file:
-        query = file.read()
+def query_6(group_name):
+    print_report('query_6', group_name=group_name)
 
-    results = execute_query(query, (teacher_id, student_id))
-    for row in results:
-        print(row)
+def query_7(group_name, subject_id):
+    print_report('query_7', group_name=group_name, subject_id=subject_id)
 
-def query_11(group_id, subject_id):
-    with open('query_11.sql', 'r') as file:
-        query = file.read()
+def query_8(teacher_name):
+    print_report('query_8', teacher_name=teacher_name)
 
-    results = execute_query(query, (group_id, subject_id))
-    for row in results:
-        print(row)
+def query_9(student_name):
+    print_report('query_9', student_name=student_name)
+
+def query_10(student_name, teacher_name):
+    print_report('query_10', student_name=student_name, teacher_name=teacher_name)
+
+def query_11(group_id, subject_id):
+    print_report('query_11', group_id=group_id, subject_id=subject_id)
 
 if __name__ == "__main__":
     # Приклади виклику функцій запитів
+    subject_id = 1  # замініть на необхідний subject_id
+    group_id = 1  # замініть на необхідний group_id
+    group_name = 'Group 1'  # замініть на необхідну назву групи
+    # Імена беремо з бази, бо їх генерує Faker
+    teacher_name = execute_query("SELECT name FROM teachers ORDER BY id LIMIT 1")[0][0]
+    student_name = execute_query("SELECT name FROM students ORDER BY id LIMIT 1")[0][0]
+
     print("Query 1: Top 5 students with the highest average grades")
     query_1()
 
     print("\nQuery 2: Student with the highest average grade in a specific subject")
-    subject_id = 1  # замініть на необхідний subject_id
     query_2(subject_id)
 
     print("\nQuery 3: Average grade in groups for a specific subject")
-    subject_id = 1  # замініть на необхідний subject_id
     query_3(subject_id)
 
     print("\nQuery 4: Average grade across all grades")
     query_4()
 
-    print("\nQuery 10: Average grade a specific teacher gives to a specific student")
-    teacher_id = 1  # замініть на необхідний teacher_id
-    student_id = 1  # замініть на необхідний student_id
-    query_10(teacher_id, student_id)
+    print("\nQuery 5: Subjects taught by a specific teacher")
+    query_5(teacher_name)
+
+    print("\nQuery 6: Students in a specific group")
+    query_6(group_name)
+
+    print("\nQuery 7: Grades of students in a specific group for a specific subject")
+    query_7(group_name, subject_id)
+
+    print("\nQuery 8: Average grade a specific teacher gives")
+    query_8(teacher_name)
+
+    print("\nQuery 9: Subjects a specific student attends")
+    query_9(student_name)
+
+    print("\nQuery 10: Subjects a specific teacher teaches a specific student")
+    query_10(student_name, teacher_name)
 
     print("\nQuery 11: Grades of students in a specific group for a specific subject on the last lesson")
-    group_id = 1  # замініть на необхідний group_id
-    subject_id = 1  # замініть на необхідний subject_id
     query_11(group_id, subject_id)
@@ -0,0 +1,10 @@
+SELECT s.name AS student_name, g.grade, g.date
+FROM grades g
+JOIN students s ON g.student_id = s.id
+WHERE s.group_id = :group_id AND g.subject_id = :subject_id
+  AND g.date = (
+    SELECT MAX(g2.date)
+    FROM grades g2
+    JOIN students s2 ON g2.student_id = s2.id
+    WHERE s2.group_id = :group_id AND g2.subject_id = :subject_id
+  );
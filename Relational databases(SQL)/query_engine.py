@@ -0,0 +1,99 @@
+import os
+import sqlite3
+import threading
+import urllib.parse
+
+from sql_loader import load_templates
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, 'university.db')
+
+
+# Кожен .sql файл читається, розбирається і перевіряється на схемі один раз
+# при імпорті; на гарячому шляху немає ні читання файлів, ні обробки тексту
+TEMPLATES = load_templates(BASE_DIR)
+SQL = {name: template.sql for name, template in TEMPLATES.items()}
+
+# Іменовані параметри кожного звіту в порядку появи у .sql файлі
+REGISTRY = {name: template.params for name, template in TEMPLATES.items()}
+
+# sqlite3 кешує підготовлені запити на рівні з'єднання, тому з'єднання
+# живе довго: по одному на потік і на файл бази
+_local = threading.local()
+
+
+def readonly_uri(db_path):
+    # immutable=1: SQLite не бере блокувань і не перевіряє зміни файлу,
+    # тому так можна відкривати лише базу, яку ніхто не пише
+    path = urllib.parse.quote(os.path.abspath(db_path))
+    return f'file:{path}?mode=ro&immutable=1'
+
+
+def get_connection(db_path=DB_PATH, cached_statements=256, readonly=False):
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get((db_path, readonly))
+    if conn is None:
+        # uri=True і для звичайного шляху: архіви розділів підключаються як file:...?mode=ro
+        # (шлях без префікса file: і так лишається звичайним шляхом)
+        path = readonly_uri(db_path) if readonly else db_path
+        conn = sqlite3.connect(path, uri=True, cached_statements=cached_statements)
+        # grades, розбитий на розділи по роках, бачить і архівні роки;
+        # partitions імпортує цей модуль, тому імпорт тут, а не на початку
+        from partitions import attach_archives
+        attach_archives(conn, db_path)
+        connections[(db_path, readonly)] = conn
+    return conn
+
+
+def close_connections():
+    connections = getattr(_local, 'connections', {})
+    for conn in connections.values():
+        conn.close()
+    connections.clear()
+
+
+def iter_query(query, params=None, db_path=DB_PATH):
+    # Рядки читаються з курсора по одному, без fetchall()
+    cursor = get_connection(db_path).execute(query, params or ())
+    try:
+        yield from cursor
+    finally:
+        cursor.close()
+
+
+def execute_query(query, params=None, db_path=DB_PATH):
+    return list(iter_query(query, params, db_path))
+
+
+def default_params(db_path=DB_PATH):
+    # Імена генерує Faker, тому беремо перші з бази, як у queries.py;
+    # спільні для report_runner, pagination і columnar
+    return {
+        'subject_id': 1,
+        'group_id': 1,
+        'group_name': execute_query("SELECT name FROM groups ORDER BY id LIMIT 1", db_path=db_path)[0][0],
+        'teacher_name': execute_query("SELECT name FROM teachers ORDER BY id LIMIT 1", db_path=db_path)[0][0],
+        'student_name': execute_query("SELECT name FROM students ORDER BY id LIMIT 1", db_path=db_path)[0][0],
+    }
+
+
+def make_report(template):
+    def report(db_path=DB_PATH, **params):
+        template.check(params)
+        return iter_query(template.sql, params, db_path)
+    report.__name__ = template.name
+    report.params = template.params
+    report.columns = template.columns
+    return report
+
+
+# Готові виклики звітів: query_engine.REPORTS['query_7'](group_name=..., subject_id=...)
+REPORTS = {name: make_report(template) for name, template in TEMPLATES.items()}
+
+
+def run_report(name, db_path=DB_PATH, **params):
+    if name not in REPORTS:
+        raise KeyError(f"Unknown report: {name}")
+    return REPORTS[name](db_path, **params)
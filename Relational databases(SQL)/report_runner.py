@@ -0,0 +1,96 @@
+import os
+import csv
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from query_engine import DB_PATH, REGISTRY, SQL, default_params, get_connection
+
+# Паралельний запуск звітів query_N.sql: кожен потік має своє з'єднання
+# mode=ro&immutable=1, а sqlite3 відпускає GIL під час виконання запиту,
+# тому пакет звітів займає час найповільнішого з них, а не суму.
+
+
+class JsonLinesWriter:
+    def __init__(self, file, columns):
+        self.file = file
+        self.columns = columns
+
+    def writerow(self, row):
+        self.file.write(json.dumps(dict(zip(self.columns, row)), ensure_ascii=False) + '\n')
+
+
+class CsvWriter:
+    def __init__(self, file, columns):
+        self.writer = csv.writer(file)
+        self.writer.writerow(columns)
+
+    def writerow(self, row):
+        self.writer.writerow(row)
+
+
+WRITERS = {'jsonl': JsonLinesWriter, 'csv': CsvWriter}
+
+
+def run_one(name, params, db_path, out_dir, fmt):
+    start = time.perf_counter()
+    conn = get_connection(db_path, readonly=True)
+    cursor = conn.execute(SQL[name], {param: params[param] for param in REGISTRY[name]})
+    columns = [column[0] for column in cursor.description]
+    path = os.path.join(out_dir, f'{name}.{fmt}')
+    rows = 0
+    try:
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            writer = WRITERS[fmt](file, columns)
+            # Рядки пишуться у файл одразу з курсора, без накопичення в пам'яті
+            for row in cursor:
+                writer.writerow(row)
+                rows += 1
+    finally:
+        cursor.close()
+    return {'report': name, 'rows': rows, 'seconds': time.perf_counter() - start, 'path': path}
+
+
+def run_reports(names=None, params=None, db_path=DB_PATH, out_dir='reports', fmt='jsonl', workers=None):
+    names = list(names or REGISTRY)
+    unknown = [name for name in names if name not in REGISTRY]
+    if unknown:
+        raise KeyError(f"Unknown reports: {unknown}")
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown format: {fmt}")
+    params = {**default_params(db_path), **(params or {})}
+    os.makedirs(out_dir, exist_ok=True)
+
+    results = []
+    with ThreadPoolExecutor(max_workers=workers or len(names)) as pool:
+        futures = [pool.submit(run_one, name, params, db_path, out_dir, fmt) for name in names]
+        for future in as_completed(futures):
+            result = future.result()
+            print(f"{result['report']:<10} {result['rows']:>8} rows {result['seconds'] * 1000:>10.1f} ms")
+            results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Паралельний запуск звітів query_N.sql")
+    parser.add_argument('reports', nargs='*', help='звіти для запуску, за замовчуванням усі')
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--out', default='reports', help='каталог для результатів')
+    parser.add_argument('--format', choices=sorted(WRITERS), default='jsonl')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--subject-id', type=int)
+    parser.add_argument('--group-id', type=int)
+    parser.add_argument('--group-name')
+    parser.add_argument('--teacher-name')
+    parser.add_argument('--student-name')
+    args = parser.parse_args()
+
+    overrides = {key: value for key, value in vars(args).items()
+                 if key in ('subject_id', 'group_id', 'group_name', 'teacher_name', 'student_name')
+                 and value is not None}
+    start = time.perf_counter()
+    results = run_reports(args.reports, overrides, args.db, args.out, args.format, args.workers)
+    wall = time.perf_counter() - start
+    print(f"{len(results)} reports in {wall * 1000:.1f} ms wall, "
+          f"{sum(result['seconds'] for result in results) * 1000:.1f} ms summed")
@@ -0,0 +1,142 @@
+import time
+import sqlite3
+import threading
+import argparse
+from collections import OrderedDict
+
+import partitions
+from query_engine import DB_PATH, TEMPLATES, get_connection, iter_query
+
+# Кеш результатів звітів у пам'яті процесу: ключ - (звіт, параметри),
+# витіснення за розміром (LRU) і за часом (ttl).
+# Застарілі дані не віддаються ніколи: перед кожним зверненням з'єднання
+# перевіряє PRAGMA data_version (змінюється після коміту іншого з'єднання)
+# і total_changes (власні записи). Якщо щось змінилось, перечитуються
+# лічильники поколінь таблиць з table_generations, які тригери збільшують
+# на кожен запис. Запис кешу валідний, поки не змінилося покоління жодної
+# з таблиць, які читає звіт (SqlTemplate.tables). Без таблиці поколінь
+# (install_generations не викликали) будь-який запис скидає весь кеш бази.
+
+TABLES = ('students', 'groups', 'teachers', 'subjects', 'grades')
+
+
+def install_generations(conn, tables=TABLES):
+    with conn:
+        conn.execute('CREATE TABLE IF NOT EXISTS table_generations '
+                     '(name TEXT PRIMARY KEY, generation INTEGER NOT NULL DEFAULT 0)')
+        for table in tables:
+            conn.execute('INSERT OR IGNORE INTO table_generations (name) VALUES (?)', (table,))
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                sql = f'''
+                    CREATE TRIGGER IF NOT EXISTS gen_{table}_{event.lower()} AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE table_generations SET generation = generation + 1 WHERE name = '{table}';
+                    END'''
+                # У розбитій базі тригери grades стоять на кожному grades_<рік>
+                # і збільшують те саме покоління grades
+                if table == 'grades':
+                    partitions.create_grades_trigger(conn, sql)
+                else:
+                    conn.execute(sql)
+
+
+class ResultCache:
+    def __init__(self, maxsize=256, ttl=60.0, db_path=DB_PATH):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.db_path = db_path
+        self._entries = OrderedDict()  # key -> (rows, generations, expires_at)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidated": self.invalidated,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "size": len(self._entries),
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _generations(self, conn):
+        # Стан з'єднання цього потоку: відбиток (data_version, total_changes)
+        # і прочитані за ним покоління таблиць
+        state = getattr(self._local, 'state', None)
+        fingerprint = (conn.execute('PRAGMA data_version').fetchone()[0], conn.total_changes)
+        if state is not None and state[0] == fingerprint:
+            return state[1]
+
+        try:
+            generations = dict(conn.execute('SELECT name, generation FROM table_generations'))
+        except sqlite3.OperationalError:
+            generations = None
+        if generations is None:
+            # Таблиці поколінь немає - будь-яка зміна скидає всі записи (спільна епоха).
+            # Нове з'єднання теж збільшує епоху: воно не знає, що змінилось до нього
+            with self._lock:
+                self._epoch += 1
+                generations = {'*': self._epoch}
+        # Усередині транзакції покоління можуть містити незакомічені збільшення,
+        # а відкат не змінює ні data_version, ні total_changes - такий стан не запам'ятовуємо
+        self._local.state = None if conn.in_transaction else (fingerprint, generations)
+        return generations
+
+    def get(self, name, **params):
+        template = TEMPLATES[name]
+        template.check(params)
+        conn = get_connection(self.db_path)
+        generations = self._generations(conn)
+        tables = template.tables if '*' not in generations else ('*',)
+        current = tuple(generations.get(table) for table in tables)
+        key = (name, tuple(sorted(params.items())))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                rows, tag, expires_at = entry
+                if tag != current:
+                    self.invalidated += 1
+                elif expires_at <= time.monotonic():
+                    self.expired += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return rows
+            self.misses += 1
+
+        # Запит виконується поза блокуванням; покоління прочитані до нього,
+        # тож результат не старіший за свою мітку
+        rows = tuple(iter_query(template.sql, params, self.db_path))
+        if conn.in_transaction:
+            # Незакомічені власні зміни можуть бути відкочені - такий результат не кешуємо
+            return rows
+        with self._lock:
+            self._entries[key] = (rows, current, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+        return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Кеш результатів звітів: встановлення лічильників поколінь")
+    parser.add_argument('command', choices=['install'])
+    parser.add_argument('--db', default=DB_PATH)
+    args = parser.parse_args()
+
+    install_generations(get_connection(args.db))
+    print("table_generations and triggers installed")
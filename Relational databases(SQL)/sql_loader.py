@@ -0,0 +1,103 @@
+import os
+import re
+import glob
+import sqlite3
+import warnings
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_PATH = os.path.join(BASE_DIR, 'test.sql')
+
+# Рядкові літерали і коментарі вирізаються перед пошуком :параметрів
+LITERALS = re.compile(r"'(?:[^']|'')*'|--[^\n]*|/\*.*?\*/", re.DOTALL)
+NAMED_PARAM = re.compile(r':([A-Za-z_]\w*)')
+
+
+class SqlFileWarning(UserWarning):
+    pass
+
+
+class SqlTemplate:
+    # Розібраний .sql файл: текст, іменовані параметри в порядку появи,
+    # назви колонок результату і таблиці, які запит читає
+    __slots__ = ('name', 'path', 'sql', 'params', 'columns', 'tables', '_param_set')
+
+    def __init__(self, name, path, sql, params, columns, tables=frozenset()):
+        self.name = name
+        self.path = path
+        self.sql = sql
+        self.params = params
+        self.columns = columns
+        self.tables = tables
+        self._param_set = frozenset(params)
+
+    def check(self, params):
+        if params.keys() != self._param_set:
+            raise TypeError(f"{self.name}() expects parameters {self.params}, got {tuple(params)}")
+
+    def __repr__(self):
+        return f"SqlTemplate({self.name!r}, params={self.params}, columns={self.columns})"
+
+
+def natural_key(path):
+    # query_2.sql іде перед query_10.sql
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', path)]
+
+
+def parse_params(sql):
+    params = []
+    for name in NAMED_PARAM.findall(LITERALS.sub('', sql)):
+        if name not in params:
+            params.append(name)
+    return tuple(params)
+
+
+def schema_connection(schema_path=SCHEMA_PATH):
+    # Порожня база в пам'яті зі схемою - на ній запити перевіряються і
+    # повертають опис колонок без жодного рядка даних
+    conn = sqlite3.connect(':memory:')
+    with open(schema_path, 'r') as file:
+        conn.executescript(file.read())
+    return conn
+
+
+def compile_template(name, path, sql, conn):
+    if not sqlite3.complete_statement(sql):
+        raise ValueError("incomplete SQL statement")
+    if '?' in LITERALS.sub('', sql):
+        raise ValueError("positional '?' parameters are not supported, use :name")
+    params = parse_params(sql)
+    tables = set()
+
+    def authorizer(action, table, column, database, trigger):
+        # SQLite сам повідомляє, які таблиці читає підготовлений запит
+        if action == sqlite3.SQLITE_READ and table:
+            tables.add(table)
+        return sqlite3.SQLITE_OK
+
+    conn.set_authorizer(authorizer)
+    try:
+        cursor = conn.execute(sql, dict.fromkeys(params))
+    finally:
+        conn.set_authorizer(None)
+    columns = tuple(column[0] for column in cursor.description or ())
+    cursor.close()
+    return SqlTemplate(name, path, sql, params, columns, frozenset(tables))
+
+
+def load_templates(directory=BASE_DIR, pattern='query_*.sql', schema_path=SCHEMA_PATH):
+    # Усі файли читаються й перевіряються один раз; файл з помилкою
+    # пропускається з попередженням, а не ламає решту звітів
+    conn = schema_connection(schema_path)
+    templates = {}
+    try:
+        for path in sorted(glob.glob(os.path.join(directory, pattern)), key=natural_key):
+            name = os.path.splitext(os.path.basename(path))[0]
+            with open(path, 'r') as file:
+                sql = file.read()
+            try:
+                templates[name] = compile_template(name, path, sql, conn)
+            except (ValueError, sqlite3.Error) as error:
+                warnings.warn(f"{os.path.basename(path)}: {error}", SqlFileWarning, stacklevel=2)
+    finally:
+        conn.close()
+    return templates
@@ -31,3 +31,10 @@ CREATE TABLE IF NOT EXISTS grades (
     FOREIGN KEY (student_id) REFERENCES students(id),
     FOREIGN KEY (subject_id) REFERENCES subjects(id)
 );
+
+-- Індекси під звіти query_*.sql (той самий набір, що INDEXES у create_db.py)
+CREATE INDEX IF NOT EXISTS idx_grades_subject_student ON grades (subject_id, student_id, grade, date);
+CREATE INDEX IF NOT EXISTS idx_grades_student_subject ON grades (student_id, subject_id, grade);
+CREATE INDEX IF NOT EXISTS idx_students_group ON students (group_id, name);
+CREATE INDEX IF NOT EXISTS idx_students_name ON students (name);
+CREATE INDEX IF NOT EXISTS idx_subjects_teacher ON subjects (teacher_id);
@@ -0,0 +1,6 @@
+import sys
+import os
+
+# Модулі проєкту (create_db, query_engine) імпортуються напряму, як у queries.py
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '..'))
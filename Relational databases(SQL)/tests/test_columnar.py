@@ -0,0 +1,42 @@
+import sqlite3
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from create_db import create_database, populate_database_bulk
+from query_engine import close_connections
+from columnar import export, verify, iter_batches
+
+
+def test_columnar_reports_match_sql(tmp_path):
+    db_path = str(tmp_path / 'university.db')
+    out_dir = str(tmp_path / 'columnar')
+    create_database(db_path)
+    populate_database_bulk(db_path, students=300, seed=16)
+
+    # Маленькі пачки, щоб агрегати збиралися з кількох шматків файлу
+    rows = export(db_path, out_dir, chunk_size=5000)
+    try:
+        assert rows == 300 * 8 * 20
+        assert sum(1 for _ in iter_batches(out_dir)) == rows // 5000 + 1
+        assert verify(db_path, out_dir) == []
+    finally:
+        close_connections()
+
+
+def test_query_9_dedupes_subjects_by_name(tmp_path):
+    db_path = str(tmp_path / 'university.db')
+    out_dir = str(tmp_path / 'columnar')
+    create_database(db_path)
+    populate_database_bulk(db_path, students=50, seed=16)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("UPDATE subjects SET name = (SELECT name FROM subjects WHERE id = 1) WHERE id = 2")
+    conn.close()
+
+    export(db_path, out_dir)
+    try:
+        assert verify(db_path, out_dir) == []
+    finally:
+        close_connections()
@@ -0,0 +1,67 @@
+import json
+import base64
+
+import pytest
+
+from create_db import create_database, populate_database_bulk
+from query_engine import REGISTRY, TEMPLATES, default_params, run_report, close_connections
+from pagination import PAGED_SQL, decode_cursor, fetch_page, iter_pages, iter_rows
+
+
+@pytest.fixture(scope='module')
+def db_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('pages') / 'university.db')
+    create_database(path)
+    populate_database_bulk(path, students=200, seed=17)
+    yield path
+    close_connections()
+
+
+def params_for(name, db_path):
+    defaults = default_params(db_path)
+    return {param: defaults[param] for param in REGISTRY[name]}
+
+
+@pytest.mark.parametrize('name', sorted(PAGED_SQL))
+def test_pages_cover_the_full_report(name, db_path):
+    params = params_for(name, db_path)
+    expected = sorted(run_report(name, db_path=db_path, **params), key=repr)
+
+    pages = list(iter_pages(name, page_size=7, db_path=db_path, **params))
+    assert all(len(page.rows) <= 7 for page in pages)
+    assert sorted((row for page in pages for row in page.rows), key=repr) == expected
+
+
+def test_page_resumes_from_cursor_token(db_path):
+    params = params_for('query_7', db_path)
+    all_rows = list(iter_rows('query_7', page_size=50, db_path=db_path, **params))
+
+    first = fetch_page('query_7', 10, db_path=db_path, **params)
+    rest = list(iter_rows('query_7', page_size=50, cursor=first.cursor, db_path=db_path, **params))
+    assert first.rows + rest == all_rows
+
+    with pytest.raises(ValueError):
+        fetch_page('query_6', 10, first.cursor, db_path, **params_for('query_6', db_path))
+    with pytest.raises(ValueError):
+        fetch_page('query_7', 10, 'not-a-token', db_path, **params)
+
+
+@pytest.mark.parametrize('page_size', [0, -5, 2.5])
+def test_page_size_must_be_positive(page_size, db_path):
+    with pytest.raises(ValueError, match='page_size'):
+        fetch_page('query_7', page_size, db_path=db_path, **params_for('query_7', db_path))
+
+
+@pytest.mark.parametrize('after', [5, None, 'abc', [1], [1, 'x'], [1.5, 2], [True, 1]])
+def test_malformed_cursor_key_is_rejected(after):
+    data = json.dumps({'report': 'query_7', 'after': after}).encode()
+    with pytest.raises(ValueError):
+        decode_cursor('query_7', base64.urlsafe_b64encode(data).decode())
+
+
+@pytest.mark.parametrize('name', sorted(PAGED_SQL))
+def test_paged_variant_is_built_from_the_sql_file(name):
+    # Тіло звіту береться з query_N.sql без змін
+    body = TEMPLATES[name].sql.strip().rstrip(';')
+    query = PAGED_SQL[name][1]
+    assert body.split('FROM', 1)[1] in query
@@ -0,0 +1,156 @@
+import sqlite3
+
+import pytest
+
+import aggregates
+import partitions
+from create_db import create_database, populate_database_bulk
+from query_engine import run_report, close_connections
+from report_runner import run_reports
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    # Пробіл у шляху - як у каталозі проєкту, перевіряє URI архівів
+    path = tmp_path / 'with space' / 'university.db'
+    path.parent.mkdir()
+    create_database(str(path))
+    populate_database_bulk(str(path), students=100, seed=19)
+    conn = sqlite3.connect(str(path))
+    with conn:
+        conn.execute("INSERT INTO grades (student_id, subject_id, grade, date) "
+                     "SELECT student_id, subject_id, grade, date(date, '-2 years') FROM grades")
+    conn.close()
+    yield str(path)
+    close_connections()
+
+
+def test_partition_archive_and_last_lesson(db_path, tmp_path):
+    expected = sorted(run_report('query_11', db_path=db_path, group_id=1, subject_id=1))
+    conn = sqlite3.connect(db_path)
+    totals = conn.execute('SELECT COUNT(*), SUM(grade) FROM grades').fetchone()
+    years = partitions.partition(conn)
+
+    # Вставка через представлення потрапляє в розділ свого року
+    newest = years[-1]
+    with conn:
+        conn.execute("INSERT INTO grades (student_id, subject_id, grade, date) VALUES (1, 1, 5, ?)",
+                     (f'{newest}-01-01',))
+    assert conn.execute(f'SELECT COUNT(*) FROM grades_{newest} WHERE date = ?',
+                        (f'{newest}-01-01',)).fetchone()[0] >= 1
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO grades (student_id, subject_id, grade, date) VALUES (1, 1, 5, '1990-01-01')")
+    with conn:
+        conn.execute(f"DELETE FROM grades_{newest} WHERE id = (SELECT MAX(id) FROM grades_{newest})")
+    conn.close()
+
+    archived = partitions.archive(db_path, newest - 1, str(tmp_path / 'archive'))
+    assert archived == [year for year in years if year < newest - 1]
+
+    conn = partitions.connect(db_path)
+    assert conn.execute('SELECT COUNT(*), SUM(grade) FROM grades').fetchone() == totals
+    assert sorted(partitions.last_lesson(conn, 1, 1)) == expected
+    assert [year for year, _ in partitions.partition_tables(conn, f'{newest}-02-01', f'{newest}-03-01')] == [newest]
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute(f'DELETE FROM archive_{archived[0]}.grades_{archived[0]}')
+    conn.close()
+
+
+def test_view_accepts_updates_and_deletes(db_path, tmp_path):
+    conn = sqlite3.connect(db_path)
+    years = partitions.partition(conn)
+    oldest, newest = years[0], years[-1]
+    row_id = conn.execute(f'SELECT MIN(id) FROM grades_{oldest}').fetchone()[0]
+
+    with conn:
+        conn.execute('UPDATE grades SET grade = 1 WHERE id = ?', (row_id,))
+    assert conn.execute(f'SELECT grade FROM grades_{oldest} WHERE id = ?', (row_id,)).fetchone() == (1,)
+
+    # Зміна дати переносить рядок у розділ нового року з тим самим id
+    with conn:
+        conn.execute('UPDATE grades SET date = ? WHERE id = ?', (f'{newest}-02-01', row_id))
+    assert conn.execute(f'SELECT COUNT(*) FROM grades_{oldest} WHERE id = ?', (row_id,)).fetchone() == (0,)
+    assert conn.execute(f'SELECT grade, date FROM grades_{newest} WHERE id = ?', (row_id,)).fetchone() == (1, f'{newest}-02-01')
+
+    with conn:
+        conn.execute('DELETE FROM grades WHERE id = ?', (row_id,))
+    assert conn.execute('SELECT COUNT(*) FROM grades WHERE id = ?', (row_id,)).fetchone() == (0,)
+    conn.close()
+
+    partitions.archive(db_path, newest, str(tmp_path / 'archive'))
+    conn = partitions.connect(db_path)
+    archived_id = conn.execute(f'SELECT MIN(id) FROM grades_{oldest}').fetchone()[0]
+    total = conn.execute('SELECT COUNT(*) FROM grades').fetchone()[0]
+
+    # TEMP представлення з архівами теж записуване, але лише в розділи main
+    with conn:
+        conn.execute('INSERT INTO grades (student_id, subject_id, grade, date) VALUES (1, 1, 5, ?)',
+                     (f'{newest}-03-01',))
+        new_id = conn.execute(f'SELECT MAX(id) FROM main.grades_{newest}').fetchone()[0]
+        conn.execute('UPDATE grades SET grade = 4 WHERE id = ?', (new_id,))
+    assert conn.execute('SELECT grade FROM grades WHERE id = ?', (new_id,)).fetchone() == (4,)
+    with conn:
+        conn.execute('DELETE FROM grades WHERE id = ?', (new_id,))
+    assert conn.execute('SELECT COUNT(*) FROM grades').fetchone()[0] == total
+
+    with pytest.raises(sqlite3.IntegrityError, match='read-only'):
+        conn.execute('DELETE FROM grades WHERE id = ?', (archived_id,))
+    with pytest.raises(sqlite3.IntegrityError, match='read-only'):
+        conn.execute('UPDATE grades SET grade = 1 WHERE id = ?', (archived_id,))
+    conn.close()
+
+
+def test_aggregates_follow_writes_to_partitions(db_path, tmp_path):
+    conn = sqlite3.connect(db_path)
+    aggregates.install(conn)
+    years = partitions.partition(conn)
+    newest = years[-1]
+    row_id = conn.execute(f'SELECT MIN(id) FROM grades_{years[0]}').fetchone()[0]
+
+    with conn:
+        conn.execute('INSERT INTO grades (student_id, subject_id, grade, date) VALUES (1, 1, 5, ?)',
+                     (f'{newest}-01-01',))
+        conn.execute('UPDATE grades SET grade = 1, date = ? WHERE id = ?', (f'{newest}-02-01', row_id))
+        conn.execute(f'DELETE FROM grades_{newest} WHERE id = (SELECT MIN(id) FROM grades_{newest})')
+    assert aggregates.check(conn) == {}
+    conn.close()
+
+    # Новий розділ отримує ті самі тригери
+    conn = sqlite3.connect(db_path)
+    partitions.add_partition(conn, newest + 1)
+    with conn:
+        conn.execute('INSERT INTO grades (student_id, subject_id, grade, date) VALUES (2, 2, 1, ?)',
+                     (f'{newest + 1}-01-01',))
+    assert aggregates.check(conn) == {}
+    conn.close()
+
+    partitions.archive(db_path, newest, str(tmp_path / 'archive'))
+    close_connections()
+    expected = list(run_report('query_4', db_path=db_path))
+    assert list(aggregates.run_aggregate_report('query_4', db_path=db_path)) == pytest.approx(expected)
+
+    # Тригери можна зняти і поставити знову вже на розбитій базі
+    conn = partitions.connect(db_path)
+    aggregates.drop_triggers(conn)
+    assert not conn.execute("SELECT name FROM sqlite_master WHERE name LIKE 'agg_grades%'").fetchall()
+    aggregates.install(conn)
+    with conn:
+        conn.execute('DELETE FROM grades WHERE id = (SELECT MAX(id) FROM grades)')
+    assert aggregates.check(conn) == {}
+    conn.close()
+
+
+def test_reports_read_archived_years(db_path, tmp_path):
+    before = list(run_report('query_4', db_path=db_path))
+    conn = sqlite3.connect(db_path)
+    years = partitions.partition(conn)
+    conn.close()
+    close_connections()
+
+    partitions.archive(db_path, years[-1], str(tmp_path / 'archive'))
+    assert list(run_report('query_4', db_path=db_path)) == before
+
+    # report_runner читає через з'єднання mode=ro&immutable=1
+    summary = run_reports(['query_4'], db_path=db_path, out_dir=str(tmp_path / 'reports'), workers=1)
+    assert summary[0]['rows'] == 1
+    assert str(before[0][0]) in (tmp_path / 'reports' / 'query_4.jsonl').read_text()
@@ -0,0 +1,93 @@
+import os
+import re
+import time
+
+import pytest
+
+from create_db import create_database, populate_database_bulk
+from query_engine import REGISTRY, SQL, execute_query, close_connections
+
+# Розмір згенерованої бази; для перевірки на великих даних:
+# PLAN_TEST_STUDENTS=100000 python -m pytest tests/test_query_plans.py -s
+STUDENTS = int(os.environ.get('PLAN_TEST_STUDENTS', 3000))
+
+# Таблиці, повний прохід по яких вважається регресією
+LARGE_TABLES = {'grades', 'students'}
+
+# Звіти, яким потрібні всі рядки таблиці: достатньо проходу по покривному індексу
+# (query_4) або по студентах, коли оцінки беруться з індексу (query_1, query_2)
+ALLOWED_SCANS = {
+    'query_1': {'students'},
+    'query_2': {'students'},
+    'query_4': {'grades'},
+}
+
+TABLE_ALIAS = re.compile(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+KEYWORDS = {'where', 'on', 'join', 'group', 'order', 'limit', 'inner', 'left'}
+
+
+def aliases(sql):
+    result = {}
+    for table, alias in TABLE_ALIAS.findall(sql):
+        result[table] = table
+        if alias and alias.lower() not in KEYWORDS:
+            result[alias] = table
+    return result
+
+
+def full_scans(name, plan):
+    tables = aliases(SQL[name])
+    scans = []
+    for line in plan:
+        match = re.match(r'SCAN (\w+)(.*)', line)
+        if not match:
+            continue
+        table = tables.get(match.group(1), match.group(1))
+        if table not in LARGE_TABLES:
+            continue
+        # Дозволений прохід по grades - лише по покривному індексу, не по самій таблиці
+        if table in ALLOWED_SCANS.get(name, ()) and (table != 'grades' or 'COVERING INDEX' in match.group(2)):
+            continue
+        scans.append(line)
+    return scans
+
+
+@pytest.fixture(scope='module')
+def large_db(tmp_path_factory):
+    db_path = str(tmp_path_factory.mktemp('plans') / 'university.db')
+    create_database(db_path)
+    populate_database_bulk(db_path, students=STUDENTS, seed=13)
+    yield db_path
+    close_connections()
+
+
+@pytest.fixture(scope='module')
+def params(large_db):
+    values = {
+        'subject_id': 1,
+        'group_id': 1,
+        'group_name': execute_query("SELECT name FROM groups ORDER BY id LIMIT 1", db_path=large_db)[0][0],
+        'teacher_name': execute_query("SELECT name FROM teachers ORDER BY id LIMIT 1", db_path=large_db)[0][0],
+        'student_name': execute_query("SELECT name FROM students ORDER BY id LIMIT 1", db_path=large_db)[0][0],
+    }
+    return {name: {param: values[param] for param in signature} for name, signature in REGISTRY.items()}
+
+
+def test_every_sql_file_is_registered():
+    assert set(SQL) == set(REGISTRY)
+
+
+@pytest.mark.parametrize('name', sorted(REGISTRY, key=lambda name: int(name.split('_')[1])))
+def test_report_has_no_full_table_scan(name, large_db, params, record_property):
+    plan = [row[3] for row in execute_query('EXPLAIN QUERY PLAN ' + SQL[name], params[name], large_db)]
+
+    start = time.perf_counter()
+    execute_query(SQL[name], params[name], large_db)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    # План і час потрапляють у звіт pytest (--junitxml) і у вивід з -s
+    record_property('plan', ' | '.join(plan))
+    record_property('ms', round(elapsed, 2))
+    print(f"\n{name}: {elapsed:.1f} ms; " + ' | '.join(plan))
+
+    assert not full_scans(name, plan), f"{name} regressed to a full scan: {plan}"
@@ -0,0 +1,43 @@
+import csv
+import json
+import sqlite3
+
+import pytest
+
+from create_db import create_database, populate_database
+from query_engine import REGISTRY, default_params, get_connection, run_report, close_connections
+from report_runner import run_reports
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'university.db')
+    create_database(path)
+    populate_database(path)
+    yield path
+    close_connections()
+
+
+def test_reports_are_written_as_jsonl_and_csv(db_path, tmp_path):
+    params = default_params(db_path)
+    jsonl = run_reports(db_path=db_path, out_dir=str(tmp_path / 'jsonl'), fmt='jsonl')
+    csv_results = run_reports(['query_3', 'query_6'], db_path=db_path, out_dir=str(tmp_path / 'csv'), fmt='csv')
+
+    assert sorted(result['report'] for result in jsonl) == sorted(REGISTRY)
+    for result in jsonl:
+        expected = list(run_report(result['report'], db_path=db_path,
+                                   **{param: params[param] for param in REGISTRY[result['report']]}))
+        with open(result['path'], encoding='utf-8') as file:
+            rows = [tuple(json.loads(line).values()) for line in file]
+        assert rows == expected
+        assert result['rows'] == len(expected)
+
+    with open(tmp_path / 'csv' / 'query_6.csv', encoding='utf-8') as file:
+        assert next(csv.reader(file)) == ['student_name']
+    assert {result['report'] for result in csv_results} == {'query_3', 'query_6'}
+
+
+def test_readonly_connection_rejects_writes(db_path):
+    conn = get_connection(db_path, readonly=True)
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM grades")
@@ -0,0 +1,114 @@
+import sqlite3
+
+import pytest
+
+import partitions
+from create_db import create_database, populate_database
+from query_engine import close_connections, get_connection, run_report
+from result_cache import ResultCache, install_generations
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'university.db')
+    create_database(path)
+    populate_database(path)
+    yield path
+    close_connections()
+
+
+def test_writes_invalidate_only_reports_reading_the_table(db_path):
+    writer = sqlite3.connect(db_path)
+    install_generations(writer)
+    cache = ResultCache(db_path=db_path)
+
+    first = cache.get('query_4')
+    assert cache.get('query_4') is first
+
+    # teachers не читається в query_4 - запис кешу лишається валідним
+    with writer:
+        writer.execute("INSERT INTO teachers (name) VALUES ('New Teacher')")
+    assert cache.get('query_4') is first
+
+    # Запис в grades з іншого з'єднання помічається через data_version
+    with writer:
+        writer.execute("UPDATE grades SET grade = 5 WHERE grade < 5 AND id = (SELECT MIN(id) FROM grades WHERE grade < 5)")
+    assert cache.get('query_4') == tuple(run_report('query_4', db_path=db_path)) != first
+
+    # Власний запис через те саме з'єднання - через total_changes
+    conn = get_connection(db_path)
+    with conn:
+        conn.execute("DELETE FROM grades WHERE id = (SELECT MIN(id) FROM grades)")
+    assert cache.get('query_4') == tuple(run_report('query_4', db_path=db_path))
+
+    stats = cache.stats()
+    assert stats['hits'] == 2 and stats['invalidated'] == 2
+    assert stats['hit_ratio'] == pytest.approx(2 / 5)
+    writer.close()
+
+
+def test_without_generation_table_any_write_clears_the_cache(db_path):
+    cache = ResultCache(db_path=db_path)
+    cache.get('query_6', group_name='Group 1')
+    cache.get('query_6', group_name='Group 1')
+    assert cache.stats()['hits'] == 1
+
+    writer = sqlite3.connect(db_path)
+    with writer:
+        writer.execute("INSERT INTO groups (name) VALUES ('Group 4')")
+    writer.close()
+    cache.get('query_6', group_name='Group 1')
+    assert cache.stats()['hits'] == 1 and cache.stats()['invalidated'] == 1
+
+
+def test_size_and_ttl_eviction(db_path):
+    cache = ResultCache(maxsize=2, ttl=60, db_path=db_path)
+    for subject_id in (1, 2, 3):
+        cache.get('query_2', subject_id=subject_id)
+    assert cache.stats()['evicted'] == 1 and cache.stats()['size'] == 2
+
+    expiring = ResultCache(ttl=0, db_path=db_path)
+    expiring.get('query_4')
+    expiring.get('query_4')
+    assert expiring.stats()['expired'] == 1 and expiring.stats()['hits'] == 0
+
+
+def test_rolled_back_write_does_not_leave_stale_generations(db_path):
+    conn = get_connection(db_path)
+    install_generations(conn)
+    cache = ResultCache(db_path=db_path)
+    first = cache.get('query_4')
+
+    # Незакомічений запис збільшує покоління grades, потім відкочується
+    conn.execute("UPDATE grades SET grade = grade WHERE id = (SELECT MIN(id) FROM grades)")
+    assert cache.get('query_4') == first
+    conn.rollback()
+    assert cache.get('query_4') == first
+
+    # Справжній коміт іншого з'єднання доводить покоління до того ж номера
+    writer = sqlite3.connect(db_path)
+    with writer:
+        writer.execute("UPDATE grades SET grade = 100 WHERE id = (SELECT MIN(id) FROM grades)")
+    writer.close()
+
+    assert cache.get('query_4') == tuple(run_report('query_4', db_path=db_path)) != first
+
+
+@pytest.mark.parametrize('install_first', [True, False])
+def test_writes_to_partitioned_grades_invalidate(db_path, install_first):
+    conn = sqlite3.connect(db_path)
+    if install_first:
+        install_generations(conn)
+    years = partitions.partition(conn)
+    if not install_first:
+        install_generations(conn)
+    cache = ResultCache(db_path=db_path)
+    first = cache.get('query_4')
+
+    # Запис через представлення потрапляє в розділ і збільшує покоління grades
+    with conn:
+        conn.execute('INSERT INTO grades (student_id, subject_id, grade, date) VALUES (1, 1, 1, ?)',
+                     (f'{years[-1]}-01-01',))
+    assert cache.get('query_4') == tuple(run_report('query_4', db_path=db_path)) != first
+    assert cache.stats()['invalidated'] == 1
+    conn.close()
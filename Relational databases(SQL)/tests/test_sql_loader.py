@@ -0,0 +1,39 @@
+import pytest
+
+from query_engine import TEMPLATES, REPORTS, run_report
+from sql_loader import SqlFileWarning, load_templates, parse_params
+
+
+def test_named_params_skip_literals_and_comments():
+    sql = """
+        -- :ignored in a comment
+        SELECT ':not_a_param', name FROM students /* :nope */
+        WHERE group_id = :group_id AND name = :name AND id > :group_id;
+    """
+    assert parse_params(sql) == ('group_id', 'name')
+
+
+def test_reports_are_compiled_with_signature_and_columns():
+    assert TEMPLATES['query_7'].params == ('group_name', 'subject_id')
+    assert REPORTS['query_7'].columns == ('student_name', 'grade')
+    assert REPORTS['query_4'].params == ()
+
+    with pytest.raises(TypeError):
+        run_report('query_7', group_name='Group 1')
+    with pytest.raises(TypeError):
+        run_report('query_5', teacher='x')
+
+
+def test_broken_files_warn_and_are_skipped(tmp_path):
+    (tmp_path / 'query_1.sql').write_text("SELECT name FROM students WHERE id = :student_id;")
+    (tmp_path / 'query_2.sql').write_text("SELECT name FROM students WHERE id = :student_id")
+    (tmp_path / 'query_3.sql').write_text("SELECT missing_column FROM students;")
+    (tmp_path / 'query_4.sql').write_text("SELECT name FROM students WHERE id = ?;")
+
+    with pytest.warns(SqlFileWarning) as record:
+        templates = load_templates(str(tmp_path))
+
+    assert list(templates) == ['query_1']
+    assert templates['query_1'].params == ('student_id',)
+    assert sorted(str(warning.message).split(':')[0] for warning in record) == \
+        ['query_2.sql', 'query_3.sql', 'query_4.sql']